@@ -8,7 +8,7 @@ from rest_framework.response import Response
 from sentry import audit_log
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases.organization import OrganizationEndpoint, OrganizationPermission
-from sentry.api.paginator import OffsetPaginator
+from sentry.api.paginator import KeysetPaginator
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.team import TeamSerializer
 from sentry.models import (
@@ -20,6 +20,7 @@ from sentry.models import (
 )
 from sentry.search.utils import tokenize_query
 from sentry.signals import team_created
+from sentry.utils.cursors import KeysetCursor
 
 CONFLICTING_SLUG_ERROR = "A team with this slug already exists."
 
@@ -126,7 +127,8 @@ class OrganizationTeamsEndpoint(OrganizationEndpoint):
             queryset=queryset,
             order_by="slug",
             on_results=lambda x: serialize(x, request.user, TeamSerializer(expand=expand)),
-            paginator_cls=OffsetPaginator,
+            paginator_cls=KeysetPaginator,
+            cursor_cls=KeysetCursor,
         )
 
     def should_add_creator_to_team(self, request: Request):
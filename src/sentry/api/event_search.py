@@ -1,9 +1,12 @@
+import functools
 import re
-from collections import namedtuple
+import threading
+from collections import OrderedDict, namedtuple
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
+from django.conf import settings
 from django.utils.functional import cached_property
 from parsimonious.exceptions import IncompleteParseError
 from parsimonious.expressions import Optional
@@ -486,6 +489,8 @@ class SearchVisitor(NodeVisitor):
             config = SearchConfig()
         self.config = config
         self.params = params if params is not None else {}
+        # Set when the result depends on the current time (relative dates)
+        self.time_dependent = False
         if builder is None:
             # Avoid circular import
             from sentry.search.events.builder import UnresolvedQuery
@@ -1051,6 +1056,7 @@ class SearchVisitor(NodeVisitor):
         return node.text
 
     def visit_rel_date_format(self, node, children):
+        self.time_dependent = True
         return node
 
     def visit_duration_format(self, node, children):
@@ -1135,14 +1141,15 @@ default_config = SearchConfig(
 )
 
 
-def parse_search_query(
-    query, config=None, params=None, builder=None, config_overrides=None
-) -> Sequence[SearchFilter]:
-    if config is None:
-        config = default_config
+# Number of distinct queries whose parse trees are kept. Trees only depend
+# on the query string.
+PARSE_TREE_CACHE_SIZE = 1000
+
 
+@functools.lru_cache(maxsize=PARSE_TREE_CACHE_SIZE)
+def _parse_tree(query):
     try:
-        tree = event_search_grammar.parse(query)
+        return event_search_grammar.parse(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
@@ -1154,6 +1161,72 @@ def parse_search_query(
             )
         )
 
+
+class _ParseResultCache:
+    """
+    Bounded LRU of visited search queries, keyed on the query and the
+    identity of the `SearchConfig` it was parsed with.
+
+    Only results that do not depend on anything but the query and config
+    are stored, that is parses without params, builder or config overrides
+    and without relative dates. Entries keep a reference to their config so
+    that its id cannot be reused by another config while they are cached.
+    """
+
+    def __init__(self):
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, query, config):
+        key = (query, id(config))
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] is not config:
+                return None
+            self.__entries.move_to_end(key)
+            # Filters are immutable, but callers may modify the list
+            return list(entry[1])
+
+    def set(self, query, config, result, size):
+        key = (query, id(config))
+        with self.__lock:
+            self.__entries[key] = (config, list(result))
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+
+_parse_result_cache = _ParseResultCache()
+
+
+def parse_search_query(
+    query, config=None, params=None, builder=None, config_overrides=None
+) -> Sequence[SearchFilter]:
+    if config is None:
+        config = default_config
+
+    # Fast path for the empty query, which many requests send
+    if not query.strip(" "):
+        return []
+
+    cache_size = settings.SENTRY_EVENT_SEARCH_RESULT_CACHE_SIZE
+    cacheable = cache_size > 0 and not params and builder is None and not config_overrides
+    if cacheable:
+        result = _parse_result_cache.get(query, config)
+        if result is not None:
+            return result
+
+    tree = _parse_tree(query)
+
     if config_overrides:
         config = SearchConfig.create_from(config, **config_overrides)
-    return SearchVisitor(config, params=params, builder=builder).visit(tree)
+    visitor = SearchVisitor(config, params=params, builder=builder)
+    result = visitor.visit(tree)
+
+    if cacheable and not visitor.time_dependent:
+        _parse_result_cache.set(query, config, result, cache_size)
+    return result
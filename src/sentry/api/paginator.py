@@ -6,10 +6,11 @@ from urllib.parse import quote, unquote
 
 from django.core.exceptions import EmptyResultSet, ObjectDoesNotExist
 from django.db import connections
+from django.db.models import Q
 from django.db.models.functions import Lower
 from django.utils import timezone
 
-from sentry.utils.cursors import Cursor, CursorResult, build_cursor
+from sentry.utils.cursors import Cursor, CursorResult, KeysetCursor, build_cursor
 
 quote_name = connections["default"].ops.quote_name
 
@@ -348,6 +349,115 @@ class MergingOffsetPaginator(OffsetPaginator):
         return CursorResult(results=results, next=next_cursor, prev=prev_cursor)
 
 
+class KeysetPaginator:
+    """
+    Paginates a queryset by seeking past the sort values of the last row of
+    the previous page instead of using ``OFFSET``, so that deep pages are as
+    cheap to fetch as the first one (given an index on the ordering).
+
+    ``order_by`` may contain multiple (related) fields, each of them
+    optionally descending. ``id`` is appended as a tie-breaker unless the
+    ordering already ends with the primary key, so the ordering is total.
+    Ordering fields must not be nullable.
+
+    Use with ``cursor_cls=KeysetCursor``. Offset cursors (``limit:page:0``)
+    are still accepted and are served with an offset query once, the
+    cursors returned with the page are keyset cursors.
+    """
+
+    def __init__(self, queryset, order_by, max_limit=MAX_LIMIT, on_results=None):
+        if isinstance(order_by, str):
+            order_by = (order_by,)
+
+        self.keys = []
+        for field in order_by:
+            if field.startswith("-"):
+                self.keys.append((field[1:], True))
+            else:
+                self.keys.append((field, False))
+
+        name, desc = self.keys[-1]
+        if name not in ("id", "pk"):
+            self.keys.append(("id", desc))
+
+        self.queryset = queryset
+        self.max_limit = max_limit
+        self.on_results = on_results
+
+    def get_item_key(self, item):
+        values = []
+        for name, _ in self.keys:
+            value = item
+            for attr in name.split("__"):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def build_queryset(self, value, is_prev):
+        # Previous pages are fetched in reverse order, starting right before
+        # the first row of the page the cursor was created on.
+        queryset = self.queryset.order_by(
+            *(f"-{name}" if desc != is_prev else name for name, desc in self.keys)
+        )
+
+        if value:
+            if len(value) != len(self.keys):
+                raise BadPaginationError("Invalid cursor for this ordering")
+
+            # (a, b, c) > (x, y, z) as a = x AND b = y AND c > z OR a = x AND b > y OR a > x,
+            # with the comparison of every column depending on its direction.
+            condition = Q()
+            for i, ((name, desc), cursor_value) in enumerate(zip(self.keys, value)):
+                lookup = "lt" if desc != is_prev else "gt"
+                term = Q(**{f"{name}__{lookup}": cursor_value})
+                for (prev_name, _), prev_value in zip(self.keys[:i], value[:i]):
+                    term &= Q(**{prev_name: prev_value})
+                condition |= term
+            queryset = queryset.filter(condition)
+
+        return queryset
+
+    def get_result(self, limit=100, cursor=None):
+        if cursor is None:
+            cursor = KeysetCursor(0, 0, 0)
+
+        limit = min(limit, self.max_limit)
+
+        if isinstance(cursor.value, list):
+            queryset = self.build_queryset(cursor.value, cursor.is_prev)
+            results = list(queryset[: limit + 1])
+            has_more = len(results) > limit
+            results = results[:limit]
+            if cursor.is_prev:
+                results.reverse()
+                has_prev, has_next = has_more, True
+            else:
+                has_prev, has_next = True, has_more
+        else:
+            # Offset cursor, value is the page size and offset the page
+            offset = cursor.offset * (cursor.value or 0)
+            if offset < 0:
+                raise BadPaginationError("Pagination offset cannot be negative")
+            queryset = self.build_queryset(None, False)
+            results = list(queryset[offset : offset + limit + 1])
+            has_prev, has_next = offset > 0, len(results) > limit
+            results = results[:limit]
+
+        if results:
+            next_value = self.get_item_key(results[-1])
+            prev_value = self.get_item_key(results[0])
+        else:
+            next_value = prev_value = cursor.value
+
+        next_cursor = KeysetCursor(next_value, 0, False, has_next)
+        prev_cursor = KeysetCursor(prev_value, 0, True, has_prev)
+
+        if self.on_results:
+            results = self.on_results(results)
+
+        return CursorResult(results=results, next=next_cursor, prev=prev_cursor)
+
+
 def reverse_bisect_left(a, x, lo=0, hi=None):
     """\
     Similar to ``bisect.bisect_left``, but expects the data in the array ``a``
@@ -1,6 +1,7 @@
 import logging
 
-from django.db.models import F
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import post_save
 
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
@@ -102,3 +103,108 @@ class Buffer(Service, metaclass=BufferMount):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, model, batch):
+        """
+        Processes many buffered increments for ``model`` at once, where ``batch``
+        is a list of ``(columns, filters, extra, signal_only)`` tuples.
+
+        Group counters filtered by primary key are written with one grouped
+        ``UPDATE ... SET times_seen = times_seen + CASE id WHEN ... END``
+        statement, everything else falls back to ``process``.
+        """
+        from sentry.models import Group
+
+        grouped = []
+        for columns, filters, extra, signal_only in batch:
+            if (
+                model is Group
+                and not signal_only
+                and len(filters) == 1
+                and ("id" in filters or "pk" in filters)
+            ):
+                grouped.append((columns, filters, extra))
+            else:
+                self.process(model, columns, filters, extra, signal_only)
+
+        if grouped:
+            self._process_group_batch(grouped)
+
+    def _process_group_batch(self, batch):
+        from sentry.event_manager import ScoreClause
+        from sentry.models import Group
+
+        # the same group can be pending under different filters (`id` or
+        # `pk`), merge their increments like consecutive `process` calls would
+        rows = {}
+        for columns, filters, extra in batch:
+            group_id = filters.get("id", filters.get("pk"))
+            if group_id not in rows:
+                rows[group_id] = (dict(columns), dict(extra or {}))
+                continue
+            merged_columns, merged_extra = rows[group_id]
+            for column, amount in columns.items():
+                merged_columns[column] = merged_columns.get(column, 0) + amount
+            merged_extra.update(extra or {})
+
+        incr_columns = {c for columns, _ in rows.values() for c in columns}
+        extra_columns = {c for _, extra in rows.values() for c in extra}
+
+        update_kwargs = {}
+        for column in incr_columns:
+            field = Group._meta.get_field(column)
+            update_kwargs[column] = F(column) + Case(
+                *(
+                    When(id=group_id, then=Value(columns[column]))
+                    for group_id, (columns, _) in rows.items()
+                    if column in columns
+                ),
+                default=Value(0),
+                output_field=field,
+            )
+        for column in extra_columns:
+            field = Group._meta.get_field(column)
+            update_kwargs[column] = Case(
+                *(
+                    When(id=group_id, then=Value(extra[column], output_field=field))
+                    for group_id, (_, extra) in rows.items()
+                    if column in extra
+                ),
+                default=F(column),
+                output_field=field,
+            )
+
+        # HACK(dcramer): see `process`, the score has to be computed from the
+        # values of the same row.
+        scores = [
+            When(
+                id=group_id,
+                then=ScoreClause(
+                    group=None, times_seen=columns["times_seen"], last_seen=extra["last_seen"]
+                ),
+            )
+            for group_id, (columns, extra) in rows.items()
+            if "times_seen" in columns and "last_seen" in extra
+        ]
+        if scores:
+            update_kwargs["score"] = Case(
+                *scores, default=F("score"), output_field=Group._meta.get_field("score")
+            )
+
+        Group.objects.filter(id__in=rows.keys()).update(**update_kwargs)
+
+        # A queryset update doesn't fire `post_save`, so refresh the group cache
+        # with a single query for the whole batch. Groups that were deleted in
+        # the meantime are simply skipped.
+        for group in Group.objects.filter(id__in=rows.keys()):
+            post_save.send(sender=Group, instance=group, created=False)
+
+        for columns, filters, extra in batch:
+            buffer_incr_complete.send_robust(
+                model=Group,
+                columns=columns,
+                filters=filters,
+                extra=extra,
+                created=False,
+                sender=Group,
+            )
@@ -1,5 +1,6 @@
 import pickle
 import threading
+from collections import defaultdict
 from datetime import datetime
 from time import time
 
@@ -14,6 +15,7 @@ from sentry.utils import json, metrics
 from sentry.utils.compat import crc32
 from sentry.utils.hashlib import md5_text
 from sentry.utils.imports import import_string
+from sentry.utils.iterators import chunked
 from sentry.utils.redis import get_cluster_from_options
 
 _local_buffers = None
@@ -51,12 +53,26 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(
+        self,
+        pending_partitions=1,
+        incr_batch_size=2,
+        flush_mode="tasks",
+        flush_batch_size=500,
+        **options,
+    ):
         self.cluster, options = get_cluster_from_options("SENTRY_BUFFER_OPTIONS", options)
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
+        # ``tasks`` fans out one ``process_incr`` task per ``incr_batch_size``
+        # keys, ``batch`` drains the whole partition inline with pipelined
+        # reads and grouped database writes.
+        self.flush_mode = flush_mode
+        self.flush_batch_size = flush_batch_size
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
+        assert self.flush_mode in ("tasks", "batch")
+        assert self.flush_batch_size > 0
 
     def validate(self):
         try:
@@ -230,18 +246,26 @@ class RedisBuffer(Buffer):
             return
 
         pending_buffer = PendingBuffer(self.incr_batch_size)
+        batch_keys = []
 
         try:
             keycount = 0
+            oldest = None
             with self.cluster.all() as conn:
-                results = conn.zrange(pending_key, 0, -1)
+                results = conn.zrange(pending_key, 0, -1, withscores=True)
 
             with self.cluster.all() as conn:
-                for host_id, keys in results.value.items():
-                    if not keys:
+                for host_id, entries in results.value.items():
+                    if not entries:
                         continue
+                    keys = [key for key, _ in entries]
                     keycount += len(keys)
+                    host_oldest = min(score for _, score in entries)
+                    oldest = host_oldest if oldest is None else min(oldest, host_oldest)
                     for key in keys:
+                        if self.flush_mode == "batch":
+                            batch_keys.append(key.decode("utf-8"))
+                            continue
                         pending_buffer.append(key.decode("utf-8"))
                         if pending_buffer.full():
                             process_incr.apply_async(kwargs={"batch_keys": pending_buffer.flush()})
@@ -251,7 +275,17 @@ class RedisBuffer(Buffer):
             if not pending_buffer.empty():
                 process_incr.apply_async(kwargs={"batch_keys": pending_buffer.flush()})
 
+            if batch_keys:
+                self._flush_batch(batch_keys)
+
+            partition_tag = "none" if partition is None else str(partition)
             metrics.timing("buffer.pending-size", keycount)
+            if oldest is not None:
+                metrics.timing(
+                    "buffer.flush-lag",
+                    time() - oldest,
+                    tags={"partition": partition_tag, "mode": self.flush_mode},
+                )
         finally:
             client.delete(lock_key)
 
@@ -288,42 +322,115 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_text(k): v for k, v in values.items()}
-
-            if not values:
+            loaded = self._load_buffered_values(values)
+            if loaded is None:
                 metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
                 self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            # XXX(py3): Note that ``import_string`` explicitly wants a str in
-            # python2, so we'll decode (for python3) and then translate back to
-            # a byte string (in python2) for import_string.
-            model = import_string(str(values.pop("m").decode("utf-8")))
-
-            if values["f"].startswith(b"{"):
-                filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(values.pop("f"))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"["):
-                        extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(v)
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+            self._process(*loaded)
         finally:
             client.delete(lock_key)
+
+    def _load_buffered_values(self, values):
+        """
+        Decodes the contents of a buffer hash into the ``(model, columns,
+        filters, extra, signal_only)`` arguments of ``Buffer.process``.
+        Returns ``None`` if the hash was already flushed.
+        """
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_text(k): v for k, v in values.items()}
+
+        if not values:
+            return None
+
+        # XXX(py3): Note that ``import_string`` explicitly wants a str in
+        # python2, so we'll decode (for python3) and then translate back to
+        # a byte string (in python2) for import_string.
+        model = import_string(str(values.pop("m").decode("utf-8")))
+
+        if values["f"].startswith(b"{"):
+            filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(values.pop("f"))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"["):
+                    extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(v)
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
+
+    def _flush_batch(self, keys):
+        """
+        Drains ``keys`` inline instead of fanning out ``process_incr`` tasks.
+
+        Reads are pipelined per Redis host in ``flush_batch_size`` chunks, each
+        chunk reading and deleting its hashes in a single MULTI so concurrent
+        increments are never lost. Increments are then merged per model and
+        filters and handed to ``Buffer.process_batch`` which can write them
+        with a single statement per model.
+        """
+        router = self.cluster.get_router()
+        keys_by_host = defaultdict(list)
+        for key in keys:
+            keys_by_host[router.get_host_for_key(key)].append(key)
+
+        # (model, redis key) -> [columns, filters, extra, signal_only]
+        pending = {}
+        empty = 0
+        for host_id, host_keys in keys_by_host.items():
+            conn = self.cluster.get_local_client(host_id)
+            for chunk in chunked(host_keys, self.flush_batch_size):
+                pipe = conn.pipeline()
+                for key in chunk:
+                    pipe.hgetall(key)
+                    pipe.delete(key)
+                results = pipe.execute()[::2]
+
+                for key, values in zip(chunk, results):
+                    loaded = self._load_buffered_values(values)
+                    if loaded is None:
+                        empty += 1
+                        continue
+                    model, columns, filters, extra, signal_only = loaded
+                    merged = pending.get((model, key))
+                    if merged is None:
+                        pending[(model, key)] = [columns, filters, extra, signal_only]
+                        continue
+                    for column, amount in columns.items():
+                        merged[0][column] = merged[0].get(column, 0) + amount
+                    merged[2].update(extra)
+                    merged[3] = merged[3] or signal_only
+
+        if empty:
+            metrics.incr(
+                "buffer.revoked", amount=empty, tags={"reason": "empty"}, skip_internal=False
+            )
+
+        batches = defaultdict(list)
+        for (model, _), item in pending.items():
+            batches[model].append(tuple(item))
+
+        for model, batch in batches.items():
+            for chunk in chunked(batch, self.flush_batch_size):
+                self.process_batch(model, chunk)
+            metrics.incr(
+                "buffer.batch-flush",
+                amount=len(batch),
+                skip_internal=True,
+                tags={"module": model.__module__, "model": model.__name__},
+            )
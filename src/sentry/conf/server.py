@@ -557,6 +557,7 @@ CELERY_IMPORTS = (
     "sentry.data_export.tasks",
     "sentry.discover.tasks",
     "sentry.incidents.tasks",
+    "sentry.nodestore.tasks",
     "sentry.snuba.tasks",
     "sentry.replays.tasks",
     "sentry.tasks.app_store_connect",
@@ -756,6 +757,11 @@ CELERYBEAT_SCHEDULE = {
         "schedule": crontab_with_minute_jitter(hour=3),
         "options": {"expires": 3600 * 24},
     },
+    "train-nodestore-compression-dictionaries": {
+        "task": "sentry.nodestore.tasks.schedule_compression_dictionary_training",
+        "schedule": crontab_with_minute_jitter(hour=4),
+        "options": {"expires": 3600 * 24},
+    },
     "deliver-from-outbox": {
         "task": "sentry.tasks.enqueue_outbox_jobs",
         "schedule": timedelta(minutes=1),
@@ -1497,6 +1503,8 @@ SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
+# Maximum size in bytes of a compressed result stored in the cache
+SENTRY_SNUBA_CACHE_MAX_RESULT_SIZE = 1024 * 1024
 
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
@@ -2889,9 +2897,14 @@ SENTRY_POST_PROCESS_LOCKS_BACKEND_OPTIONS = {
 ORGANIZATION_VITALS_OVERVIEW_PROJECT_LIMIT = 300
 
 
+# Number of parsed event search queries cached per process, 0 disables the cache
+SENTRY_EVENT_SEARCH_RESULT_CACHE_SIZE = 1000
+
 # Default string indexer cache options
+# `local_cache_size` bounds the per-process tier in front of the shared cache, 0 disables it
 SENTRY_STRING_INDEXER_CACHE_OPTIONS = {
     "cache_name": "default",
+    "local_cache_size": 10000,
 }
 SENTRY_POSTGRES_INDEXER_RETRY_COUNT = 2
 
@@ -120,12 +120,13 @@ class DataExportEndpoint(OrganizationEndpoint, EnvironmentMixin):
         if not features.has("organizations:discover-query", organization):
             return Response(status=404)
 
-        # Get environment_id and limit if available
+        # Get environment_id, limit and compression if available
         try:
             environment_id = self._get_environment_id_from_request(request, organization.id)
         except Environment.DoesNotExist as error:
             return Response(error, status=400)
         limit = request.data.get("limit")
+        compress = bool(request.data.get("compress"))
 
         # Validate the data export payload
         serializer = DataExportQuerySerializer(
@@ -159,7 +160,10 @@ class DataExportEndpoint(OrganizationEndpoint, EnvironmentMixin):
                     "dataexport.enqueue", tags={"query_type": data["query_type"]}, sample_rate=1.0
                 )
                 assemble_download.delay(
-                    data_export_id=data_export.id, export_limit=limit, environment_id=environment_id
+                    data_export_id=data_export.id,
+                    export_limit=limit,
+                    environment_id=environment_id,
+                    compress=compress,
                 )
                 status = 201
         except ValidationError as e:
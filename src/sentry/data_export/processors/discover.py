@@ -1,9 +1,13 @@
 import logging
+from datetime import datetime, timedelta
+
+import pytz
 
 from sentry.api.utils import get_date_range_from_params
 from sentry.models import Environment, Group, Project
-from sentry.search.events.fields import get_function_alias
+from sentry.search.events.fields import get_function_alias, is_function
 from sentry.snuba import discover
+from sentry.utils.snuba import parse_snuba_datetime
 
 from ..base import ExportError
 
@@ -35,12 +39,16 @@ class DiscoverProcessor:
         self.equation_aliases = {
             f"equation[{index}]": equation for index, equation in enumerate(equations)
         }
+        self.keyset_sort = self.get_keyset_sort(
+            discover_query["field"], equations, discover_query.get("sort")
+        )
         self.data_fn = self.get_data_fn(
             fields=discover_query["field"],
             equations=equations,
             query=discover_query["query"],
             params=self.params,
             sort=discover_query.get("sort"),
+            keyset_sort=self.keyset_sort,
         )
 
     @staticmethod
@@ -72,13 +80,44 @@ class DiscoverProcessor:
         return environment_names
 
     @staticmethod
-    def get_data_fn(fields, equations, query, params, sort):
-        def data_fn(offset, limit):
+    def get_keyset_sort(fields, equations, sort):
+        """
+        Exports of individual events sorted by timestamp (or not sorted at
+        all) are paginated with a keyset on (timestamp, id) instead of an
+        offset, which Snuba has to scan past on every page.
+        """
+        if equations or any(is_function(field) for field in fields):
+            return None
+        sort = sort or "-timestamp"
+        return sort if sort in ("timestamp", "-timestamp") else None
+
+    @staticmethod
+    def get_data_fn(fields, equations, query, params, sort, keyset_sort=None):
+        if keyset_sort is not None:
+            # the extra fields are ignored when the rows are written
+            fields = fields + [field for field in ("timestamp", "id") if field not in fields]
+            sort = [keyset_sort, keyset_sort.replace("timestamp", "id")]
+
+        def data_fn(offset, limit, cursor=None):
+            query_params = params
+            if keyset_sort is not None and cursor is not None:
+                # continue from the second of the last exported row, skipping
+                # the rows of that second which were already exported
+                timestamp, offset = cursor
+                boundary = datetime.utcfromtimestamp(timestamp).replace(tzinfo=pytz.utc)
+                if keyset_sort.startswith("-"):
+                    query_params = {
+                        **params,
+                        "end": min(params["end"], boundary + timedelta(seconds=1)),
+                    }
+                else:
+                    query_params = {**params, "start": max(params["start"], boundary)}
+
             return discover.query(
                 selected_columns=fields,
                 equations=equations,
                 query=query,
-                params=params,
+                params=query_params,
                 offset=offset,
                 orderby=sort,
                 limit=limit,
@@ -90,6 +129,31 @@ class DiscoverProcessor:
 
         return data_fn
 
+    def get_next_cursor(self, rows, cursor):
+        """
+        Returns the keyset cursor to continue after the given rows with, a
+        pair of the timestamp (in seconds) of the last row and the number of
+        rows exported with that timestamp.
+
+        Keyset and offset pagination return rows in the same order, so
+        without a cursor the export simply continues from its offset.
+        """
+        if self.keyset_sort is None or not rows:
+            return cursor
+        if any(row.get("timestamp") is None for row in rows):
+            return None
+
+        timestamps = [int(parse_snuba_datetime(row["timestamp"]).timestamp()) for row in rows]
+        timestamp = timestamps[-1]
+        count = 0
+        for value in reversed(timestamps):
+            if value != timestamp:
+                break
+            count += 1
+        if count == len(rows) and cursor is not None and cursor[0] == timestamp:
+            count += cursor[1]
+        return [timestamp, count]
+
     def handle_fields(self, result_list):
         # Find issue short_id if present
         # (originally in `/api/bases/organization_events.py`)
@@ -1,7 +1,9 @@
 import codecs
 import csv
+import gzip
 import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha1
 
 import celery
@@ -63,6 +65,8 @@ def assemble_download(
     environment_id=None,
     export_retries=3,
     countdown=60,
+    cursor=None,
+    compress=False,
     **kwargs,
 ):
     with sentry_sdk.start_span(op="assemble"):
@@ -108,14 +112,20 @@ def assemble_download(
 
             processor = get_processor(data_export, environment_id)
 
-            with tempfile.TemporaryFile(mode="w+b") as tf:
+            with tempfile.TemporaryFile(mode="w+b") as tf, ThreadPoolExecutor(
+                max_workers=1
+            ) as executor:
+                # every batch is compressed on its own, the concatenation of
+                # the gzip members of all batches is still a valid gzip file
+                stream = gzip.GzipFile(fileobj=tf, mode="wb") if compress else tf
+
                 # XXX(python3):
                 #
                 # In python3 we write unicode strings (which is all the csv
                 # module is able to do, it will NOT write bytes like in py2).
                 # Because of this we use the codec getwriter to transform our
                 # file handle to a stream writer that will encode to utf8.
-                tfw = codecs.getwriter("utf-8")(tf)
+                tfw = codecs.getwriter("utf-8")(stream)
 
                 writer = csv.DictWriter(tfw, processor.header_fields, extrasaction="ignore")
                 if first_page:
@@ -124,6 +134,10 @@ def assemble_download(
                 # the position in the file at the end of the headers
                 starting_pos = tf.tell()
 
+                def write_rows(rows):
+                    writer.writerows(rows)
+                    return tf.tell()
+
                 # the row offset relative to the start of the current task
                 # this offset tells you the number of rows written during this batch fragment
                 fragment_offset = 0
@@ -131,26 +145,46 @@ def assemble_download(
                 # the absolute row offset from the beginning of the export
                 next_offset = offset + fragment_offset
 
-                rows = []
+                # the keyset cursor after the last row written, if the export supports one
+                next_cursor = cursor
 
-                for _ in range(MAX_FRAGMENTS_PER_BATCH):
-                    # the number of rows to export in the next batch fragment
-                    fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
+                rows = process_rows(
+                    processor,
+                    data_export,
+                    min(batch_size, max(export_limit - next_offset, 1)),
+                    next_offset,
+                    next_cursor,
+                )
 
-                    rows = process_rows(processor, data_export, fragment_row_count, next_offset)
-                    writer.writerows(rows)
+                for fragment in range(1, MAX_FRAGMENTS_PER_BATCH + 1):
+                    # the rows are written in the background while the next
+                    # batch fragment is fetched
+                    write = executor.submit(write_rows, rows)
 
                     fragment_offset += len(rows)
                     next_offset = offset + fragment_offset
+                    next_cursor = get_next_cursor(processor, data_export, rows, next_cursor)
+
+                    if not rows or len(rows) < batch_size or fragment == MAX_FRAGMENTS_PER_BATCH:
+                        write.result()
+                        break
+
+                    # the number of rows to export in the next batch fragment
+                    fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
+
+                    next_rows = process_rows(
+                        processor, data_export, fragment_row_count, next_offset, next_cursor
+                    )
 
-                    if (
-                        not rows
-                        or len(rows) < batch_size
-                        # the batch may exceed MAX_BATCH_SIZE but immediately stops
-                        or tf.tell() - starting_pos >= MAX_BATCH_SIZE
-                    ):
+                    # the batch may exceed MAX_BATCH_SIZE but immediately stops,
+                    # the prefetched fragment is fetched again by the next task
+                    if write.result() - starting_pos >= MAX_BATCH_SIZE:
                         break
 
+                    rows = next_rows
+
+                if compress:
+                    stream.close()
                 tf.seek(0)
                 new_bytes_written = store_export_chunk_as_blob(data_export, bytes_written, tf)
                 bytes_written += new_bytes_written
@@ -165,6 +199,8 @@ def assemble_download(
                         "bytes_written": base_bytes_written,
                         "environment_id": environment_id,
                         "export_retries": export_retries - 1,
+                        "cursor": cursor,
+                        "compress": compress,
                     },
                     countdown=countdown,
                 )
@@ -204,13 +240,15 @@ def assemble_download(
                         "bytes_written": bytes_written,
                         "environment_id": environment_id,
                         "export_retries": export_retries,
+                        "cursor": next_cursor,
+                        "compress": compress,
                     },
                     countdown=3,
                 )
             else:
                 metrics.timing("dataexport.row_count", next_offset, sample_rate=1.0)
                 metrics.timing("dataexport.file_size", bytes_written, sample_rate=1.0)
-                merge_export_blobs.delay(data_export_id)
+                merge_export_blobs.delay(data_export_id, compress=compress)
 
 
 def get_processor(data_export, environment_id):
@@ -239,12 +277,12 @@ def get_processor(data_export, environment_id):
         raise
 
 
-def process_rows(processor, data_export, batch_size, offset):
+def process_rows(processor, data_export, batch_size, offset, cursor=None):
     try:
         if data_export.query_type == ExportQueryType.ISSUES_BY_TAG:
             rows = process_issues_by_tag(processor, batch_size, offset)
         elif data_export.query_type == ExportQueryType.DISCOVER:
-            rows = process_discover(processor, batch_size, offset)
+            rows = process_discover(processor, batch_size, offset, cursor)
         else:
             raise ExportError(f"No processor found for this query type: {data_export.query_type}")
         return rows
@@ -256,55 +294,68 @@ def process_rows(processor, data_export, batch_size, offset):
         raise
 
 
+def get_next_cursor(processor, data_export, rows, cursor):
+    if data_export.query_type == ExportQueryType.DISCOVER:
+        return processor.get_next_cursor(rows, cursor)
+    return None
+
+
 @handle_snuba_errors(logger)
 def process_issues_by_tag(processor, limit, offset):
     return processor.get_serialized_data(limit=limit, offset=offset)
 
 
 @handle_snuba_errors(logger)
-def process_discover(processor, limit, offset):
-    raw_data_unicode = processor.data_fn(limit=limit, offset=offset)["data"]
+def process_discover(processor, limit, offset, cursor=None):
+    raw_data_unicode = processor.data_fn(limit=limit, offset=offset, cursor=cursor)["data"]
     return processor.handle_fields(raw_data_unicode)
 
 
-class ExportDataFileTooBig(Exception):
-    pass
-
-
 def store_export_chunk_as_blob(data_export, bytes_written, fileobj, blob_size=DEFAULT_BLOB_SIZE):
-    try:
-        with atomic_transaction(
-            using=(
-                router.db_for_write(FileBlob),
-                router.db_for_write(ExportedDataBlob),
+    # there is a maximum file size allowed, so we need to make sure we don't exceed it
+    # NOTE: there seems to be issues with downloading files larger than 1 GB on slower
+    # networks, limit the export to 1 GB for now to improve reliability
+    max_file_size = min(MAX_FILE_SIZE, 2**30)
+
+    chunks = []
+    bytes_offset = 0
+    while True:
+        contents = fileobj.read(blob_size)
+        if not contents:
+            break
+
+        chunks.append((ContentFile(contents), sha1(contents).hexdigest()))
+        bytes_offset += len(contents)
+        if bytes_written + bytes_offset >= max_file_size:
+            return 0
+
+    with atomic_transaction(
+        using=(
+            router.db_for_write(FileBlob),
+            router.db_for_write(ExportedDataBlob),
+        )
+    ):
+        # the blobs are uploaded concurrently, they are only looked up
+        # by their checksums after all of them have been stored
+        FileBlob.from_files(chunks, logger=logger)
+        blobs = {
+            blob.checksum: blob
+            for blob in FileBlob.objects.filter(checksum__in=[checksum for _, checksum in chunks])
+        }
+
+        bytes_offset = 0
+        for _, checksum in chunks:
+            blob = blobs[checksum]
+            ExportedDataBlob.objects.get_or_create(
+                data_export=data_export, blob_id=blob.id, offset=bytes_written + bytes_offset
             )
-        ):
-            # adapted from `putfile` in  `src/sentry/models/file.py`
-            bytes_offset = 0
-            while True:
-                contents = fileobj.read(blob_size)
-                if not contents:
-                    return bytes_offset
-
-                blob_fileobj = ContentFile(contents)
-                blob = FileBlob.from_file(blob_fileobj, logger=logger)
-                ExportedDataBlob.objects.get_or_create(
-                    data_export=data_export, blob_id=blob.id, offset=bytes_written + bytes_offset
-                )
+            bytes_offset += blob.size
 
-                bytes_offset += blob.size
-
-                # there is a maximum file size allowed, so we need to make sure we don't exceed it
-                # NOTE: there seems to be issues with downloading files larger than 1 GB on slower
-                # networks, limit the export to 1 GB for now to improve reliability
-                if bytes_written + bytes_offset >= min(MAX_FILE_SIZE, 2**30):
-                    raise ExportDataFileTooBig()
-    except ExportDataFileTooBig:
-        return 0
+    return bytes_offset
 
 
 @instrumented_task(name="sentry.data_export.tasks.merge_blobs", queue="data_export", acks_late=True)
-def merge_export_blobs(data_export_id, **kwargs):
+def merge_export_blobs(data_export_id, compress=False, **kwargs):
     with sentry_sdk.start_span(op="merge"):
         try:
             data_export = ExportedData.objects.get(id=data_export_id)
@@ -334,11 +385,18 @@ def merge_export_blobs(data_export_id, **kwargs):
                     router.db_for_write(FileBlobIndex),
                 )
             ):
-                file = File.objects.create(
-                    name=data_export.file_name,
-                    type="export.csv",
-                    headers={"Content-Type": "text/csv"},
-                )
+                if compress:
+                    file = File.objects.create(
+                        name=f"{data_export.file_name}.gz",
+                        type="export.csv.gz",
+                        headers={"Content-Type": "application/gzip"},
+                    )
+                else:
+                    file = File.objects.create(
+                        name=data_export.file_name,
+                        type="export.csv",
+                        headers={"Content-Type": "text/csv"},
+                    )
                 size = 0
                 file_checksum = sha1(b"")
 
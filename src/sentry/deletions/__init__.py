@@ -45,6 +45,13 @@ deletion task. Doing so requires a few steps:
 1. Add your deletion task subclass to `sentry.deletions.defaults`
 2. Add your deletion task to the default manager mapping in `sentry.deletions.__init__`.
 
+Child relations of a task are planned by ``DeletionTaskManager.plan()``. Consecutive relations
+deleted with ``BulkModelDeletionTask`` that don't reference each other are deleted concurrently
+(see the ``deletions.relation-concurrency`` option). Both base classes select their chunks by
+primary key range and record the last deleted id of every relation, so a deletion that is retried
+after a failure resumes where it left off. Chunks are throttled while the replicas lag behind by
+more than ``deletions.max-replication-lag`` seconds.
+
 Undoing Deletions
 -----------------
 
@@ -1,12 +1,64 @@
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from django.db import connections, router, transaction
+
+from sentry import options
 from sentry.constants import ObjectStatus
 from sentry.utils import metrics
-from sentry.utils.query import bulk_delete_objects
+from sentry.utils.cache import cache
+from sentry.utils.hashlib import hash_values
+from sentry.utils.query import bulk_delete_objects_after
 
 _leaf_re = re.compile(r"^(UserReport|Event|Group)(.+)")
 
+# Progress of a relation is kept for as long as its deletion may be retried
+PROGRESS_TTL = 7 * 24 * 60 * 60
+
+# The longest a chunk waits for replicas to catch up before going on anyway
+MAX_REPLICATION_WAIT = 60
+
+
+def get_replication_lag(model):
+    """
+    Returns how many seconds the replica that reads of ``model`` are routed
+    to is behind the primary, or ``0`` if there is no separate replica.
+    """
+    using = router.db_for_read(model, replica=True)
+    if using == router.db_for_write(model):
+        return 0
+
+    cursor = connections[using].cursor()
+    cursor.execute(
+        """
+        select case
+            when pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() then 0
+            else extract(epoch from now() - pg_last_xact_replay_timestamp())
+        end
+        """
+    )
+    return cursor.fetchone()[0] or 0
+
+
+def wait_for_replication(model):
+    """
+    Throttles deletions while the replicas of ``model`` lag behind by more
+    than ``deletions.max-replication-lag`` seconds.
+    """
+    max_lag = options.get("deletions.max-replication-lag")
+    if not max_lag:
+        return
+
+    deadline = time.monotonic() + MAX_REPLICATION_WAIT
+    while True:
+        lag = get_replication_lag(model)
+        if lag <= max_lag or time.monotonic() >= deadline:
+            return
+        metrics.incr("deletions.throttled", tags={"model": model.__name__})
+        time.sleep(min(lag - max_lag, 5))
+
 
 class BaseRelation:
     def __init__(self, params, task):
@@ -127,24 +179,58 @@ class BaseDeletionTask:
 
     def delete_children(self, relations):
         # Ideally this runs through the deletion manager
-        for relation in relations:
-            task = self.manager.get(
-                transaction_id=self.transaction_id,
-                actor_id=self.actor_id,
-                task=relation.task,
-                **relation.params,
-            )
-
-            # If we want smaller tasks then this also has to return when has_more is true.
-            # This could significant increase the number of tasks we spawn. Get better estimates
-            # by collecting metrics.
-            has_more = True
-            while has_more:
-                has_more = task.chunk()
-                if has_more:
-                    metrics.incr("deletions.should_spawn", tags={"task": type(task).__name__})
+        concurrency = options.get("deletions.relation-concurrency")
+
+        for relations_group in self.manager.plan(relations):
+            # Worker threads use their own connections, they would neither see
+            # rows of an open transaction nor be able to wait for its locks.
+            if (
+                concurrency <= 1
+                or len(relations_group) <= 1
+                or any(
+                    transaction.get_connection(
+                        router.db_for_write(relation.params["model"])
+                    ).in_atomic_block
+                    for relation in relations_group
+                )
+            ):
+                for relation in relations_group:
+                    self.delete_relation(relation)
+                continue
+
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(relations_group))) as executor:
+                futures = [
+                    executor.submit(self._delete_relation_in_thread, relation)
+                    for relation in relations_group
+                ]
+            for future in futures:
+                future.result()
         return False
 
+    def delete_relation(self, relation):
+        task = self.manager.get(
+            transaction_id=self.transaction_id,
+            actor_id=self.actor_id,
+            task=relation.task,
+            **relation.params,
+        )
+
+        # If we want smaller tasks then this also has to return when has_more is true.
+        # This could significant increase the number of tasks we spawn. Get better estimates
+        # by collecting metrics.
+        has_more = True
+        while has_more:
+            has_more = task.chunk()
+            if has_more:
+                metrics.incr("deletions.should_spawn", tags={"task": type(task).__name__})
+
+    def _delete_relation_in_thread(self, relation):
+        try:
+            self.delete_relation(relation)
+        finally:
+            # connections are per thread, don't leave the ones of the worker open
+            connections.close_all()
+
     def mark_deletion_in_progress(self, instance_list):
         pass
 
@@ -159,6 +245,7 @@ class ModelDeletionTask(BaseDeletionTask):
         self.query = query
         self.query_limit = query_limit or self.DEFAULT_QUERY_LIMIT or self.chunk_size
         self.order_by = order_by
+        self.last_id = None
 
     def __repr__(self):
         return "<{}: model={} query={} order_by={} transaction_id={} actor_id={}>".format(
@@ -182,6 +269,35 @@ class ModelDeletionTask(BaseDeletionTask):
             rel(obj_list) for rel in default_manager.bulk_dependencies[self.model]
         ]
 
+    def get_progress_key(self):
+        if self.transaction_id is None:
+            return None
+        try:
+            query_hash = hash_values([self.query])
+        except TypeError:
+            return None
+        return f"deletions:progress:{self.transaction_id}:{self.model._meta.label}:{query_hash}"
+
+    def get_last_id(self):
+        """
+        Returns the greatest id deleted by this task so far. Progress is
+        shared by all tasks of a deletion transaction, so a retried deletion
+        resumes where the relation was left off.
+        """
+        if self.last_id is None:
+            key = self.get_progress_key()
+            self.last_id = (cache.get(key) if key else None) or 0
+        return self.last_id
+
+    def set_last_id(self, last_id):
+        self.last_id = last_id
+        key = self.get_progress_key()
+        if key:
+            if last_id:
+                cache.set(key, last_id, PROGRESS_TTL)
+            else:
+                cache.delete(key)
+
     def chunk(self, num_shards=None, shard_id=None):
         """
         Deletes a chunk of this instance's data. Return ``True`` if there is
@@ -194,6 +310,10 @@ class ModelDeletionTask(BaseDeletionTask):
             queryset = getattr(self.model, self.manager_name).filter(**self.query)
             if self.order_by:
                 queryset = queryset.order_by(self.order_by)
+            else:
+                # select chunks by primary key range, instead of scanning past
+                # the rows of previous chunks again
+                queryset = queryset.filter(id__gt=self.get_last_id()).order_by("id")
 
             if num_shards:
                 assert num_shards > 1
@@ -203,9 +323,17 @@ class ModelDeletionTask(BaseDeletionTask):
             queryset = list(queryset[:query_limit])
             # If there are no more rows we are all done.
             if not queryset:
-                return False
+                if self.order_by or not self.get_last_id():
+                    return False
+                # rows may have started to match the query after the range
+                # they are in was deleted, finish with a pass over all of them
+                self.set_last_id(0)
+                continue
 
             self.delete_bulk(queryset)
+            if not self.order_by:
+                self.set_last_id(queryset[-1].id)
+            wait_for_replication(self.model)
             remaining = remaining - query_limit
         # We have more work to do as we didn't run out of rows to delete.
         return True
@@ -270,13 +398,25 @@ class BulkModelDeletionTask(ModelDeletionTask):
 
     def delete_instance_bulk(self):
         try:
-            return bulk_delete_objects(
+            after_id = self.get_last_id()
+            last_id = bulk_delete_objects_after(
                 model=self.model,
+                after_id=after_id,
                 limit=self.chunk_size,
-                transaction_id=self.transaction_id,
                 partition_key=self.partition_key,
                 **self.query,
             )
+            if last_id is None:
+                if not after_id:
+                    return False
+                # rows may have started to match the query after the range
+                # they are in was deleted, finish with a pass over all of them
+                self.set_last_id(0)
+                return True
+
+            self.set_last_id(last_id)
+            wait_for_replication(self.model)
+            return True
         finally:
             # Don't log Group and Event child object deletions.
             model_name = self.model.__name__
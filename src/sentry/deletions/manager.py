@@ -3,6 +3,10 @@ from collections import defaultdict
 __all__ = ["DeletionTaskManager"]
 
 
+def get_related_models(model):
+    return {field.related_model for field in model._meta.concrete_fields if field.is_relation}
+
+
 class DeletionTaskManager:
     def __init__(self, default_task=None):
         self.tasks = {}
@@ -19,6 +23,47 @@ class DeletionTaskManager:
                 task = self.default_task
         return task(manager=self, **kwargs)
 
+    def plan(self, relations):
+        """
+        Splits child relations into groups that are deleted one after the
+        other, in order. The relations of a group are independent of each
+        other and may be deleted concurrently.
+
+        Only relations deleted with `BulkModelDeletionTask` are grouped, they
+        run plain delete queries without cascades or signals. Such relations
+        are independent unless they are of the same model or one of their
+        models has a foreign key to the other.
+        """
+        from .base import BulkModelDeletionTask
+
+        groups = []
+        group = []
+        group_models = set()
+        for relation in relations:
+            model = relation.params.get("model")
+            task = relation.task or self.tasks.get(model, self.default_task)
+            if model is None or task is None or not issubclass(task, BulkModelDeletionTask):
+                if group:
+                    groups.append(group)
+                    group, group_models = [], set()
+                groups.append([relation])
+                continue
+
+            related_models = get_related_models(model)
+            if any(
+                other is model or other in related_models or model in get_related_models(other)
+                for other in group_models
+            ):
+                groups.append(group)
+                group, group_models = [], set()
+
+            group.append(relation)
+            group_models.add(model)
+
+        if group:
+            groups.append(group)
+        return groups
+
     def register(self, model, task):
         self.tasks[model] = task
 
@@ -1,7 +1,10 @@
 import pickle
 import zlib
+from datetime import datetime
 from typing import Any
 
+from sentry.utils import json
+
 
 class Codec:
     def encode(self, value: Any) -> bytes:
@@ -17,3 +20,67 @@ class CompressedPickleCodec(Codec):
 
     def decode(self, value: bytes) -> Any:
         return pickle.loads(zlib.decompress(value))
+
+
+class NotificationReferenceCodec(Codec):
+    """
+    Encodes digest notifications as references to their event and rules,
+    instead of pickling the full event payload into every record.
+
+    Decoded events only carry their ids, group and timestamp. Their payloads
+    are loaded from nodestore in bulk when the digest is built (see
+    `sentry.digests.notifications.fetch_state`).
+
+    References are only written while the `digests.write-event-references`
+    option is enabled, so that workers which cannot decode them yet keep
+    working during a deploy. Otherwise, and for values that cannot be
+    represented this way (anything but a notification for a plain error
+    event, e.g. events of issue occurrences), `CompressedPickleCodec` is
+    used, which also decodes records written before this codec.
+    """
+
+    MAGIC = b"\x00n1"
+
+    def __init__(self) -> None:
+        self.fallback = CompressedPickleCodec()
+
+    def encode(self, value: Any) -> bytes:
+        from sentry import options
+        from sentry.digests.notifications import Notification
+        from sentry.eventstore.models import Event, GroupEvent
+
+        event = getattr(value, "event", None)
+        if (
+            not options.get("digests.write-event-references")
+            or not isinstance(value, Notification)
+            or not isinstance(event, (Event, GroupEvent))
+            or getattr(event, "occurrence", None) is not None
+        ):
+            return self.fallback.encode(value)
+
+        reference = [
+            event.project_id,
+            event.event_id,
+            event.group_id,
+            event.datetime.timestamp(),
+            list(value.rules),
+        ]
+        return self.MAGIC + json.dumps(reference).encode("utf-8")
+
+    def decode(self, value: bytes) -> Any:
+        if not value.startswith(self.MAGIC):
+            return self.fallback.decode(value)
+
+        from sentry.digests.notifications import Notification
+        from sentry.eventstore.models import Event
+
+        project_id, event_id, group_id, timestamp, rules = json.loads(
+            value[len(self.MAGIC) :], use_rapid_json=True
+        )
+        event = Event(
+            project_id,
+            event_id,
+            group_id=group_id,
+            snuba_data={"timestamp": datetime.utcfromtimestamp(timestamp).isoformat()},
+        )
+        return Notification(event, rules)
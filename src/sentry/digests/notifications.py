@@ -1,17 +1,16 @@
 from __future__ import annotations
 
 import functools
-import itertools
 import logging
 from collections import defaultdict, namedtuple
 from typing import Any, Mapping, MutableMapping, MutableSequence, Sequence
 
-from sentry import tsdb
+from sentry import eventstore, tsdb
 from sentry.digests import Digest, Record
 from sentry.eventstore.models import Event
 from sentry.models import Group, GroupStatus, Project, Rule
 from sentry.notifications.types import ActionTargetType, FallthroughChoiceType
-from sentry.utils.dates import to_timestamp
+from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.pipeline import Pipeline
 
 logger = logging.getLogger("sentry.digests")
@@ -68,23 +67,40 @@ def event_to_record(event: Event, rules: Sequence[Rule]) -> Record:
 
 
 def fetch_state(project: Project, records: Sequence[Record]) -> Mapping[str, Any]:
-    # This reads a little strange, but remember that records are returned in
-    # reverse chronological order, and we query the database in chronological
-    # order.
+    # Collect everything that needs to be fetched in a single pass over the
+    # records, they can be numerous.
     # NOTE: This doesn't account for any issues that are filtered out later.
-    start = records[-1].datetime
-    end = records[0].datetime
+    group_ids = set()
+    rule_ids = set()
+    start = end = None
+    for record in records:
+        group_ids.add(record.value.event.group_id)
+        rule_ids.update(record.value.rules)
+        if start is None or record.timestamp < start:
+            start = record.timestamp
+        if end is None or record.timestamp > end:
+            end = record.timestamp
+
+    # Events of records written by `NotificationReferenceCodec` carry no
+    # payload. Rendering and resolving participants reads it for every event,
+    # so load all of them with a single nodestore request.
+    eventstore.bind_nodes(
+        [record.value.event for record in records if record.value.event.data._node_data is None]
+    )
 
-    groups = Group.objects.in_bulk(record.value.event.group_id for record in records)
+    groups = Group.objects.in_bulk(group_ids)
     return {
         "project": project,
         "groups": groups,
-        "rules": Rule.objects.in_bulk(
-            itertools.chain.from_iterable(record.value.rules for record in records)
+        "rules": Rule.objects.in_bulk(rule_ids),
+        "event_counts": tsdb.get_sums(
+            tsdb.models.group, list(groups.keys()), to_datetime(start), to_datetime(end)
         ),
-        "event_counts": tsdb.get_sums(tsdb.models.group, list(groups.keys()), start, end),
         "user_counts": tsdb.get_distinct_counts_totals(
-            tsdb.models.users_affected_by_group, list(groups.keys()), start, end
+            tsdb.models.users_affected_by_group,
+            list(groups.keys()),
+            to_datetime(start),
+            to_datetime(end),
         ),
     }
 
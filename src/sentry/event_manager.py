@@ -543,9 +543,7 @@ class EventManager:
 
         _materialize_metadata_many(jobs)
 
-        kwargs = _create_kwargs(job)
-
-        kwargs["culprit"] = job["culprit"]
+        job["hashes"] = hashes
 
         # Load attachments first, but persist them at the very last after
         # posting to eventstream to make sure all counters and eventstream are
@@ -555,18 +553,11 @@ class EventManager:
             with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
                 attachments = get_attachments(cache_key, job)
 
-        try:
-            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
-                group_info = _save_aggregate(
-                    event=job["event"],
-                    hashes=hashes,
-                    release=job["release"],
-                    metadata=dict(job["event_metadata"]),
-                    received_timestamp=job["received_timestamp"],
-                    **kwargs,
-                )
-                job["groups"] = [group_info]
-        except HashDiscarded as err:
+        with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
+            _save_aggregate_many(jobs, projects)
+
+        if "discarded" in job:
+            err = job["discarded"]
             logger.info(
                 "event_manager.save.discard",
                 extra={
@@ -575,11 +566,13 @@ class EventManager:
                 },
             )
             discard_event(job, attachments)
-            raise
+            raise err
 
-        if not group_info:
+        if not job["groups"]:
             return job["event"]
 
+        group_info = job["groups"][0]
+
         job["event"].group = group_info.group
 
         # store a reference to the group id to guarantee validation of isolation
@@ -1411,13 +1404,21 @@ def _save_aggregate(
     release: Optional[Release],
     metadata: dict[str, Any],
     received_timestamp: Union[int, float],
+    grouphashes: Optional[MutableMapping[str, GroupHash]] = None,
     **kwargs: dict[str, Any],
 ) -> Optional[GroupInfo]:
     project = event.project
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
+    # `grouphashes` is shared by all events of a batch (see
+    # `_save_aggregate_many`) and kept in sync with the group assignments made
+    # here, so that later events of the same batch see groups created by
+    # earlier ones without querying again.
+    if grouphashes is None:
+        grouphashes = _get_or_create_grouphashes_many(
+            project, hashes.hierarchical_hashes, create=hashes.hashes
+        )
+
+    flat_grouphashes = [grouphashes[hash] for hash in hashes.hashes]
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
@@ -1426,13 +1427,16 @@ def _save_aggregate(
     # when groups are created and also relieves contention by locking a more
     # specific hash than `hierarchical_hashes[0]`.
     existing_grouphash, root_hierarchical_hash = _find_existing_grouphash(
-        project, flat_grouphashes, hashes.hierarchical_hashes
+        project, flat_grouphashes, hashes.hierarchical_hashes, grouphashes=grouphashes
     )
 
     if root_hierarchical_hash is not None:
-        root_hierarchical_grouphash = GroupHash.objects.get_or_create(
-            project=project, hash=root_hierarchical_hash
-        )[0]
+        root_hierarchical_grouphash = grouphashes.get(root_hierarchical_hash)
+        if root_hierarchical_grouphash is None:
+            root_hierarchical_grouphash = GroupHash.objects.get_or_create(
+                project=project, hash=root_hierarchical_hash
+            )[0]
+            grouphashes[root_hierarchical_hash] = root_hierarchical_grouphash
 
         metadata.update(
             hashes.group_metadata_from_hash(
@@ -1481,6 +1485,7 @@ def _save_aggregate(
                 all_hash_ids.append(root_hierarchical_grouphash.id)
 
             all_hashes = list(GroupHash.objects.filter(id__in=all_hash_ids).select_for_update())
+            grouphashes.update((h.hash, h) for h in all_hashes)
 
             flat_grouphashes = [gh for gh in all_hashes if gh.hash in hashes.hashes]
 
@@ -1492,6 +1497,7 @@ def _save_aggregate(
                 root_hierarchical_grouphash = GroupHash.objects.get_or_create(
                     project=project, hash=root_hierarchical_hash
                 )[0]
+                grouphashes[root_hierarchical_hash] = root_hierarchical_grouphash
             else:
                 root_hierarchical_grouphash = None
 
@@ -1504,9 +1510,7 @@ def _save_aggregate(
                 else:
                     new_hashes = list(flat_grouphashes)
 
-                GroupHash.objects.filter(id__in=[h.id for h in new_hashes]).exclude(
-                    state=GroupHash.State.LOCKED_IN_MIGRATION
-                ).update(group=group)
+                _assign_grouphashes(new_hashes, group)
 
                 is_new = True
                 is_regression = False
@@ -1571,9 +1575,7 @@ def _save_aggregate(
         # _save_aggregate had races around group creation which made this race
         # more user visible. For more context, see 84c6f75a and d0e22787, as
         # well as GH-5085.
-        GroupHash.objects.filter(id__in=[h.id for h in new_hashes]).exclude(
-            state=GroupHash.State.LOCKED_IN_MIGRATION
-        ).update(group=group)
+        _assign_grouphashes(new_hashes, group)
 
     is_regression = _process_existing_aggregate(
         group=group, event=event, data=kwargs, release=release
@@ -1582,10 +1584,98 @@ def _save_aggregate(
     return GroupInfo(group, is_new, is_regression)
 
 
+@metrics.wraps("save_event.save_aggregate_many")
+def _save_aggregate_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    """
+    Assigns a batch of error events to groups. Every job needs its
+    `CalculatedHashes` in `job["hashes"]`.
+
+    The grouphashes of all events of a project are loaded with one query and
+    missing ones are created in bulk, so that only events that do not match
+    an existing group go through the locked group creation path. Events
+    discarded by a tombstone or load shedding get the `HashDiscarded`
+    exception in `job["discarded"]` instead of failing the whole batch.
+
+    For now the only caller is `EventManager.save`, with a batch of one.
+    Error events are saved by one `save_event` task each, and batching them
+    from the ingest consumer would need the rest of `save` (attachments,
+    eventstream, post-processing) to work on batches as well.
+    """
+    hashes_by_project: dict[int, tuple[set[str], set[str]]] = {}
+    for job in jobs:
+        flat, hierarchical = hashes_by_project.setdefault(job["project_id"], (set(), set()))
+        flat.update(job["hashes"].hashes)
+        hierarchical.update(job["hashes"].hierarchical_hashes)
+
+    grouphashes_by_project = {
+        project_id: _get_or_create_grouphashes_many(
+            projects[project_id], list(hierarchical), create=list(flat)
+        )
+        for project_id, (flat, hierarchical) in hashes_by_project.items()
+    }
+
+    for job in jobs:
+        kwargs = _create_kwargs(job)
+        kwargs["culprit"] = job["culprit"]
+
+        try:
+            group_info = _save_aggregate(
+                event=job["event"],
+                hashes=job["hashes"],
+                release=job["release"],
+                metadata=dict(job["event_metadata"]),
+                received_timestamp=job["received_timestamp"],
+                grouphashes=grouphashes_by_project[job["project_id"]],
+                **kwargs,
+            )
+        except HashDiscarded as err:
+            job["discarded"] = err
+            job["groups"] = []
+        else:
+            job["groups"] = [group_info] if group_info is not None else []
+
+
+def _get_or_create_grouphashes_many(
+    project: Project, hashes: Sequence[str], create: Sequence[str] = ()
+) -> dict[str, GroupHash]:
+    """
+    Loads the grouphashes of `hashes` and `create` with a single query and
+    creates the missing ones of `create`. Hashes in `hashes` that do not exist
+    yet are left out of the result.
+    """
+    grouphashes = {
+        h.hash: h for h in GroupHash.objects.filter(project=project, hash__in={*hashes, *create})
+    }
+
+    missing = [hash for hash in dict.fromkeys(create) if hash not in grouphashes]
+    if missing:
+        # Concurrent saves may create the same hashes, conflicts are ignored
+        # and the rows are selected again to get their ids.
+        GroupHash.objects.bulk_create(
+            [GroupHash(project=project, hash=hash) for hash in missing], ignore_conflicts=True
+        )
+        grouphashes.update(
+            (h.hash, h) for h in GroupHash.objects.filter(project=project, hash__in=missing)
+        )
+
+    return grouphashes
+
+
+def _assign_grouphashes(grouphashes: Sequence[GroupHash], group: Group) -> None:
+    GroupHash.objects.filter(id__in=[h.id for h in grouphashes]).exclude(
+        state=GroupHash.State.LOCKED_IN_MIGRATION
+    ).update(group=group)
+
+    for h in grouphashes:
+        if h.state != GroupHash.State.LOCKED_IN_MIGRATION:
+            h.group_id = group.id
+
+
 def _find_existing_grouphash(
     project: Project,
     flat_grouphashes: Sequence[GroupHash],
     hierarchical_hashes: Optional[Sequence[str]],
+    grouphashes: Optional[Mapping[str, GroupHash]] = None,
 ) -> tuple[Optional[GroupHash], Optional[str]]:
     all_grouphashes = []
     root_hierarchical_hash = None
@@ -1593,10 +1683,15 @@ def _find_existing_grouphash(
     found_split = False
 
     if hierarchical_hashes:
-        hierarchical_grouphashes = {
-            h.hash: h
-            for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
-        }
+        if grouphashes is not None:
+            hierarchical_grouphashes = {
+                hash: grouphashes[hash] for hash in hierarchical_hashes if hash in grouphashes
+            }
+        else:
+            hierarchical_grouphashes = {
+                h.hash: h
+                for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
+            }
 
         # Look for splits:
         # 1. If we find a hash with SPLIT state at `n`, we want to use
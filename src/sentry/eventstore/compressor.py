@@ -3,12 +3,14 @@ Eventstore compressor is responsible for pulling out repeating data across
 events such that they can be stored only once. For example SDK modules list, or
 debug_meta.
 
-This is not used in production yet, we are still collecting metrics there.
+Nodestore backends opt into this with ``NodeStorage.deduplicate_interfaces``,
+in which case the deduplicated parts are stored as separate content-addressed
+nodes and reassembled on read.
 """
 
 import hashlib
 
-from sentry.utils import json
+from sentry.utils import json, metrics
 
 _INTERFACES = {}
 
@@ -43,7 +45,7 @@ class DebugMeta:
     def decode(dedup, data):
         if data:
             for i, image in enumerate(data.get("images") or []):
-                for name, arr in dedup.items():
+                for name, arr in (dedup or {}).items():
                     value = arr[i]
                     if value is not None:
                         image[name] = value
@@ -51,6 +53,21 @@ class DebugMeta:
         return data
 
 
+@_deduplicate_interface("modules")
+class Modules:
+    @staticmethod
+    def encode(data):
+        return data, None
+
+    @staticmethod
+    def decode(dedup, data):
+        # nothing is inlined, the modules are lost if the shared part is
+        return dedup if dedup is not None else data
+
+
+INTERFACE_KEYS = tuple(_INTERFACES)
+
+
 def deduplicate(data):
     patchsets = []
     extra_keys = {}
@@ -59,7 +76,17 @@ def deduplicate(data):
         if key not in data:
             continue
 
-        to_deduplicate, to_inline = interface.encode(data.pop(key))
+        value = data.pop(key)
+        if not value:
+            # not worth a shared node
+            data[key] = value
+            continue
+
+        to_deduplicate, to_inline = interface.encode(value)
+        if not to_deduplicate:
+            data[key] = interface.decode(to_deduplicate, to_inline)
+            continue
+
         to_deduplicate_serialized = json.dumps(to_deduplicate, sort_keys=True).encode("utf8")
         checksum = hashlib.md5(to_deduplicate_serialized).hexdigest()
         extra_keys[checksum] = to_deduplicate
@@ -71,19 +98,28 @@ def deduplicate(data):
     return data, extra_keys
 
 
+def get_checksums(data):
+    return [checksum for _, checksum, _ in data.get("__nodestore_patchsets") or ()]
+
+
 def assemble(data, get_extra_keys):
     if not data.get("__nodestore_patchsets"):
         return data
 
-    checksums = []
-    for key, checksum, inlined in data["__nodestore_patchsets"]:
-        checksums.append(checksum)
-
-    deduplicated_interfaces = get_extra_keys(checksums)
+    deduplicated_interfaces = get_extra_keys(get_checksums(data))
 
     for key, checksum, inlined in data["__nodestore_patchsets"]:
-        deduplicated = deduplicated_interfaces[checksum]
-        data[key] = _INTERFACES[key].decode(deduplicated, inlined)
+        if checksum in deduplicated_interfaces:
+            deduplicated = deduplicated_interfaces[checksum]
+        else:
+            # The shared part expired or was never written, fall back to
+            # whatever was inlined into the event itself.
+            metrics.incr("eventstore.compressor.missing", tags={"interface": key})
+            deduplicated = None
+
+        value = _INTERFACES[key].decode(deduplicated, inlined)
+        if value is not None:
+            data[key] = value
 
     del data["__nodestore_patchsets"]
     return data
@@ -9,6 +9,8 @@ from collections import defaultdict
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
+    Hashable,
     Iterable,
     List,
     Mapping,
@@ -16,11 +18,13 @@ from typing import (
     MutableSet,
     Optional,
     Sequence,
+    Tuple,
     Type,
 )
 
 import sentry_sdk
 from django.conf import settings
+from django.db.models.signals import post_delete, post_save
 
 from .base import Feature
 from .exceptions import FeatureNotRegistered
@@ -129,6 +133,52 @@ class RegisteredFeatureManager:
         return result
 
 
+class UncacheableFeatureCheck(Exception):
+    pass
+
+
+def _get_cache_key_value(value: Any) -> Hashable:
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    # Models (also lazily loaded request users, which proxy `__class__`),
+    # hybrid cloud objects and anonymous users are identified by their id
+    pk = getattr(value, "pk", getattr(value, "id", False))
+    if pk is None or isinstance(pk, int):
+        return (value.__class__.__name__, pk)
+    raise UncacheableFeatureCheck(value.__class__.__name__)
+
+
+def _request_cached(key: Hashable, compute: Callable[[], Any]) -> Any:
+    # imported lazily, `sentry.app` loads all backends
+    from sentry.utils import request_cache
+
+    return request_cache.get_or_compute(key, compute)
+
+
+def _clear_request_cache(**kwargs: Any) -> None:
+    from sentry.utils import request_cache
+
+    request_cache.clear_cache()
+
+
+# Handlers may read fields of the organization or project (e.g. its flags or
+# status), so cached results are dropped when either one changes during the
+# request.
+for _model in ("sentry.Organization", "sentry.Project"):
+    post_save.connect(
+        _clear_request_cache,
+        sender=_model,
+        dispatch_uid="sentry.features.clear_request_cache",
+        weak=False,
+    )
+    post_delete.connect(
+        _clear_request_cache,
+        sender=_model,
+        dispatch_uid="sentry.features.clear_request_cache",
+        weak=False,
+    )
+
+
 # TODO: Change RegisteredFeatureManager back to object once it can be removed
 class FeatureManager(RegisteredFeatureManager):
     def __init__(self) -> None:
@@ -210,9 +260,31 @@ class FeatureManager(RegisteredFeatureManager):
         Depending on the Feature class, additional arguments may need to be
         provided to assign organization or project context to the feature.
 
+        While a request is being handled, results are cached in the request
+        cache (see ``sentry.utils.request_cache``).
+
         >>> FeatureManager.has('organizations:feature', organization, actor=request.user)
 
         """
+        try:
+            key = (
+                "features.has",
+                id(self),
+                name,
+                skip_entity,
+                tuple(_get_cache_key_value(arg) for arg in args),
+                tuple(sorted((k, _get_cache_key_value(v)) for k, v in kwargs.items())),
+            )
+        except UncacheableFeatureCheck:
+            return self._has(name, *args, skip_entity=skip_entity, **kwargs)
+
+        return _request_cached(  # type: ignore[no-any-return]
+            key, lambda: self._has(name, *args, skip_entity=skip_entity, **kwargs)
+        )
+
+    def _has(
+        self, name: str, *args: Any, skip_entity: Optional[bool] = False, **kwargs: Any
+    ) -> bool:
         try:
             actor = kwargs.pop("actor", None)
             feature = self.get(name, *args, **kwargs)
@@ -250,13 +322,32 @@ class FeatureManager(RegisteredFeatureManager):
 
         Will only accept one type of feature, either all ProjectFeatures or all
         OrganizationFeatures.
+
+        Like ``has``, results are cached until the current request finishes.
         """
-        if self._entity_handler:
+        if not self._entity_handler:
+            return None
+        try:
+            key: Tuple[Hashable, ...] = (
+                "features.batch_has",
+                id(self),
+                feature_names if isinstance(feature_names, str) else tuple(feature_names),
+                _get_cache_key_value(actor),
+                projects and tuple(_get_cache_key_value(project) for project in projects),
+                _get_cache_key_value(organization),
+            )
+        except UncacheableFeatureCheck:
             return self._entity_handler.batch_has(
                 feature_names, actor, projects=projects, organization=organization
             )
-        else:
-            return None
+
+        entity_handler = self._entity_handler
+        return _request_cached(  # type: ignore[no-any-return]
+            key,
+            lambda: entity_handler.batch_has(
+                feature_names, actor, projects=projects, organization=organization
+            ),
+        )
 
 
 class FeatureCheckBatch:
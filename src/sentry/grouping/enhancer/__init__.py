@@ -1,4 +1,5 @@
 import base64
+import functools
 import os
 import zlib
 
@@ -96,6 +97,98 @@ class StacktraceState:
         return f"{hint} by stack trace rule ({description})"
 
 
+class MatcherIndex:
+    """Precomputed matcher index over a list of rules.
+
+    Every distinct frame matcher used by the rules is assigned a bit, and the
+    set of matchers a frame satisfies is computed once per distinct frame and
+    memoized across events as a bit mask.  Rules are compiled into the masks
+    they require on the frame itself, its caller and its callee, so matching
+    a rule against a stacktrace is reduced to integer comparisons.
+    """
+
+    max_cached_frames = 10000
+
+    def __init__(self, rules):
+        self._bits = {}
+        self._matchers = []
+        self._frame_masks = {}
+
+        self.modifier_rules = [self._compile(rule) for rule in rules if rule.is_modifier]
+        self.updater_rules = [self._compile(rule) for rule in rules if rule.is_updater]
+
+    def _bit(self, matcher):
+        bit = self._bits.get(matcher)
+        if bit is None:
+            bit = self._bits[matcher] = 1 << len(self._matchers)
+            self._matchers.append(matcher)
+        return bit
+
+    def _compile(self, rule):
+        frame_mask = caller_mask = callee_mask = 0
+        for matcher in rule._other_matchers:
+            if isinstance(matcher, (CallerMatch, CalleeMatch)):
+                if isinstance(matcher.caller, ExceptionFieldMatch):
+                    # Does not depend on the neighboring frame alone, fall back
+                    # to evaluating the rule directly.
+                    return rule, None, None, None
+                if isinstance(matcher, CallerMatch):
+                    caller_mask |= self._bit(matcher.caller)
+                else:
+                    callee_mask |= self._bit(matcher.caller)
+            else:
+                frame_mask |= self._bit(matcher)
+        return rule, frame_mask, caller_mask, callee_mask
+
+    def get_frame_masks(self, match_frames, platform, cache):
+        rv = []
+        for match_frame in match_frames:
+            fingerprint = tuple(match_frame.values())
+            mask = self._frame_masks.get(fingerprint)
+            if mask is None:
+                mask = 0
+                frames = [match_frame]
+                for matcher in self._matchers:
+                    if matcher.matches_frame(frames, 0, platform, None, cache):
+                        mask |= self._bits[matcher]
+                if len(self._frame_masks) >= self.max_cached_frames:
+                    self._frame_masks.clear()
+                self._frame_masks[fingerprint] = mask
+            rv.append(mask)
+        return rv
+
+    def get_matching_frame_actions(
+        self, compiled_rule, frame_masks, match_frames, platform, exception_data, cache
+    ):
+        """Equivalent to ``Rule.get_matching_frame_actions`` for a compiled rule."""
+        rule, frame_mask, caller_mask, callee_mask = compiled_rule
+        if frame_mask is None:
+            return rule.get_matching_frame_actions(match_frames, platform, exception_data, cache)
+
+        if not rule.matchers:
+            return []
+
+        for m in rule._exception_matchers:
+            if not m.matches_frame(match_frames, None, platform, exception_data, cache):
+                return []
+
+        rv = []
+        last_idx = len(frame_masks) - 1
+        for idx, mask in enumerate(frame_masks):
+            if mask & frame_mask != frame_mask:
+                continue
+            if caller_mask and (idx == 0 or frame_masks[idx - 1] & caller_mask != caller_mask):
+                continue
+            if callee_mask and (
+                idx == last_idx or frame_masks[idx + 1] & callee_mask != callee_mask
+            ):
+                continue
+            for action in rule.actions:
+                rv.append((idx, action))
+
+        return rv
+
+
 class Enhancements:
 
     # NOTE: You must add a version to ``VERSIONS`` any time attributes are added
@@ -113,8 +206,7 @@ class Enhancements:
             bases = []
         self.bases = bases
 
-        self._modifier_rules = [rule for rule in self.iter_rules() if rule.is_modifier]
-        self._updater_rules = [rule for rule in self.iter_rules() if rule.is_updater]
+        self._matcher_index = MatcherIndex(list(self.iter_rules()))
 
     def apply_modifications_to_frame(self, frames, platform, exception_data):
         """This applies the frame modifications to the frames itself.  This
@@ -125,11 +217,19 @@ class Enhancements:
 
         match_frames = [create_match_frame(frame, platform) for frame in frames]
 
-        for rule in self._modifier_rules:
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, cache
-            ):
+        index = self._matcher_index
+        frame_masks = index.get_frame_masks(match_frames, platform, cache)
+        for compiled_rule in index.modifier_rules:
+            rule = compiled_rule[0]
+            actions = index.get_matching_frame_actions(
+                compiled_rule, frame_masks, match_frames, platform, exception_data, cache
+            )
+            for idx, action in actions:
                 action.apply_modifications_to_frame(frames, match_frames, idx, rule=rule)
+            if actions:
+                # Actions change the in_app flag or category of match frames,
+                # which following rules have to see.
+                frame_masks = index.get_frame_masks(match_frames, platform, cache)
 
     def update_frame_components_contributions(self, components, frames, platform, exception_data):
 
@@ -138,11 +238,13 @@ class Enhancements:
         match_frames = [create_match_frame(frame, platform) for frame in frames]
 
         stacktrace_state = StacktraceState()
+        index = self._matcher_index
+        frame_masks = index.get_frame_masks(match_frames, platform, cache)
         # Apply direct frame actions and update the stack state alongside
-        for rule in self._updater_rules:
-
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, cache
+        for compiled_rule in index.updater_rules:
+            rule = compiled_rule[0]
+            for idx, action in index.get_matching_frame_actions(
+                compiled_rule, frame_masks, match_frames, platform, exception_data, cache
             ):
                 action.update_frame_components_contributions(components, frames, idx, rule=rule)
                 action.modify_stacktrace_state(stacktrace_state, rule)
@@ -251,6 +353,12 @@ class Enhancements:
     def loads(cls, data):
         if isinstance(data, str):
             data = data.encode("ascii", "ignore")
+        # Loaded enhancements are shared between all events using the same
+        # config, so that their matcher index and frame masks are reused.
+        return _load_enhancements(cls, data)
+
+    @classmethod
+    def _loads(cls, data):
         padded = data + b"=" * (4 - (len(data) % 4))
         try:
             return cls._from_config_structure(
@@ -458,5 +566,10 @@ def _load_configs():
     return rv
 
 
+@functools.lru_cache(maxsize=100)
+def _load_enhancements(cls, data):
+    return cls._loads(data)
+
+
 ENHANCEMENT_BASES = _load_configs()
 del _load_configs
@@ -46,8 +46,9 @@ The replacement rules are interpreted by Relay to match and replace `*`, and to
 """
 
 import logging
-from collections import UserDict, defaultdict
-from typing import Iterable, List, Optional, Union
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Union
 
 import sentry_sdk
 from typing_extensions import TypeAlias
@@ -83,7 +84,11 @@ class TreeClusterer(Clusterer):
             parts = tx_name.split(SEP)
             node = self._tree
             for part in parts:
-                node = node.setdefault(part, Node())
+                child = node.get(part)
+                if child is None:
+                    # Segments like "users" or "api" repeat across most names
+                    child = node[sys.intern(part)] = Node()
+                node = child
 
     def get_rules(self) -> List[ReplacementRule]:
         """Computes the rules for the current tree."""
@@ -100,7 +105,7 @@ class TreeClusterer(Clusterer):
             self._tree.merge(self._merge_threshold)
 
         # Generate exactly 1 rule for every merge
-        rule_paths = [path for path in self._tree.paths() if path[-1] is MERGED]
+        rule_paths = list(self._tree.merged_paths())
         self._rules = [self._build_rule(path) for path in rule_paths]
 
     def _clean_rules(self) -> None:
@@ -127,9 +132,12 @@ class TreeClusterer(Clusterer):
 Edge: TypeAlias = Union[str, Merged]
 
 
-class Node(UserDict):  # type: ignore
+class Node(Dict[Edge, "Node"]):
     """Keys in this dict are names of the children"""
 
+    # Trees have one node per distinct path segment, keep them small
+    __slots__ = ()
+
     def paths(self, ancestors: Optional[List[Edge]] = None) -> Iterable[List[Edge]]:
         """Collect all paths and subpaths through the graph"""
         if ancestors is None:
@@ -139,6 +147,20 @@ class Node(UserDict):  # type: ignore
             yield path
             yield from child.paths(ancestors=path)
 
+    def merged_paths(self) -> Iterable[List[Edge]]:
+        """Collect all paths that end in a merged node"""
+        path: List[Edge] = []
+
+        def visit(node: Node) -> Iterable[List[Edge]]:
+            for name, child in node.items():
+                path.append(name)
+                if name is MERGED:
+                    yield list(path)
+                yield from visit(child)
+                path.pop()
+
+        return visit(self)
+
     def merge(self, merge_threshold: int) -> None:
         """Recursively merge children of high-cardinality nodes"""
         if len(self) >= merge_threshold:
@@ -156,6 +178,11 @@ class Node(UserDict):  # type: ignore
             for name, child in node.items():
                 children_by_name[name].append(child)
 
+        # The merged nodes are discarded, so subtrees that only occur once
+        # can be moved into the merged node instead of being copied.
         return Node(
-            {name: cls._merge_nodes(children) for name, children in children_by_name.items()}
+            {
+                name: children[0] if len(children) == 1 else cls._merge_nodes(children)
+                for name, children in children_by_name.items()
+            }
         )
@@ -1,8 +1,13 @@
+import threading
+import time
+from collections import OrderedDict
+
 from symbolic import SourceView
 
+from sentry.utils import metrics
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "SharedSourceMapCache", "MemoizedSourceMapView"]
 
 
 def is_utf8(codec):
@@ -90,3 +95,109 @@ class SourceMapCache:
             sourcemap = self.get(sourcemap_url)
             return (sourcemap_url, sourcemap)
         return (None, None)
+
+
+def _estimate_token_size(token):
+    size = 100
+    for attr in ("src", "name", "function_name", "context_line"):
+        value = getattr(token, attr, None)
+        if isinstance(value, str):
+            size += len(value)
+    for attr in ("pre_context", "post_context"):
+        for line in getattr(token, attr, None) or ():
+            size += len(line)
+    return size
+
+
+class MemoizedSourceMapView:
+    """
+    Wraps a parsed source map and memoizes token lookups per location, so
+    that frames seen before skip the lookup and source context extraction.
+
+    Tokens include their lines of context, so memoization stops once the
+    estimated size of the memoized tokens reaches ``max_size`` bytes.
+    """
+
+    def __init__(self, view, max_size=1024 * 1024):
+        self.view = view
+        self.max_size = max_size
+        self.size = 0
+        self._tokens = {}
+
+    def lookup(self, line, col, context_lines):
+        key = (line, col, context_lines)
+        try:
+            return self._tokens[key]
+        except KeyError:
+            pass
+
+        token = self.view.lookup(line, col, context_lines)
+        size = _estimate_token_size(token)
+        if self.size + size <= self.max_size:
+            self._tokens[key] = token
+            self.size += size
+        return token
+
+
+class SharedSourceMapCache:
+    """
+    Process wide LRU of parsed source maps, shared between events.
+
+    Entries are weighted by the size of the files the source map was parsed
+    from, plus the ``memo_size`` their memoized lookups may grow to, and
+    evicted once ``max_size`` is exceeded. They also expire after ``ttl``
+    seconds so that re-uploaded artifacts are eventually picked up.
+    """
+
+    def __init__(self, max_size, ttl, memo_size=1024 * 1024):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.memo_size = memo_size
+        self._lock = threading.Lock()
+        # key -> (view, size, expires_at)
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.time():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        metrics.incr("sourcemaps.shared_cache", tags={"result": "miss" if entry is None else "hit"})
+        return entry[0] if entry is not None else None
+
+    def add(self, key, view, size):
+        size += self.memo_size
+        if size > self.max_size:
+            return view
+
+        view = MemoizedSourceMapView(view, max_size=self.memo_size)
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (view, size, time.time() + self.ttl)
+            self._size += size
+            while self._size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+
+        if evicted:
+            metrics.incr("sourcemaps.shared_cache.evicted", amount=evicted)
+        return view
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
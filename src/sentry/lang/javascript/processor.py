@@ -3,8 +3,10 @@ import errno
 import logging
 import re
 import sys
+import threading
 import time
 import zlib
+from collections import OrderedDict
 from datetime import datetime
 from io import BytesIO
 from itertools import groupby
@@ -22,7 +24,12 @@ from symbolic import SourceMapCache as SmCache
 from sentry import features, http, options
 from sentry.event_manager import set_tag
 from sentry.models import EventError, Organization, ReleaseFile
-from sentry.models.releasefile import ARTIFACT_INDEX_FILENAME, ReleaseArchive, read_artifact_index
+from sentry.models.releasefile import (
+    ARTIFACT_INDEX_FILENAME,
+    MappedReleaseArchive,
+    ReleaseArchive,
+    read_artifact_index,
+)
 from sentry.stacktraces.processing import StacktraceProcessor
 from sentry.utils import json, metrics
 
@@ -37,7 +44,7 @@ from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path
 from sentry.utils.urls import non_standard_url_join
 
-from .cache import SourceCache, SourceMapCache
+from .cache import SharedSourceMapCache, SourceCache, SourceMapCache
 
 __all__ = ["JavaScriptStacktraceProcessor"]
 
@@ -79,6 +86,23 @@ MAX_RESOURCE_FETCHES = 100
 
 CACHE_MAX_VALUE_SIZE = settings.SENTRY_CACHE_MAX_VALUE_SIZE
 
+# Parsed source maps of releases are shared between all events handled by a
+# process. The size limit applies to the raw files the maps are parsed from,
+# plus the memoized lookups of every map.
+SHARED_SOURCEMAP_CACHE_MAX_SIZE = 128 * 1024 * 1024
+SHARED_SOURCEMAP_CACHE_TTL = 300
+
+shared_sourcemap_cache = SharedSourceMapCache(
+    max_size=SHARED_SOURCEMAP_CACHE_MAX_SIZE, ttl=SHARED_SOURCEMAP_CACHE_TTL
+)
+
+# Release archives kept memory-mapped by a process, see
+# `fetch_mapped_release_archive`.
+MAX_MAPPED_RELEASE_ARCHIVES = 64
+
+_mapped_release_archives = OrderedDict()
+_mapped_release_archives_lock = threading.Lock()
+
 logger = logging.getLogger(__name__)
 
 
@@ -526,6 +550,95 @@ def fetch_release_archive_for_url(release, dist, url) -> Optional[IO]:
             return file_
 
 
+@metrics.wraps("sourcemaps.fetch_mapped_release_archive")
+def fetch_mapped_release_archive(release, dist, archive_ident) -> Optional[MappedReleaseArchive]:
+    """Return the memory-mapped release archive with the given ident.
+
+    Archives are copied to the local release file cache and stay mapped for
+    as long as they are among the most recently used ones of this process,
+    so that subsequent lookups skip the database and the cache entirely.
+
+    The returned archive is acquired for the caller, which has to `release`
+    it once done reading. Evicted archives are unmapped after their last
+    reader released them.
+    """
+    key = (release.id, archive_ident)
+    with _mapped_release_archives_lock:
+        archive = _mapped_release_archives.get(key)
+        # archives are only closed after they were removed from the LRU, so
+        # acquiring one that is still in there always succeeds
+        if archive is not None and archive.acquire():
+            _mapped_release_archives.move_to_end(key)
+            return archive
+
+    releasefile = (
+        ReleaseFile.objects.filter(
+            release_id=release.id, dist_id=dist.id if dist else dist, ident=archive_ident
+        )
+        .select_related("file")
+        .first()
+    )
+    if releasefile is None:
+        # This should not happen when there is an archive_ident in the manifest
+        logger.error("sourcemaps.missing_archive")
+        return None
+
+    try:
+        with sentry_sdk.start_span(op="fetch_mapped_release_archive.map_archive"):
+            path = fetch_retry_policy(lambda: ReleaseFile.cache.getpath(releasefile))
+            archive = MappedReleaseArchive(path)
+    except Exception:
+        logger.error("sourcemaps.read_archive_failed", exc_info=sys.exc_info())
+        return None
+    archive.acquire()
+
+    evicted = []
+    with _mapped_release_archives_lock:
+        previous = _mapped_release_archives.pop(key, None)
+        if previous is not None:
+            evicted.append(previous)
+        _mapped_release_archives[key] = archive
+        while len(_mapped_release_archives) > MAX_MAPPED_RELEASE_ARCHIVES:
+            evicted.append(_mapped_release_archives.popitem(last=False)[1])
+
+    for evicted_archive in evicted:
+        evicted_archive.close()
+
+    return archive
+
+
+def fetch_release_artifact_from_mapped_archive(url, release, dist, cache_key, cache_key_meta):
+    """
+    Read a release artifact from a memory-mapped archive. Returns ``None``
+    if the artifact is not part of any archive.
+    """
+    info = get_index_entry(release, dist, url)
+    if info is None:
+        return None
+
+    archive = fetch_mapped_release_archive(release, dist, info["archive_ident"])
+    if archive is None:
+        return None
+
+    try:
+        body = archive.read(info["filename"])
+    except KeyError:
+        # The manifest mapped the url to an archive, but the file is not there.
+        logger.error("Release artifact %r not found in archive %s", url, archive.path)
+        return None
+    finally:
+        archive.release()
+
+    return fetch_and_cache_artifact(
+        url,
+        lambda: BytesIO(body),
+        cache_key,
+        cache_key_meta,
+        info.get("headers", {}),
+        compress_fn=compress,
+    )
+
+
 def compress(fp: IO) -> Tuple[bytes, bytes]:
     """Alternative for compress_file when fp does not support chunks"""
     content = fp.read()
@@ -550,10 +663,23 @@ def fetch_release_artifact(url, release, dist):
         return result_from_cache(url, result)
 
     start = time.monotonic()
-    with sentry_sdk.start_span(
-        op="JavaScriptStacktraceProcessor.fetch_release_artifact.fetch_release_archive_for_url"
-    ):
-        archive_file = fetch_release_archive_for_url(release, dist, url)
+    if options.get("releasefile.mapped-archives"):
+        with sentry_sdk.start_span(
+            op="JavaScriptStacktraceProcessor.fetch_release_artifact.fetch_from_mapped_archive"
+        ):
+            result = fetch_release_artifact_from_mapped_archive(
+                url, release, dist, cache_key, cache_key_meta
+            )
+        if result is not None:
+            metrics.timing("sourcemaps.release_artifact_from_archive", time.monotonic() - start)
+            return result
+        archive_file = None
+    else:
+        with sentry_sdk.start_span(
+            op="JavaScriptStacktraceProcessor.fetch_release_artifact.fetch_release_archive_for_url"
+        ):
+            archive_file = fetch_release_archive_for_url(release, dist, url)
+
     if archive_file is not None:
         try:
             archive = ReleaseArchive(archive_file)
@@ -751,7 +877,23 @@ def get_max_age(headers):
     return min(max_age, CACHE_CONTROL_MAX)
 
 
+def get_shared_sourcemap_cache_key(url, source, project, release, dist):
+    return (
+        project.id if project else None,
+        release.id,
+        dist.id if dist else None,
+        md5_text(url, b"\x00", source).hexdigest(),
+    )
+
+
 def fetch_sourcemap(url, source=b"", project=None, release=None, dist=None, allow_scraping=True):
+    shared_cache_key = None
+    if release is not None:
+        shared_cache_key = get_shared_sourcemap_cache_key(url, source, project, release, dist)
+        sourcemap_view = shared_sourcemap_cache.get(shared_cache_key)
+        if sourcemap_view is not None:
+            return sourcemap_view
+
     if is_data_uri(url):
         try:
             body = base64.b64decode(
@@ -778,13 +920,19 @@ def fetch_sourcemap(url, source=b"", project=None, release=None, dist=None, allo
         with sentry_sdk.start_span(
             op="JavaScriptStacktraceProcessor.fetch_sourcemap.SmCache.from_bytes"
         ):
-            return SmCache.from_bytes(source, body)
+            sourcemap_view = SmCache.from_bytes(source, body)
 
     except Exception as exc:
         # This is in debug because the product shows an error already.
         logger.debug(str(exc), exc_info=True)
         raise UnparseableSourcemap({"url": http.expose_url(url)})
 
+    if shared_cache_key is not None:
+        sourcemap_view = shared_sourcemap_cache.add(
+            shared_cache_key, sourcemap_view, len(source) + len(body)
+        )
+    return sourcemap_view
+
 
 def is_data_uri(url):
     return url[:BASE64_PREAMBLE_LENGTH] == BASE64_SOURCEMAP_PREAMBLE
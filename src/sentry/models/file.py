@@ -3,10 +3,9 @@ import mmap
 import os
 import tempfile
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from hashlib import sha1
-from threading import Semaphore
 from uuid import uuid4
 
 from django.conf import settings
@@ -143,7 +142,7 @@ class FileBlob(Model):
         blobs_created = []
         blobs_to_save = []
         locks = set()
-        semaphore = Semaphore(value=MULTI_BLOB_UPLOAD_CONCURRENCY)
+        uploads = set()
 
         def _upload_and_pend_chunk(fileobj, size, checksum, lock):
             logger.debug(
@@ -186,7 +185,14 @@ class FileBlob(Model):
                 _save_blob(blob)
                 lock.__exit__(None, None, None)
                 locks.discard(lock)
-                semaphore.release()
+
+        def _wait_for_uploads(return_when):
+            done, not_done = wait(uploads, return_when=return_when)
+            uploads.intersection_update(not_done)
+            for future in done:
+                # raises the error of a failed upload
+                future.result()
+            _flush_blobs()
 
         try:
             with ThreadPoolExecutor(max_workers=MULTI_BLOB_UPLOAD_CONCURRENCY) as exe:
@@ -223,16 +229,17 @@ class FileBlob(Model):
                     locks.add(lock)
 
                     # Otherwise we leave the blob locked and submit the task.
-                    # We use the semaphore to ensure we never schedule too
-                    # many.  The upload will be done with a certain amount
-                    # of concurrency controlled by the semaphore and the
-                    # `_flush_blobs` call will take all those uploaded
-                    # blobs and associate them with the database.
-                    semaphore.acquire()
-                    exe.submit(_upload_and_pend_chunk(fileobj, size, checksum, lock))
+                    # An upload only leaves `uploads` once its blob was
+                    # saved by `_flush_blobs`, so waiting for a free slot
+                    # here bounds both the uploads in flight and the
+                    # uploaded blobs that are not associated with the
+                    # database yet.
+                    if len(uploads) >= MULTI_BLOB_UPLOAD_CONCURRENCY:
+                        _wait_for_uploads(FIRST_COMPLETED)
+                    uploads.add(exe.submit(_upload_and_pend_chunk, fileobj, size, checksum, lock))
                     logger.debug("FileBlob.from_files.end", extra={"checksum": reference_checksum})
 
-            _flush_blobs()
+                _wait_for_uploads(ALL_COMPLETED)
         finally:
             for lock in locks:
                 try:
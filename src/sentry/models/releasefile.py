@@ -1,12 +1,16 @@
 import errno
 import logging
+import mmap
 import os
+import struct
+import threading
 import zipfile
+import zlib
 from contextlib import contextmanager
 from hashlib import sha1
 from io import BytesIO
 from tempfile import TemporaryDirectory
-from typing import IO, Optional, Tuple
+from typing import IO, Dict, Optional, Tuple
 from urllib.parse import urlsplit, urlunsplit
 
 from django.core.files.base import File as FileObj
@@ -156,6 +160,11 @@ class ReleaseFileCache:
             metrics.timing("release_file.cache.get.size", file_size, tags={"cutoff": True})
             return releasefile.file.getfile()
 
+        return FileObj(open(self.getpath(releasefile), "rb"))
+
+    def getpath(self, releasefile):
+        """Return the path of a local copy of the file, fetching it if needed."""
+        file_size = releasefile.file.size
         file_id = str(releasefile.file.id)
         organization_id = str(releasefile.organization_id)
         file_path = os.path.join(self.cache_path, organization_id, file_id)
@@ -170,7 +179,7 @@ class ReleaseFileCache:
             hit = False
 
         metrics.timing("release_file.cache.get.size", file_size, tags={"hit": hit, "cutoff": False})
-        return FileObj(open(file_path, "rb"))
+        return file_path
 
     def clear_old_entries(self):
         clear_cached_files(self.cache_path)
@@ -228,6 +237,177 @@ class ReleaseArchive:
         return temp_dir
 
 
+class ReleaseArchiveIndex:
+    """Binary index of the members of a release archive.
+
+    Maps every filename to the location of its data within the ZIP file, so
+    that members can be read without parsing the central directory and the
+    manifest again.
+    """
+
+    _header = struct.Struct("<4sI")
+    _entry = struct.Struct("<HQQQH")
+    _magic = b"SRAI"
+
+    def __init__(self, entries: Dict[str, Tuple[int, int, int, int]]):
+        # filename -> (data offset, compressed size, file size, compression)
+        self.entries = entries
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.entries
+
+    def __getitem__(self, filename: str) -> Tuple[int, int, int, int]:
+        return self.entries[filename]
+
+    @classmethod
+    def build(cls, fileobj: IO) -> "ReleaseArchiveIndex":
+        entries = {}
+        with zipfile.ZipFile(fileobj) as zip_file:
+            for info in zip_file.infolist():
+                if info.is_dir() or info.flag_bits & 0x1:
+                    # Encrypted members can only be read through `zipfile`
+                    continue
+                # The local header can have a different extra field than the
+                # central directory, so its length has to be read from there.
+                fileobj.seek(info.header_offset + 26)
+                name_length, extra_length = struct.unpack("<HH", fileobj.read(4))
+                offset = info.header_offset + 30 + name_length + extra_length
+                entries[info.filename] = (
+                    offset,
+                    info.compress_size,
+                    info.file_size,
+                    info.compress_type,
+                )
+
+        return cls(entries)
+
+    def dumps(self) -> bytes:
+        parts = [self._header.pack(self._magic, len(self.entries))]
+        for filename, entry in self.entries.items():
+            encoded = filename.encode("utf-8")
+            parts.append(self._entry.pack(len(encoded), *entry))
+            parts.append(encoded)
+        return b"".join(parts)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "ReleaseArchiveIndex":
+        magic, count = cls._header.unpack_from(data)
+        if magic != cls._magic:
+            raise ValueError("Invalid release archive index")
+
+        entries = {}
+        pos = cls._header.size
+        for _ in range(count):
+            name_length, *entry = cls._entry.unpack_from(data, pos)
+            pos += cls._entry.size
+            entries[data[pos : pos + name_length].decode("utf-8")] = tuple(entry)
+            pos += name_length
+
+        return cls(entries)
+
+
+class MappedReleaseArchive:
+    """Read-only view of a release archive on local disk.
+
+    The archive is memory-mapped and its members are located through a
+    `ReleaseArchiveIndex` stored next to it, which is built on first use.
+
+    Archives can be shared between threads. Readers `acquire` the archive
+    before reading from it and `release` it afterwards, `close` only unmaps
+    the archive once the last reader released it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._readers = 0
+        self._closing = False
+        self._fileobj = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+            self.index = self._load_index()
+        except Exception:
+            self._fileobj.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc, value, tb):
+        self.close()
+
+    def acquire(self) -> bool:
+        """Register a reader. Returns ``False`` if the archive is being closed."""
+        with self._lock:
+            if self._closing:
+                return False
+            self._readers += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._readers -= 1
+            if self._closing and not self._readers:
+                self._close()
+
+    def close(self):
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            if not self._readers:
+                self._close()
+
+    def _close(self):
+        self._mmap.close()
+        self._fileobj.close()
+
+    def _read_with_zipfile(self, filename: str) -> bytes:
+        # A file object of its own, the shared one may be used by other
+        # threads at the same time.
+        with zipfile.ZipFile(self.path) as zip_file:
+            return zip_file.read(filename)
+
+    def _load_index(self) -> ReleaseArchiveIndex:
+        index_path = self.path + ".index"
+        try:
+            with open(index_path, "rb") as f:
+                return ReleaseArchiveIndex.loads(f.read())
+        except (OSError, ValueError, struct.error):
+            pass
+
+        index = ReleaseArchiveIndex.build(self._fileobj)
+        # Write atomically, other processes may be reading the same archive.
+        tmp_path = f"{index_path}.{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(index.dumps())
+        os.replace(tmp_path, index_path)
+        metrics.incr("release_file.archive_index.built")
+        return index
+
+    def read(self, filename: str) -> bytes:
+        """Return the contents of a member of the archive.
+
+        May raise ``KeyError``
+        """
+        try:
+            offset, compress_size, file_size, compress_type = self.index[filename]
+        except KeyError:
+            # Members not covered by the index (e.g. encrypted ones)
+            return self._read_with_zipfile(filename)
+
+        data = memoryview(self._mmap)[offset : offset + compress_size]
+        try:
+            if compress_type == zipfile.ZIP_STORED:
+                return bytes(data)
+            if compress_type == zipfile.ZIP_DEFLATED:
+                return zlib.decompress(data, -zlib.MAX_WBITS, file_size)
+        finally:
+            data.release()
+
+        return self._read_with_zipfile(filename)
+
+
 class _ArtifactIndexData:
     """Holds data of artifact index and keeps track of changes"""
 
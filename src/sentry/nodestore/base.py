@@ -1,9 +1,14 @@
+import copy
+import logging
+import time
+from datetime import timedelta
 from threading import local
 
 import sentry_sdk
 from django.core.cache import InvalidCacheBackendError, caches
 
-from sentry.utils import json
+from sentry.nodestore.compression import DictionaryCompressor, is_compressed
+from sentry.utils import json, metrics
 from sentry.utils.cache import memoize
 from sentry.utils.services import Service
 
@@ -22,6 +27,12 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json._default_decoder.decode
 
+logger = logging.getLogger(__name__)
+
+
+def shared_node_id(checksum):
+    return f"nodestore-shared:{checksum}"
+
 
 class NodeStorage(local, Service):
     """
@@ -56,8 +67,33 @@ class NodeStorage(local, Service):
 
     This is used in reprocessing to store a snapshot of the event from multiple
     stages of the pipeline.
+
+    Backends can additionally opt into dictionary compression by setting
+    ``compressor`` to a ``DictionaryCompressor``. Nodes are then compressed
+    with a zstd dictionary trained on the events of the same project, see
+    ``train_compression_dictionary``. Nodes written without it keep decoding.
+    Dictionaries are trained and rotated by the periodic
+    ``sentry.nodestore.tasks.schedule_compression_dictionary_training`` task.
+
+    With ``deduplicate_interfaces`` enabled, interfaces that repeat across
+    events (``debug_meta`` images, the SDK modules list) are split off by
+    ``sentry.eventstore.compressor`` and stored once as content-addressed
+    nodes, which are fetched in one batch and reassembled on read. Shared
+    nodes expire by TTL instead of being refcounted: they are written with
+    the node TTL plus ``deduplication_refresh_interval``, and rewritten
+    whenever a node referencing them would outlive them. Nodes without a TTL
+    (neither passed to ``set`` nor a backend default) are never
+    deduplicated, as nothing could ever remove their shared nodes. If a
+    shared node is missing on read anyway, a warning is logged and the
+    interface is reassembled from what was inlined into the node, which
+    loses the SDK modules and the deduplicated fields of debug images.
     """
 
+    compressor = None
+
+    deduplicate_interfaces = False
+    deduplication_refresh_interval = 3600
+
     __all__ = (
         "delete",
         "delete_multi",
@@ -68,6 +104,9 @@ class NodeStorage(local, Service):
         "cleanup",
         "validate",
         "bootstrap",
+        "uses_compression_dictionaries",
+        "compression_dictionary_needs_training",
+        "train_compression_dictionary",
     )
 
     def delete(self, id):
@@ -135,7 +174,8 @@ class NodeStorage(local, Service):
 
             span.set_tag("subkey", str(subkey))
             bytes_data = self._get_bytes(id)
-            rv = self._decode(bytes_data, subkey=subkey)
+            rv = self._decode(self._decompress_bytes(bytes_data), subkey=subkey)
+            rv = self._assemble_multi({id: rv})[id]
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
@@ -179,10 +219,14 @@ class NodeStorage(local, Service):
             else:
                 uncached_ids = id_list
 
-            items = {
-                id: self._decode(value, subkey=subkey)
-                for id, value in self._get_bytes_multi(uncached_ids).items()
-            }
+            items = self._assemble_multi(
+                {
+                    id: self._decode(value, subkey=subkey)
+                    for id, value in self._decompress_bytes_multi(
+                        self._get_bytes_multi(uncached_ids)
+                    ).items()
+                }
+            )
             if subkey is None:
                 self._set_cache_items(items)
                 items.update(cache_items)
@@ -241,11 +285,173 @@ class NodeStorage(local, Service):
             span.set_tag("node_id", id)
             span.set_data("subkeys_count", len(data))
             cache_item = data.get(None)
+            if self.deduplicate_interfaces and isinstance(cache_item, dict):
+                node_ttl = ttl or self._get_default_ttl()
+                if node_ttl is not None:
+                    # don't replace the node in the caller's dict
+                    data = {**data, None: self._deduplicate(cache_item, node_ttl)}
             bytes_data = self._encode(data)
+            if self.compressor is not None:
+                project_id = cache_item.get("project") if isinstance(cache_item, dict) else None
+                bytes_data = self.compressor.compress(self, bytes_data, project_id=project_id)
             self._set_bytes(id, bytes_data, ttl=ttl)
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(id, cache_item)
 
+    def _decompress_bytes(self, value):
+        if not is_compressed(value):
+            return value
+        return self._decompress_bytes_multi({None: value})[None]
+
+    def _decompress_bytes_multi(self, items):
+        if not any(is_compressed(value) for value in items.values()):
+            return items
+        # Nodes written while the compressor was enabled must still be readable
+        # after it was disabled again.
+        compressor = self.compressor or DictionaryCompressor()
+        return compressor.decompress_multi(self, items)
+
+    def _get_default_ttl(self):
+        """
+        The TTL nodes are written with if ``set`` is called without one.
+        ``None`` means nodes don't expire.
+        """
+        return None
+
+    @memoize
+    def _written_shared_nodes(self):
+        # checksum -> timestamp at which the shared node written last expires
+        return {}
+
+    def _deduplicate(self, node, ttl):
+        """
+        Splits the repeating interfaces off ``node``, writes the shared nodes
+        that would expire before a node written with ``ttl``, and returns the
+        node with references to them.
+        """
+        from sentry.eventstore import compressor
+
+        node = dict(node)
+        for key in compressor.INTERFACE_KEYS:
+            if key in node:
+                # `deduplicate` mutates interfaces in place, don't change the
+                # caller's (and the node cache's) copy.
+                node[key] = copy.deepcopy(node[key])
+
+        node, shared = compressor.deduplicate(node)
+        if not shared:
+            return node
+
+        now = time.time()
+        written = self._written_shared_nodes
+        if len(written) > 10000:
+            written.clear()
+
+        shared_ttl = ttl + timedelta(seconds=self.deduplication_refresh_interval)
+        expires_at = now + ttl.total_seconds()
+
+        skipped = 0
+        for checksum, value in shared.items():
+            if written.get(checksum, 0) >= expires_at:
+                skipped += 1
+                continue
+            bytes_data = self._encode({None: value})
+            if self.compressor is not None:
+                bytes_data = self.compressor.compress(self, bytes_data)
+            self._set_bytes(shared_node_id(checksum), bytes_data, ttl=shared_ttl)
+            written[checksum] = now + shared_ttl.total_seconds()
+
+        metrics.incr(
+            "nodestore.deduplicate.shared_nodes",
+            amount=len(shared) - skipped,
+            tags={"written": "true"},
+        )
+        metrics.incr(
+            "nodestore.deduplicate.shared_nodes", amount=skipped, tags={"written": "false"}
+        )
+        return node
+
+    def _assemble_multi(self, items):
+        """
+        Reassembles deduplicated nodes, fetching all of their shared nodes
+        with a single ``_get_bytes_multi`` call. Nodes that were written
+        without deduplication are returned unchanged.
+        """
+        from sentry.eventstore import compressor
+
+        checksums = {
+            checksum
+            for value in items.values()
+            if isinstance(value, dict)
+            for checksum in compressor.get_checksums(value)
+        }
+        if not checksums:
+            return items
+
+        shared = {}
+        node_ids = {shared_node_id(checksum): checksum for checksum in checksums}
+        for node_id, value in self._decompress_bytes_multi(
+            self._get_bytes_multi(list(node_ids))
+        ).items():
+            if value is not None:
+                shared[node_ids[node_id]] = self._decode(value, subkey=None)
+
+        for id, value in items.items():
+            if not isinstance(value, dict):
+                continue
+            missing = [
+                checksum for checksum in compressor.get_checksums(value) if checksum not in shared
+            ]
+            if missing:
+                logger.warning(
+                    "nodestore.deduplicate.missing_shared_nodes",
+                    extra={"node_id": id, "checksums": missing},
+                )
+
+        return {
+            id: compressor.assemble(value, lambda _: shared) if isinstance(value, dict) else value
+            for id, value in items.items()
+        }
+
+    def uses_compression_dictionaries(self):
+        """
+        Whether nodes are compressed with per-project dictionaries.
+
+        >>> nodestore.uses_compression_dictionaries()
+        """
+        return self.compressor is not None
+
+    def compression_dictionary_needs_training(self, project_id):
+        """
+        Whether a new compression dictionary should be trained for
+        ``project_id``, because it has none yet or its dictionary is due to
+        be rotated. Always ``False`` if compression is disabled.
+
+        >>> nodestore.compression_dictionary_needs_training(1)
+        """
+        if self.compressor is None:
+            return False
+        return self.compressor.needs_training(self, project_id)
+
+    def train_compression_dictionary(self, project_id, id_list):
+        """
+        Trains a compression dictionary for ``project_id`` from the nodes in
+        ``id_list`` and uses it for all further writes of that project.
+        Returns the dictionary id, or ``None`` if compression is disabled or
+        no dictionary could be trained from the nodes.
+
+        >>> nodestore.train_compression_dictionary(1, ['key1', 'key2'])
+        """
+        if self.compressor is None:
+            return None
+
+        samples = [
+            value
+            for value in self._decompress_bytes_multi(self._get_bytes_multi(id_list)).values()
+            if value is not None
+        ]
+        return self.compressor.train(self, project_id, samples)
+
     def cleanup(self, cutoff_timestamp):
         raise NotImplementedError
 
@@ -3,6 +3,7 @@ import os
 import sentry_sdk
 
 from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.compression import DictionaryCompressor
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
 
 
@@ -18,6 +19,11 @@ class BigtableNodeStorage(NodeStorage):
         valid for reading + returning)
     :param compression: A boolean whether to enable zlib-compression, or the
         string "zstd" to use zstd.
+    :param dictionary_compression: A boolean or a dict of ``DictionaryCompressor``
+        options to compress nodes with per-project zstd dictionaries. This
+        replaces ``compression`` for new writes, existing rows keep decoding.
+    :param deduplicate_interfaces: Whether to store repeating interfaces of
+        events (debug images, SDK modules) once by content hash.
 
     >>> BigtableNodeStorage(
     ...     project='some-project',
@@ -38,6 +44,8 @@ class BigtableNodeStorage(NodeStorage):
         automatic_expiry=False,
         default_ttl=None,
         compression=False,
+        dictionary_compression=False,
+        deduplicate_interfaces=False,
         **client_options,
     ):
         if compression is True:
@@ -45,6 +53,15 @@ class BigtableNodeStorage(NodeStorage):
         elif compression is False:
             compression = None
 
+        if dictionary_compression:
+            if dictionary_compression is True:
+                dictionary_compression = {}
+            self.compressor = DictionaryCompressor(
+                **{"node_ttl": default_ttl, **dictionary_compression}
+            )
+            # Nodes are already compressed, don't compress them twice.
+            compression = None
+
         self.store = self.store_class(
             project=project,
             instance=instance,
@@ -54,8 +71,12 @@ class BigtableNodeStorage(NodeStorage):
             client_options=client_options,
         )
         self.automatic_expiry = automatic_expiry
+        self.deduplicate_interfaces = deduplicate_interfaces
         self.skip_deletes = automatic_expiry and "_SENTRY_CLEANUP" in os.environ
 
+    def _get_default_ttl(self):
+        return self.store.default_ttl
+
     def _get_bytes(self, id):
         return self.store.get(id)
 
@@ -0,0 +1,291 @@
+"""
+Dictionary compression for nodestore payloads.
+
+Event payloads of a single project are highly repetitive (SDK module lists,
+``debug_meta`` images, contexts), so compressing them with a zstd dictionary
+trained on that project's own events yields much smaller nodes than
+compressing each node in isolation.
+
+Compressed nodes are wrapped in a small versioned envelope::
+
+    MAGIC (2 bytes) | VERSION (1 byte) | project_id (u64) | dict_id (u32) | zstd frame
+
+``dict_id`` 0 means the frame was compressed without a dictionary. Nodes
+without the envelope (plain JSON written by ``NodeStorage._encode``, or
+legacy pickles) are passed through unchanged, so enabling or disabling the
+codec never breaks reading older nodes.
+
+Dictionaries are stored in the nodestore itself, next to the nodes that
+reference them, and are immutable once written. They have to outlive every
+node compressed with them, so they are written with the node TTL plus the
+time they are used for new writes.
+"""
+
+import logging
+import struct
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+import zstandard
+
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"\xffN"
+VERSION = 1
+
+# 8MB of 64KB dictionaries
+MAX_CACHED_DICTIONARIES = 128
+MAX_CACHED_PROJECTS = 10000
+
+_header = struct.Struct("<2sBQI")
+
+
+class _LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# `NodeStorage` is thread-local, so these are kept at module level to be
+# shared by the compressors of all threads.
+# (project_id, dict_id) -> ZstdCompressionDict, dictionaries are immutable
+_dictionaries = _LRUCache(MAX_CACHED_DICTIONARIES)
+# project_id -> (dict_id, trained_at, expires_at)
+_active = _LRUCache(MAX_CACHED_PROJECTS)
+
+
+def clear_caches():
+    _dictionaries.clear()
+    _active.clear()
+
+
+def is_compressed(value):
+    return value is not None and value[:2] == MAGIC
+
+
+def dictionary_node_id(project_id, dict_id):
+    return f"nodestore-dict:{project_id}:{dict_id}"
+
+
+def active_dictionary_node_id(project_id):
+    return f"nodestore-dict:{project_id}"
+
+
+class DictionaryCompressor:
+    """
+    Compresses encoded nodes with per-project zstd dictionaries.
+
+    :param level: zstd compression level.
+    :param dictionary_size: Target size of trained dictionaries in bytes.
+    :param dictionary_max_age: Dictionaries older than this are no longer used
+        for new writes, so that a new one has to be trained.
+    :param node_ttl: TTL of the nodes of the backend, ``None`` if nodes do not
+        expire.
+    :param dictionary_ttl: TTL dictionaries are written with. This has to
+        be at least ``node_ttl`` plus ``dictionary_max_age`` and defaults to
+        exactly that. ``None`` keeps dictionaries forever if nodes do not
+        expire either.
+    :param lookup_interval: How long the active dictionary of a project is
+        cached in-process before the pointer is read again.
+    """
+
+    def __init__(
+        self,
+        level=3,
+        dictionary_size=64 * 1024,
+        dictionary_max_age=timedelta(days=7),
+        node_ttl=None,
+        dictionary_ttl=None,
+        lookup_interval=300,
+    ):
+        if node_ttl is not None:
+            min_dictionary_ttl = node_ttl + dictionary_max_age
+            if dictionary_ttl is None:
+                dictionary_ttl = min_dictionary_ttl
+            elif dictionary_ttl < min_dictionary_ttl:
+                raise ValueError(
+                    "dictionary_ttl must be at least the node TTL plus dictionary_max_age"
+                )
+
+        self.level = level
+        self.dictionary_size = dictionary_size
+        self.dictionary_max_age = dictionary_max_age
+        self.dictionary_ttl = dictionary_ttl
+        self.lookup_interval = lookup_interval
+
+    def _get_dictionaries(self, storage, keys):
+        rv = {}
+        missing = []
+        for key in keys:
+            dictionary = _dictionaries.get(key)
+            if dictionary is None:
+                missing.append(key)
+            else:
+                rv[key] = dictionary
+
+        if missing:
+            node_ids = {dictionary_node_id(*key): key for key in missing}
+            for node_id, value in storage._get_bytes_multi(list(node_ids)).items():
+                if value is not None:
+                    key = node_ids[node_id]
+                    rv[key] = zstandard.ZstdCompressionDict(value)
+                    _dictionaries.set(key, rv[key])
+
+            metrics.incr("nodestore.compression.dictionary_load", amount=len(missing))
+
+        return rv
+
+    def _get_active_dictionary(self, storage, project_id):
+        now = time.time()
+        cached = _active.get(project_id)
+        if cached is None or cached[2] <= now:
+            dict_id, trained_at = 0, 0
+            pointer = storage._get_bytes(active_dictionary_node_id(project_id))
+            if pointer:
+                dict_id, trained_at = (int(x) for x in pointer.split(b":"))
+            cached = (dict_id, trained_at, now + self.lookup_interval)
+            _active.set(project_id, cached)
+
+        dict_id, trained_at, _ = cached
+        return dict_id, trained_at
+
+    def _get_active_dict_id(self, storage, project_id):
+        dict_id, trained_at = self._get_active_dictionary(storage, project_id)
+        if time.time() - trained_at < self.dictionary_max_age.total_seconds():
+            return dict_id
+        return 0
+
+    def needs_training(self, storage, project_id):
+        """
+        Whether ``project_id`` has no dictionary, or one that is older than
+        half of ``dictionary_max_age``. Retraining at that age puts the new
+        dictionary in place well before the old one stops being used.
+        """
+        dict_id, trained_at = self._get_active_dictionary(storage, project_id)
+        return not dict_id or (
+            time.time() - trained_at >= self.dictionary_max_age.total_seconds() / 2
+        )
+
+    def compress(self, storage, value, project_id=None):
+        dict_id = 0
+        dictionary = None
+        if project_id is not None:
+            dict_id = self._get_active_dict_id(storage, project_id)
+            if dict_id:
+                key = (project_id, dict_id)
+                dictionary = self._get_dictionaries(storage, [key]).get(key)
+                if dictionary is None:
+                    dict_id = 0
+
+        compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+        metrics.incr(
+            "nodestore.compression.compress", tags={"dictionary": "true" if dict_id else "false"}
+        )
+        return _header.pack(MAGIC, VERSION, project_id or 0, dict_id) + compressor.compress(value)
+
+    def decompress_multi(self, storage, values):
+        """
+        Decompresses a mapping of node ids to raw bytes. Dictionaries needed by
+        any of the values are fetched with a single batched read.
+
+        Nodes that cannot be decompressed are logged and returned as ``None``,
+        like missing nodes, instead of failing the whole batch.
+        """
+        headers = {}
+        for id, value in values.items():
+            if is_compressed(value):
+                headers[id] = _header.unpack_from(value)[1:]
+
+        if not headers:
+            return values
+
+        dictionaries = self._get_dictionaries(
+            storage,
+            {(project_id, dict_id) for version, project_id, dict_id in headers.values() if dict_id},
+        )
+
+        rv = dict(values)
+        for id, (version, project_id, dict_id) in headers.items():
+            rv[id] = None
+            extra = {"node_id": id, "project_id": project_id, "dict_id": dict_id}
+            if version != VERSION:
+                logger.error(
+                    "nodestore.compression.unsupported_version", extra={**extra, "version": version}
+                )
+                continue
+
+            dictionary = dictionaries.get((project_id, dict_id)) if dict_id else None
+            if dict_id and dictionary is None:
+                logger.error("nodestore.compression.missing_dictionary", extra=extra)
+                continue
+
+            decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+            try:
+                rv[id] = decompressor.decompress(values[id][_header.size :])
+            except zstandard.ZstdError:
+                logger.error("nodestore.compression.invalid_frame", extra=extra, exc_info=True)
+        return rv
+
+    def decompress(self, storage, value):
+        return self.decompress_multi(storage, {None: value})[None]
+
+    def train(self, storage, project_id, samples):
+        """
+        Trains a new dictionary from ``samples`` (encoded, uncompressed nodes)
+        and makes it the active dictionary of ``project_id``. Returns the
+        dictionary id, or ``None`` if zstd cannot train a dictionary from the
+        samples (e.g. too few of them).
+        """
+        try:
+            dictionary = zstandard.train_dictionary(self.dictionary_size, samples, level=self.level)
+        except zstandard.ZstdError:
+            logger.info(
+                "nodestore.compression.training_failed",
+                extra={"project_id": project_id, "samples": len(samples)},
+                exc_info=True,
+            )
+            return None
+        dict_id = dictionary.dict_id()
+
+        storage._set_bytes(
+            dictionary_node_id(project_id, dict_id),
+            dictionary.as_bytes(),
+            ttl=self.dictionary_ttl,
+        )
+        storage._set_bytes(
+            active_dictionary_node_id(project_id),
+            b"%d:%d" % (dict_id, int(time.time())),
+            ttl=self.dictionary_ttl,
+        )
+
+        _dictionaries.set((project_id, dict_id), dictionary)
+        _active.pop(project_id)
+        metrics.incr("nodestore.compression.dictionary_trained")
+        return dict_id
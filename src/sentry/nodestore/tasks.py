@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from sentry import eventstore, nodestore
+from sentry.eventstore.models import Event
+from sentry.models import Group
+from sentry.tasks.base import instrumented_task
+from sentry.tasks.collect_project_platforms import paginate_project_ids
+from sentry.utils import metrics
+
+# Number of recent events a dictionary is trained from
+SAMPLE_SIZE = 1000
+# Below this, a trained dictionary would not compress other events well
+MIN_SAMPLES = 100
+
+
+@instrumented_task(name="sentry.nodestore.tasks.schedule_compression_dictionary_training")
+def schedule_compression_dictionary_training(paginate=1000, **kwargs):
+    """
+    Trains a dictionary for every project that received events in the last
+    day and has no dictionary yet, or one that is due to be rotated.
+    """
+    if not nodestore.uses_compression_dictionaries():
+        return
+
+    since = timezone.now() - timedelta(days=1)
+    for page_of_project_ids in paginate_project_ids(paginate):
+        project_ids = (
+            Group.objects.using_replica()
+            .filter(last_seen__gte=since, project_id__in=page_of_project_ids)
+            .values_list("project_id", flat=True)
+            .distinct()
+        )
+        for project_id in project_ids:
+            if nodestore.compression_dictionary_needs_training(project_id):
+                train_compression_dictionary.delay(project_id=project_id)
+
+
+@instrumented_task(name="sentry.nodestore.tasks.train_compression_dictionary")
+def train_compression_dictionary(project_id, **kwargs):
+    now = timezone.now()
+    events = eventstore.get_unfetched_events(
+        filter=eventstore.Filter(project_ids=[project_id], start=now - timedelta(days=1), end=now),
+        limit=SAMPLE_SIZE,
+        referrer="tasks.nodestore.train_compression_dictionary",
+    )
+    if len(events) < MIN_SAMPLES:
+        metrics.incr("nodestore.compression.training_skipped", sample_rate=1.0)
+        return
+
+    nodestore.train_compression_dictionary(
+        project_id, [Event.generate_node_id(project_id, event.event_id) for event in events]
+    )
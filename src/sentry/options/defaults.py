@@ -70,6 +70,8 @@ register(
     default=1024 * 1024 * 1024,
     flags=FLAG_PRIORITIZE_DISK,
 )
+# Serve artifacts of release archives from memory-mapped local copies
+register("releasefile.mapped-archives", default=False, flags=FLAG_PRIORITIZE_DISK)
 
 
 # Mail
@@ -88,6 +90,11 @@ register("mail.reply-hostname", default="", flags=FLAG_ALLOW_EMPTY | FLAG_PRIORI
 register("mail.mailgun-api-key", default="", flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
 register("mail.timeout", default=10, type=Int, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
 
+# Digests
+# Write digest records as event references instead of pickled events. Only
+# enable this once every worker can decode them.
+register("digests.write-event-references", default=False)
+
 # TOTP (Auth app)
 register(
     "totp.disallow-new-enrollment",
@@ -186,6 +193,12 @@ register(
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK,
 )
 
+# Deletions
+# Number of independent child relations that are deleted concurrently
+register("deletions.relation-concurrency", default=4)
+# Seconds of replication lag above which deletions are throttled, 0 disables the throttle
+register("deletions.max-replication-lag", default=10)
+
 # Analytics
 register("analytics.backend", default="noop", flags=FLAG_NOSTORE)
 register("analytics.options", default={}, flags=FLAG_NOSTORE)
@@ -265,6 +278,15 @@ register("snuba.search.chunk-growth-rate", default=1.5)
 register("snuba.search.max-chunk-size", default=2000)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0)
 register("snuba.search.hits-sample-size", default=100)
+# Seconds issue search results are cached for, 0 disables the cache
+register("snuba.search.result-cache-ttl", default=30)
+# Seconds expired issue search results are served while they are recomputed
+register("snuba.search.result-cache-stale-ttl", default=60)
+# Seconds issue search hit counts are cached for, 0 disables the cache
+register("snuba.search.hits-cache-ttl", default=5 * 60)
+# Cache Snuba query results as zstd compressed JSON instead of JSON strings.
+# Only enable this once every process can decode them.
+register("snuba.query-cache.compress", default=False)
 register("snuba.track-outcomes-sample-rate", default=0.0)
 
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
@@ -596,6 +618,10 @@ register("dynamic-sampling:enabled-biases", default=True)
 # project config computation. This is temporary option to monitor the performance of this feature.
 register("dynamic-sampling:boost-latest-release", default=False)
 
+# Seconds the rate of a frequency condition of an issue alert is shared between the events
+# of a group, 0 disables the cache
+register("rules.frequency-condition-cache-ttl", default=0)
+
 # Killswitch for deriving code mappings
 register("post_process.derive-code-mappings", default=True)
 # Allows adjusting the percentage of orgs we test under the dry run mode
@@ -1,7 +1,18 @@
+import math
 import time
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import Collection, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from typing import (
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import rb
 
@@ -90,6 +101,122 @@ class GrantedQuota(NamedTuple):
     reached_quota: Optional[Quota]
 
 
+class _BloomFilter:
+    """
+    A fixed-size Bloom filter, sized for `capacity` elements at a
+    false-positive rate of `error_rate`. Elements are passed as the bit
+    positions returned by `positions`, which are the same for all filters of
+    the same size. Once `capacity` elements were added, further additions
+    are ignored so that the false-positive rate stays bounded.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.__bits = bytearray((self.size + 7) // 8)
+        self.__bits_set = 0
+
+    def positions(self, item: Tuple[str, Hash]) -> List[int]:
+        # Double hashing, see Kirsch and Mitzenmacher, "Less Hashing, Same
+        # Performance: Building a Better Bloom Filter".
+        value = hash(item) & 0xFFFFFFFFFFFFFFFF
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.num_hashes)]
+
+    def contains(self, positions: Sequence[int]) -> bool:
+        bits = self.__bits
+        for p in positions:
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, positions: Sequence[int]) -> None:
+        if self.count >= self.capacity:
+            return
+        bits = self.__bits
+        for p in positions:
+            byte, bit = p >> 3, 1 << (p & 7)
+            if not bits[byte] & bit:
+                bits[byte] |= bit
+                self.__bits_set += 1
+        self.count += 1
+
+    def estimate_false_positive_rate(self) -> float:
+        return float((self.__bits_set / self.size) ** self.num_hashes)
+
+
+class _LocalFilter:
+    """
+    Per-process record of the unit hashes this process granted recently, used
+    to admit known timeseries without asking Redis.
+
+    Like the Redis sets, hashes are recorded in one Bloom filter per granule
+    of the quota's window. A hash granted at `timestamp` has its timeseries
+    key written with a TTL of `window_seconds`, so it is known to Redis for
+    as long as its granule is within the window.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Only used to compute bit positions, all filters have the same size
+        self.__template = _BloomFilter(capacity, error_rate)
+        # (window_seconds, granularity_seconds) -> granule -> filter
+        self.__filters: Dict[Tuple[int, int], Dict[int, _BloomFilter]] = {}
+
+    def __get_filters(self, quota: Quota, timestamp: Timestamp) -> Dict[int, _BloomFilter]:
+        filters = self.__filters.setdefault((quota.window_seconds, quota.granularity_seconds), {})
+        current = timestamp // quota.granularity_seconds
+        oldest = current - quota.window_seconds // quota.granularity_seconds
+        for granule in [g for g in filters if not oldest < g <= current]:
+            del filters[granule]
+        return filters
+
+    def get_known(
+        self, request: RequestedQuota, timestamp: Timestamp
+    ) -> Tuple[List[Hash], List[Hash]]:
+        """
+        Splits the hashes of `request` into hashes that were granted within
+        the window (subject to false positives) and unknown ones.
+        """
+        filters = self.__get_filters(request.quota, timestamp)
+        # Known hashes are granted again with every batch, most of them are
+        # found in the newest filter.
+        ordered = [filters[g] for g in sorted(filters, reverse=True)]
+
+        known = []
+        unknown = []
+        for unit_hash in request.unit_hashes:
+            positions = self.__template.positions((request.prefix, unit_hash))
+            if any(f.contains(positions) for f in ordered):
+                known.append(unit_hash)
+            else:
+                unknown.append(unit_hash)
+        return known, unknown
+
+    def add(self, request: RequestedQuota, timestamp: Timestamp, hashes: Collection[Hash]) -> None:
+        filters = self.__get_filters(request.quota, timestamp)
+        granule = timestamp // request.quota.granularity_seconds
+        bloom_filter = filters.get(granule)
+        if bloom_filter is None:
+            bloom_filter = filters[granule] = _BloomFilter(self.capacity, self.error_rate)
+        for unit_hash in hashes:
+            bloom_filter.add(self.__template.positions((request.prefix, unit_hash)))
+
+    def estimate_false_positive_rate(self) -> float:
+        # The probability of a hit in any of the filters of a window
+        rate = 0.0
+        for filters in self.__filters.values():
+            miss = 1.0
+            for bloom_filter in filters.values():
+                miss *= 1.0 - bloom_filter.estimate_false_positive_rate()
+            rate = max(rate, 1.0 - miss)
+        return rate
+
+
 class CardinalityLimiter(Service):
     """
     A kind of limiter that limits set cardinality instead of a rate/count.
@@ -218,6 +345,8 @@ class RedisCardinalityLimiter(CardinalityLimiter):
         num_shards: int = 3,
         num_physical_shards: int = 3,
         metric_tags: Optional[Mapping[str, str]] = None,
+        local_filter_capacity: int = 0,
+        local_filter_error_rate: float = 0.001,
     ) -> None:
         """
         :param cluster: Name of the redis cluster to use, to be configured with
@@ -230,6 +359,13 @@ class RedisCardinalityLimiter(CardinalityLimiter):
             Redis. The ratio `cluster_num_physical_shards / cluster_num_shards`
             is a sampling rate, the lower it is, the less precise accounting
             will be.
+        :param local_filter_capacity: The number of hashes per granule to
+            remember in-process. Hashes this process granted within the window
+            are admitted without being looked up in Redis. 0 disables the
+            local filter.
+        :param local_filter_error_rate: The false-positive rate the local
+            filter is sized for. A false positive admits a new hash without
+            counting it against the quota.
         """
         is_redis_cluster, client, _ = redis.get_dynamic_cluster_from_options(
             "", {"cluster": cluster}
@@ -243,6 +379,11 @@ class RedisCardinalityLimiter(CardinalityLimiter):
         self.num_shards = num_shards
         self.num_physical_shards = num_physical_shards
         self.metric_tags = metric_tags or {}
+        self.local_filter = (
+            _LocalFilter(local_filter_capacity, local_filter_error_rate)
+            if local_filter_capacity > 0
+            else None
+        )
         super().__init__()
 
     @staticmethod
@@ -281,13 +422,39 @@ class RedisCardinalityLimiter(CardinalityLimiter):
 
         unit_keys_to_get: List[str] = []
         set_keys_to_count: List[str] = []
+        # Hashes admitted by the local filter, per request
+        known_hashes: List[Collection[Hash]] = []
 
         for request in requests:
-            for hash in request.unit_hashes:
+            unknown: Collection[Hash] = request.unit_hashes
+            if self.local_filter is not None:
+                known, unknown = self.local_filter.get_known(request, timestamp)
+                known_hashes.append(set(known))
+                metrics.incr(
+                    "ratelimits.cardinality.local_filter",
+                    amount=len(known),
+                    tags={**self.metric_tags, "result": "hit"},
+                )
+                metrics.incr(
+                    "ratelimits.cardinality.local_filter",
+                    amount=len(unknown),
+                    tags={**self.metric_tags, "result": "miss"},
+                )
+            else:
+                known_hashes.append(())
+
+            for hash in unknown:
                 unit_keys_to_get.append(self._get_timeseries_key(request, hash))
 
             set_keys_to_count.extend(self._get_read_sets_keys(request, timestamp))
 
+        if self.local_filter is not None:
+            metrics.gauge(
+                "ratelimits.cardinality.local_filter.false_positive_rate",
+                self.local_filter.estimate_false_positive_rate(),
+                tags=self.metric_tags,
+            )
+
         if not unit_keys_to_get and not set_keys_to_count:
             # If there are no keys to fetch (i.e. there are no quotas to
             # enforce), we can save the redis call entirely and just grant all
@@ -305,7 +472,7 @@ class RedisCardinalityLimiter(CardinalityLimiter):
 
         grants = []
         cardinality_sample_factor = self._get_set_cardinality_sample_factor()
-        for request in requests:
+        for request, known in zip(requests, known_hashes):
             granted_hashes = []
 
             set_count = sum(set_counts[k] for k in self._get_read_sets_keys(request, timestamp))
@@ -325,10 +492,11 @@ class RedisCardinalityLimiter(CardinalityLimiter):
             reached_quota = None
 
             # for each hash in the request, check if:
-            # 1. the hash is in `unit_keys`. If so, it has already been seen in
-            #    this timewindow, and ingesting additional copies of it comes
-            #    at no cost (= ingesting multiple metric buckets of the same
-            #    timeseries only counts once against quota)
+            # 1. the hash is in the local filter or in `unit_keys`. If so, it
+            #    has already been seen in this timewindow, and ingesting
+            #    additional copies of it comes at no cost (= ingesting multiple
+            #    metric buckets of the same timeseries only counts once
+            #    against quota)
             #
             # 2. we still have budget/"remaining_limit". In that case,
             #    accept/admit the hash as well and reduce the remaining quota.
@@ -337,7 +505,7 @@ class RedisCardinalityLimiter(CardinalityLimiter):
             #    `reached_quotas` for reporting purposes, but don't add the
             #    hash to `granted_hashes` (which is our return value)
             for hash in request.unit_hashes:
-                if unit_keys[self._get_timeseries_key(request, hash)]:
+                if hash in known or unit_keys[self._get_timeseries_key(request, hash)]:
                     granted_hashes.append(hash)
                 elif remaining_limit_running > 0:
                     granted_hashes.append(hash)
@@ -382,6 +550,10 @@ class RedisCardinalityLimiter(CardinalityLimiter):
 
         self.backend.run_use_quotas(unit_keys_to_set, set_keys_to_add, set_keys_ttl)
 
+        if self.local_filter is not None:
+            for grant in grants:
+                self.local_filter.add(grant.request, timestamp, grant.granted_unit_hashes)
+
 
 class RedisBackend(ABC):
     @abstractmethod
@@ -9,6 +9,7 @@ from .outbox import *  # noqa: F401,F403
 from .releases import *  # noqa: F401,F403
 from .reprocessing import *  # noqa: F401,F403
 from .rules import *  # noqa: F401,F403
+from .search import *  # noqa: F401,F403
 from .sentry_apps import *  # noqa: F401,F403
 from .stats import *  # noqa: F401,F403
 from .superuser import *  # noqa: F401,F403
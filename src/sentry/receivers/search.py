@@ -0,0 +1,116 @@
+from django.db.models.signals import post_delete, post_save
+
+from sentry.models import (
+    Group,
+    GroupAssignee,
+    GroupBookmark,
+    GroupEnvironment,
+    GroupHistory,
+    GroupInbox,
+    GroupOwner,
+    GroupSubscription,
+)
+from sentry.signals import (
+    buffer_incr_complete,
+    issue_assigned,
+    issue_deleted,
+    issue_ignored,
+    issue_mark_reviewed,
+    issue_resolved,
+    issue_unassigned,
+    issue_unignored,
+    issue_unresolved,
+)
+
+
+def invalidate_search_results(project=None, group=None, **kwargs):
+    # imported lazily, `sentry.search.snuba` loads the whole search backend
+    from sentry.search.snuba.cache import invalidate_project_search_results
+
+    invalidate_project_search_results([project.id if project is not None else group.project_id])
+
+
+def invalidate_search_results_for_instance(instance, **kwargs):
+    from sentry.search.snuba.cache import invalidate_project_search_results
+
+    project_id = getattr(instance, "project_id", None)
+    if project_id is None:
+        try:
+            project_id = Group.objects.get_from_cache(id=instance.group_id).project_id
+        except Group.DoesNotExist:
+            return
+    invalidate_project_search_results([project_id])
+
+
+def invalidate_search_results_for_group(instance, created=False, **kwargs):
+    # Other writes to groups are status changes that send the issue signals,
+    # or counter updates of buffer flushes that are handled below.
+    if created:
+        invalidate_search_results_for_instance(instance)
+
+
+def invalidate_event_search_results(filters, **kwargs):
+    from sentry.search.snuba.cache import invalidate_project_event_search_results
+
+    try:
+        group = Group.objects.get_from_cache(id=filters.get("id", filters.get("pk")))
+    except Group.DoesNotExist:
+        return
+    invalidate_project_event_search_results([group.project_id])
+
+
+# Assignments and status changes are also tracked through the issue signals,
+# as they are often written with queryset updates that send no `post_save`.
+for _signal in (
+    issue_assigned,
+    issue_deleted,
+    issue_ignored,
+    issue_mark_reviewed,
+    issue_resolved,
+    issue_unassigned,
+    issue_unignored,
+    issue_unresolved,
+):
+    _signal.connect(
+        invalidate_search_results,
+        weak=False,
+        dispatch_uid="sentry.search.invalidate_search_results",
+    )
+
+# new events of existing groups update their counters through the buffer
+buffer_incr_complete.connect(
+    invalidate_event_search_results,
+    sender=Group,
+    weak=False,
+    dispatch_uid="sentry.search.invalidate_event_search_results",
+)
+post_save.connect(
+    invalidate_search_results_for_group,
+    sender=Group,
+    dispatch_uid="sentry.search.invalidate_search_results_for_group",
+    weak=False,
+)
+post_delete.connect(
+    invalidate_search_results_for_instance,
+    sender=Group,
+    dispatch_uid="sentry.search.invalidate_search_results_for_instance",
+    weak=False,
+)
+
+for _signal in (post_save, post_delete):
+    # the relations that issue searches filter on
+    for _model in (
+        GroupAssignee,
+        GroupBookmark,
+        GroupEnvironment,
+        GroupHistory,
+        GroupInbox,
+        GroupOwner,
+        GroupSubscription,
+    ):
+        _signal.connect(
+            invalidate_search_results_for_instance,
+            sender=_model,
+            dispatch_uid="sentry.search.invalidate_search_results_for_instance",
+            weak=False,
+        )
@@ -80,9 +80,10 @@ instead of group deletion is:
 import hashlib
 import logging
 import uuid
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Sequence, Tuple, Union
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
 
 import redis
 import sentry_sdk
@@ -95,7 +96,7 @@ from sentry.eventstore.models import Event
 from sentry.eventstore.processing import event_processing_store
 from sentry.utils import json, metrics, snuba
 from sentry.utils.cache import cache_key_for_event
-from sentry.utils.dates import to_datetime, to_timestamp
+from sentry.utils.dates import parse_timestamp, to_datetime, to_timestamp
 from sentry.utils.redis import redis_clusters
 from sentry.utils.safe import get_path, set_path
 
@@ -177,6 +178,8 @@ class ReprocessableEvent:
     event: Event
     data: Dict[str, Any]
     attachments: List[models.EventAttachment]
+    # files of the attachments by id, loaded when reprocessing if not given
+    files: Optional[Dict[int, models.File]] = None
 
 
 def pull_event_data(project_id, event_id) -> ReprocessableEvent:
@@ -213,12 +216,95 @@ def pull_event_data(project_id, event_id) -> ReprocessableEvent:
     return ReprocessableEvent(event=event, data=data, attachments=attachments)
 
 
-def reprocess_event(project_id, event_id, start_time):
+def pull_events_data(
+    project_id, events: Sequence[Event]
+) -> Dict[str, Union[ReprocessableEvent, CannotReprocess]]:
+    """
+    Batched version of `pull_event_data` for events of one page of
+    `reprocess_group`, which were already fetched from eventstore.
+
+    The unprocessed payloads, attachments and their files of all events are
+    loaded with one request each (plus one for payloads of events that were
+    backed up before they were stored as part of the event node). Returns the
+    reprocessable event, or the reason it cannot be reprocessed, by event ID.
+    """
+    from sentry.lang.native.processing import get_required_attachment_types
+
+    with sentry_sdk.start_span(op="reprocess_events.nodestore.get_multi"):
+        node_ids = {
+            event.event_id: Event.generate_node_id(project_id, event.event_id) for event in events
+        }
+        node_data = nodestore.get_multi(list(node_ids.values()), subkey="unprocessed")
+        data_by_event_id = {
+            event_id: node_data.get(node_id) for event_id, node_id in node_ids.items()
+        }
+
+        fallback_node_ids = {
+            event_id: _generate_unprocessed_event_node_id(project_id=project_id, event_id=event_id)
+            for event_id, data in data_by_event_id.items()
+            if data is None
+        }
+        if fallback_node_ids:
+            fallback_data = nodestore.get_multi(list(fallback_node_ids.values()))
+            for event_id, node_id in fallback_node_ids.items():
+                data_by_event_id[event_id] = fallback_data.get(node_id)
+
+    required_attachment_types = {
+        event_id: get_required_attachment_types(data)
+        for event_id, data in data_by_event_id.items()
+        if data is not None
+    }
+    attachments_by_event_id = defaultdict(list)
+    all_required_types = set().union(*required_attachment_types.values())
+    if all_required_types:
+        for attachment in models.EventAttachment.objects.filter(
+            project_id=project_id,
+            event_id__in=list(required_attachment_types),
+            type__in=list(all_required_types),
+        ):
+            if attachment.type in required_attachment_types[attachment.event_id]:
+                attachments_by_event_id[attachment.event_id].append(attachment)
+
+    files = {
+        f.id: f
+        for f in models.File.objects.filter(
+            id__in=[
+                attachment.file_id
+                for attachments in attachments_by_event_id.values()
+                for attachment in attachments
+            ]
+        )
+    }
+
+    result: Dict[str, Union[ReprocessableEvent, CannotReprocess]] = {}
+    for event in events:
+        data = data_by_event_id[event.event_id]
+        if data is None:
+            result[event.event_id] = CannotReprocess("unprocessed_event.not_found")
+            continue
+
+        attachments = attachments_by_event_id[event.event_id]
+        if required_attachment_types[event.event_id] - {ea.type for ea in attachments}:
+            result[event.event_id] = CannotReprocess("attachment.not_found")
+            continue
+
+        result[event.event_id] = ReprocessableEvent(
+            event=event, data=data, attachments=attachments, files=files
+        )
+
+    metrics.timing("events.reprocessing.pull_events_data.batch_size", len(events))
+    return result
+
+
+def reprocess_event(project_id, event_id, start_time, reprocessable_event=None):
 
     from sentry.ingest.ingest_consumer import CACHE_TIMEOUT
     from sentry.tasks.store import preprocess_event_from_reprocessing
 
-    reprocessable_event = pull_event_data(project_id, event_id)
+    if reprocessable_event is None:
+        reprocessable_event = pull_event_data(project_id, event_id)
+    elif isinstance(reprocessable_event, CannotReprocess):
+        raise reprocessable_event
 
     data = reprocessable_event.data
     event = reprocessable_event.event
@@ -237,7 +323,11 @@ def reprocess_event(project_id, event_id, start_time):
     # (we simply update group_id on the EventAttachment models in post_process)
     attachment_objects = []
 
-    files = {f.id: f for f in models.File.objects.filter(id__in=[ea.file_id for ea in attachments])}
+    files = reprocessable_event.files
+    if files is None:
+        files = {
+            f.id: f for f in models.File.objects.filter(id__in=[ea.file_id for ea in attachments])
+        }
 
     for attachment_id, attachment in enumerate(attachments):
         with sentry_sdk.start_span(op="reprocess_event._copy_attachment_into_cache") as span:
@@ -697,6 +787,15 @@ def get_progress(group_id):
         return 0, None
 
     info = json.loads(info)
+
+    # Throughput over all events since reprocessing started, including
+    # remaining events that were deleted or kept instead.
+    date_created = parse_timestamp(info.get("dateCreated"))
+    if date_created is not None:
+        elapsed = (datetime.now(tz=date_created.tzinfo) - date_created).total_seconds()
+        processed = (info.get("syncCount") or 0) - int(pending)
+        info["eventsPerSecond"] = round(processed / elapsed, 2) if elapsed > 0 else 0.0
+
     # Our internal sync counters are counting over *all* events, but the
     # progressbar in the frontend goes until max_events. Advance progressbar
     # proportionally.
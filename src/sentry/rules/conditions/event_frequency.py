@@ -5,13 +5,13 @@ import contextlib
 import logging
 import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, Mapping, Tuple
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
 
 from django import forms
 from django.core.cache import cache
 from django.utils import timezone
 
-from sentry import release_health, tsdb
+from sentry import options, release_health, tsdb
 from sentry.eventstore.models import GroupEvent
 from sentry.issues.constants import get_issue_tsdb_group_model, get_issue_tsdb_user_group_model
 from sentry.receivers.rules import DEFAULT_RULE_LABEL
@@ -20,9 +20,11 @@ from sentry.rules.conditions.base import EventCondition
 from sentry.types.condition_activity import (
     FREQUENCY_CONDITION_BUCKET_SIZE,
     ConditionActivity,
+    FrequencyBuckets,
     round_to_five_minute,
 )
 from sentry.utils import metrics
+from sentry.utils.hashlib import hash_values
 from sentry.utils.snuba import options_override
 
 standard_intervals = {
@@ -92,6 +94,8 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
     intervals = standard_intervals
     form_cls = EventFrequencyForm
     label: str
+    # Whether the rate only grows with new events, see `get_rate`
+    cache_rates = False
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.tsdb = kwargs.pop("tsdb", tsdb)
@@ -126,7 +130,7 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
             return False
 
         # TODO(mgaeta): Bug: Rule is optional.
-        current_value = self.get_rate(event, interval, self.rule.environment_id)  # type: ignore
+        current_value = self.get_rate(event, interval, self.rule.environment_id, value)  # type: ignore
         logging.info(f"event_frequency_rule current: {current_value}, threshold: {value}")
         return current_value > value
 
@@ -159,6 +163,39 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
 
         return result > value
 
+    def passes_activity_frequency_multi(
+        self, positions: Sequence[int], buckets: FrequencyBuckets
+    ) -> List[bool]:
+        """
+        Same as `passes_activity_frequency`, evaluated for activity at each of the bucket
+        positions in a single pass over the cumulative bucket counts.
+        """
+        interval, value = self._get_options()
+        if not (interval and value is not None):
+            return [False] * len(positions)
+        interval_delta = self.intervals[interval][1]
+        comparison_type = self.get_option("comparisonType", COMPARISON_TYPE_COUNT)
+
+        if interval_delta < FREQUENCY_CONDITION_BUCKET_SIZE:
+            if comparison_type != COMPARISON_TYPE_PERCENT:
+                value *= int(FREQUENCY_CONDITION_BUCKET_SIZE / interval_delta)
+            interval_delta = FREQUENCY_CONDITION_BUCKET_SIZE
+
+        size = interval_delta // FREQUENCY_CONDITION_BUCKET_SIZE
+        results = buckets.window_counts(positions, size)
+
+        if comparison_type == COMPARISON_TYPE_PERCENT:
+            comparison_interval = comparison_intervals[self.get_option("comparisonInterval")][1]
+            comparison_results = buckets.window_counts(
+                positions, size, comparison_interval // FREQUENCY_CONDITION_BUCKET_SIZE
+            )
+            results = [
+                percent_increase(result, comparison_result)
+                for result, comparison_result in zip(results, comparison_results)
+            ]
+
+        return [result > value for result in results]
+
     def get_preview_aggregate(self) -> Tuple[str, str]:
         raise NotImplementedError
 
@@ -179,7 +216,49 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
         """ """
         raise NotImplementedError  # subclass must implement
 
-    def get_rate(self, event: GroupEvent, interval: str, environment_id: str) -> int:
+    def get_rate(
+        self,
+        event: GroupEvent,
+        interval: str,
+        environment_id: str,
+        threshold: float | None = None,
+    ) -> int:
+        """
+        Returns the rate of the group of the event over the interval.
+
+        During floods a group gets many events per second, and every one of
+        them evaluates the same frequency conditions. If enabled, rates are
+        therefore cached per group and condition for a few seconds, and shared
+        by the events of the group, as well as by rules that only differ in
+        their threshold.
+
+        A cached rate lags behind the events of the group that arrived since.
+        It is only served for counts, which those events can only increase,
+        and only when it already exceeds ``threshold``. A burst crossing the
+        threshold within the TTL is therefore never missed.
+        """
+        ttl = options.get("rules.frequency-condition-cache-ttl")
+        if (
+            not ttl
+            or not self.cache_rates
+            or self.get_option("comparisonType", COMPARISON_TYPE_COUNT) != COMPARISON_TYPE_COUNT
+        ):
+            return self.get_rate_uncached(event, interval, environment_id)
+
+        cache_key = "r.c.rate:{}".format(
+            hash_values([self.id, event.group_id, interval, environment_id])
+        )
+        rate: int | None = cache.get(cache_key)
+        if rate is not None and threshold is not None and rate > threshold:
+            metrics.incr("rules.conditions.rate_cache", tags={"result": "hit"})
+            return rate
+
+        metrics.incr("rules.conditions.rate_cache", tags={"result": "miss"})
+        rate = self.get_rate_uncached(event, interval, environment_id)
+        cache.set(cache_key, rate, ttl)
+        return rate
+
+    def get_rate_uncached(self, event: GroupEvent, interval: str, environment_id: str) -> int:
         _, duration = self.intervals[interval]
         end = timezone.now()
         # For conditions with interval >= 1 hour we don't need to worry about read your writes
@@ -223,6 +302,7 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
 class EventFrequencyCondition(BaseEventFrequencyCondition):
     id = "sentry.rules.conditions.event_frequency.EventFrequencyCondition"
     label = "The issue is seen more than {value} times in {interval}"
+    cache_rates = True
 
     def query_hook(
         self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
@@ -245,6 +325,7 @@ class EventFrequencyCondition(BaseEventFrequencyCondition):
 class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
     id = "sentry.rules.conditions.event_frequency.EventUniqueUserFrequencyCondition"
     label = "The issue is seen by more than {value} users in {interval}"
+    cache_rates = True
 
     def query_hook(
         self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
@@ -385,6 +466,11 @@ class EventFrequencyPercentCondition(BaseEventFrequencyCondition):
     ) -> bool:
         raise NotImplementedError
 
+    def passes_activity_frequency_multi(
+        self, positions: Sequence[int], buckets: FrequencyBuckets
+    ) -> List[bool]:
+        raise NotImplementedError
+
 
 def bucket_count(start: datetime, end: datetime, buckets: Dict[datetime, int]) -> int:
     rounded_end = round_to_five_minute(end)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from collections import defaultdict
 from datetime import datetime, timedelta
+from itertools import accumulate
 from typing import Any, Callable, Dict, List, Sequence, Tuple
 
 from django.utils import timezone
@@ -20,10 +21,11 @@ from sentry.types.condition_activity import (
     FREQUENCY_CONDITION_BUCKET_SIZE,
     ConditionActivity,
     ConditionActivityType,
+    FrequencyBuckets,
     round_to_five_minute,
 )
 from sentry.types.issues import GROUP_TYPE_TO_CATEGORY, GroupType
-from sentry.utils.snuba import SnubaQueryParams, bulk_raw_query, parse_snuba_datetime, raw_query
+from sentry.utils.snuba import SnubaQueryParams, bulk_raw_query, parse_snuba_datetime
 
 Conditions = Sequence[Dict[str, Any]]
 ConditionFunc = Callable[[Sequence[bool]], bool]
@@ -400,54 +402,55 @@ def apply_frequency_conditions(
             raise PreviewException
         condition_types[condition_data["id"]].append(condition_cls(project, data=condition_data))
 
+    # reuse frequency buckets for conditions of the same type, fetched for all groups at once
+    bucket_map = {}
+    for condition_id, conditions in condition_types.items():
+        try:
+            aggregate = conditions[0].get_preview_aggregate()
+        except NotImplementedError:
+            raise PreviewException
+        bucket_map[condition_id] = get_frequency_buckets(
+            project, start, end, list(group_activity.keys()), dataset_map, aggregate
+        )
+
     filtered_activity = defaultdict(list)
     if condition_match == "all":
         for group, activities in group_activity.items():
             init_activities_from_freq_cond = False
             passes = [True] * len(activities)
-            for conditions in condition_types.values():
-                # reuse frequency buckets for conditions of the same type
+            for condition_id, conditions in condition_types.items():
+                buckets = bucket_map[condition_id][group]
+                skip_first = False
                 try:
-                    buckets = get_frequency_buckets(
-                        project,
-                        start,
-                        end,
-                        group,
-                        dataset_map[group],
-                        conditions[0].get_preview_aggregate(),
-                    )
+                    if not has_issue_state_condition and not init_activities_from_freq_cond:
+                        # If there are no issue state change conditions, then we won't have any initial activities
+                        # to base our frequency condition queries off of. Instead, we take the first frequency condition and
+                        # create the initial activities from that
+                        init_activities_from_freq_cond = skip_first = True
+                        bucket_passes = conditions[0].passes_activity_frequency_multi(
+                            range(len(buckets)), buckets
+                        )
+                        activities.extend(
+                            ConditionActivity(
+                                group,
+                                ConditionActivityType.FREQUENCY_CONDITION,
+                                buckets.time(position),
+                            )
+                            for position, passed in enumerate(bucket_passes)
+                            if passed
+                        )
+
+                        # recreate passes array
+                        passes = [True] * len(activities)
+
+                    positions = [buckets.position(activity.timestamp) for activity in activities]
+                    for condition in conditions[1:] if skip_first else conditions:
+                        condition_passes = condition.passes_activity_frequency_multi(
+                            positions, buckets
+                        )
+                        passes = [a and b for a, b in zip(passes, condition_passes)]
                 except NotImplementedError:
                     raise PreviewException
-                skip_first = False
-                if not has_issue_state_condition and not init_activities_from_freq_cond:
-                    # If there are no issue state change conditions, then we won't have any initial activities
-                    # to base our frequency condition queries off of. Instead, we take the first frequency condition and
-                    # create the initial activities from that
-                    init_activities_from_freq_cond = skip_first = True
-                    for bucket_time in buckets.keys():
-                        activity = ConditionActivity(
-                            group,
-                            ConditionActivityType.FREQUENCY_CONDITION,
-                            bucket_time,
-                        )
-                        try:
-                            if conditions[0].passes_activity_frequency(activity, buckets):
-                                activities.append(activity)
-                        except NotImplementedError:
-                            raise PreviewException
-
-                    # recreate passes array
-                    passes = [True] * len(activities)
-
-                for condition in conditions[1:] if skip_first else conditions:
-                    for i, activity in enumerate(activities):
-                        try:
-                            if passes[i] and not condition.passes_activity_frequency(
-                                activity, buckets
-                            ):
-                                passes[i] = False
-                        except NotImplementedError:
-                            raise PreviewException
 
             filtered_activity[group] = [activities[i] for i in range(len(activities)) if passes[i]]
 
@@ -456,30 +459,21 @@ def apply_frequency_conditions(
         # Find buckets that pass at least one condition, and create condition activity from it
         for group, activities in group_activity.items():
             pass_buckets = set()
-            for conditions in condition_types.values():
-                try:
-                    buckets = get_frequency_buckets(
-                        project,
-                        start,
-                        end,
-                        group,
-                        dataset_map[group],
-                        conditions[0].get_preview_aggregate(),
-                    )
-                except NotImplementedError:
-                    raise PreviewException
+            for condition_id, conditions in condition_types.items():
+                buckets = bucket_map[condition_id][group]
+                positions = range(len(buckets))
                 for condition in conditions:
-                    for bucket_time in buckets.keys():
-                        activity = ConditionActivity(
-                            group,
-                            ConditionActivityType.FREQUENCY_CONDITION,
-                            bucket_time,
+                    try:
+                        bucket_passes = condition.passes_activity_frequency_multi(
+                            positions, buckets
                         )
-                        try:
-                            if condition.passes_activity_frequency(activity, buckets):
-                                pass_buckets.add(activity.timestamp)
-                        except NotImplementedError:
-                            raise PreviewException
+                    except NotImplementedError:
+                        raise PreviewException
+                    pass_buckets.update(
+                        buckets.time(position)
+                        for position, passed in enumerate(bucket_passes)
+                        if passed
+                    )
 
             for bucket in pass_buckets:
                 activities.append(
@@ -496,53 +490,66 @@ def get_frequency_buckets(
     project: Project,
     start: datetime,
     end: datetime,
-    group_id: int,
-    dataset: Dataset,
+    group_ids: Sequence[int],
+    dataset_map: Dict[int, Dataset],
     aggregate: Tuple[str, str],
-) -> Dict[datetime, int]:
+) -> Dict[int, FrequencyBuckets]:
     """
-    Puts the events of a group into buckets, and returns the bucket counts.
+    Puts the events of each group into buckets, and returns the cumulative bucket counts.
+    The counts of all groups are queried in a single bulk request.
     """
-    if dataset not in UPDATE_KWARGS_FOR_GROUP:
-        return {}
+    rounded_start = round_to_five_minute(start)
+    bucket_total = (
+        round_to_five_minute(end) - rounded_start
+    ) // FREQUENCY_CONDITION_BUCKET_SIZE + 1
 
-    kwargs = UPDATE_KWARGS_FOR_GROUP[dataset](
-        group_id,
-        {
-            "dataset": dataset,
-            "start": start,
-            "end": end,
-            "filter_keys": {"project_id": [project.id]},
-            "aggregations": [
-                ("toStartOfFiveMinute", "timestamp", "roundedTime"),
-                (*aggregate, "bucketCount"),
-            ],
-            "orderby": ["-roundedTime"],
-            "groupby": ["roundedTime"],
-            "selected_columns": ["roundedTime", "bucketCount"],
-            "limit": PREVIEW_TIME_RANGE // FREQUENCY_CONDITION_BUCKET_SIZE + 1,  # at most ~4k
-        },
+    query_groups = []
+    query_params = []
+    for group_id in group_ids:
+        dataset = dataset_map[group_id]
+        if dataset not in UPDATE_KWARGS_FOR_GROUP:
+            continue
+
+        kwargs = UPDATE_KWARGS_FOR_GROUP[dataset](
+            group_id,
+            {
+                "dataset": dataset,
+                "start": start,
+                "end": end,
+                "filter_keys": {"project_id": [project.id]},
+                "aggregations": [
+                    ("toStartOfFiveMinute", "timestamp", "roundedTime"),
+                    (*aggregate, "bucketCount"),
+                ],
+                "orderby": ["-roundedTime"],
+                "groupby": ["roundedTime"],
+                "selected_columns": ["roundedTime", "bucketCount"],
+                "limit": PREVIEW_TIME_RANGE // FREQUENCY_CONDITION_BUCKET_SIZE + 1,  # at most ~4k
+            },
+        )
+        query_groups.append(group_id)
+        query_params.append(SnubaQueryParams(**kwargs))
+
+    results = (
+        bulk_raw_query(query_params, use_cache=True, referrer="preview.get_frequency_buckets")
+        if query_params
+        else []
     )
-    bucket_counts = raw_query(
-        **kwargs, use_cache=True, referrer="preview.get_frequency_buckets"
-    ).get("data", [])
-
-    for bucket in bucket_counts:
-        bucket["roundedTime"] = parse_snuba_datetime(bucket["roundedTime"])
-
-    rounded_time = round_to_five_minute(start)
-    rounded_end = round_to_five_minute(end)
-    cumulative_sum = 0
-    buckets = {}
-    # the query result only contains buckets that have a positive count
-    # here we fill in the empty buckets and accumulate the sum
-    while rounded_time <= rounded_end:
-        if bucket_counts and bucket_counts[-1]["roundedTime"] == rounded_time:
-            cumulative_sum += bucket_counts.pop()["bucketCount"]
-        buckets[rounded_time] = cumulative_sum
-        rounded_time += FREQUENCY_CONDITION_BUCKET_SIZE
-
-    return buckets
+
+    group_buckets = {group_id: FrequencyBuckets(rounded_start, []) for group_id in group_ids}
+    for group_id, result in zip(query_groups, results):
+        # the query result only contains buckets that have a positive count
+        # here we fill in the empty buckets and accumulate the sum
+        counts = [0] * bucket_total
+        for bucket in result.get("data", []):
+            position = (
+                parse_snuba_datetime(bucket["roundedTime"]) - rounded_start
+            ) // FREQUENCY_CONDITION_BUCKET_SIZE
+            if 0 <= position < bucket_total:
+                counts[position] += bucket["bucketCount"]
+        group_buckets[group_id] = FrequencyBuckets(rounded_start, list(accumulate(counts)))
+
+    return group_buckets
 
 
 class PreviewException(Exception):
@@ -618,6 +618,11 @@ def region_to_control_consumer(region_name, **kafka_options):
 @click.option("max_msg_batch_time", "--max-msg-batch-time-ms", type=int, default=10000)
 @click.option("max_parallel_batch_size", "--max-parallel-batch-size", type=int, default=50)
 @click.option("max_parallel_batch_time", "--max-parallel-batch-time-ms", type=int, default=10000)
+@click.option(
+    "--columnar-batches/--no-columnar-batches",
+    default=True,
+    help="Pass message batches to the worker processes in a columnar format instead of pickled lists of messages.",
+)
 def metrics_parallel_consumer(**options):
     from sentry.sentry_metrics.configuration import (
         IndexerStorage,
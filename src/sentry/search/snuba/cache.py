@@ -0,0 +1,165 @@
+"""
+Caching of issue search results.
+
+The issue stream is commonly left open and refreshed with identical
+parameters, which runs the same candidate, Snuba and hit count queries over
+and over. Results of `PostgresSnubaQueryExecutor.query` are cached for a
+short time, and hit counts (the most expensive part) for longer.
+
+Invalidation is coarse: every project has a version that is part of all
+cache keys of searches over that project. It is bumped whenever one of its
+groups is created, deleted or changes status, or a relation that searches
+filter on (such as assignees, bookmarks or environments) is written (see
+`sentry.receivers.search`), which makes every cached search of the project
+unreachable at once.
+
+Searches that sort or filter on the values that new events change (such as
+the last seen date or times seen of groups) also depend on a second version
+of the project, which is bumped whenever the counters of one of its groups
+are updated. Other searches don't see new events of existing groups until
+their entry expires.
+
+Result entries are served stale for a while after they expire. The first
+request to see a stale entry recomputes it, while concurrent requests keep
+getting the stale value in the meantime.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from django.db.models import Model
+
+from sentry.utils import metrics
+from sentry.utils.cache import cache
+from sentry.utils.hashlib import hash_values
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# project versions must outlive every entry that was cached under them,
+# otherwise an expired version could make an old entry reachable again
+VERSION_TTL = 24 * 60 * 60
+
+
+class UncacheableValue(Exception):
+    pass
+
+
+def _version_key(project_id: int) -> str:
+    return f"search:version:{project_id}"
+
+
+def _events_version_key(project_id: int) -> str:
+    return f"search:version:events:{project_id}"
+
+
+def get_project_versions(project_ids: Sequence[int], events: bool = False) -> List[str]:
+    keys = [_version_key(project_id) for project_id in project_ids]
+    if events:
+        keys += [_events_version_key(project_id) for project_id in project_ids]
+    versions = cache.get_many(keys)
+    return [str(versions.get(key, 0)) for key in keys]
+
+
+def invalidate_project_search_results(project_ids: Iterable[int]) -> None:
+    version = time.time_ns()
+    cache.set_many(
+        {_version_key(project_id): version for project_id in set(project_ids)}, VERSION_TTL
+    )
+    metrics.incr("snuba.search.result_cache.invalidate")
+
+
+def invalidate_project_event_search_results(project_ids: Iterable[int]) -> None:
+    """
+    Invalidates the searches of the projects that depend on the events of
+    their groups, see `get_cache_key`.
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {_events_version_key(project_id): version for project_id in set(project_ids)},
+        VERSION_TTL,
+    )
+    metrics.incr("snuba.search.result_cache.invalidate_events")
+
+
+def _normalize(value: Any, granularity: int) -> Any:
+    if value is None or isinstance(value, (bool, int, str, bytes)):
+        return value
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, datetime):
+        # rolling time ranges (`statsPeriod`, relative date filters) move with
+        # every request, floor them so they map to the same key for a while
+        timestamp = int(value.timestamp())
+        return timestamp - timestamp % granularity
+    if isinstance(value, Model):
+        # also matches lazily loaded users (`me`), which proxy `_meta`
+        return f"{value._meta.label}:{value.pk}"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(item, granularity) for item in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort(key=repr)
+        return items
+    if isinstance(value, dict):
+        return {str(k): _normalize(v, granularity) for k, v in value.items()}
+    raise UncacheableValue(type(value).__name__)
+
+
+def get_cache_key(
+    prefix: str,
+    project_ids: Sequence[int],
+    granularity: int,
+    *values: Any,
+    depends_on_events: bool = False,
+) -> Optional[str]:
+    """
+    Returns a cache key for the given search parameters, or ``None`` if one
+    of them cannot be normalized and the search must not be cached.
+
+    Searches that sort or filter on values that every new event of a group
+    changes (such as its last seen date or times seen) pass
+    ``depends_on_events``, and are invalidated by new events as well.
+    """
+    try:
+        normalized = [_normalize(value, max(granularity, 1)) for value in values]
+    except UncacheableValue as e:
+        logger.info("search.cache.uncacheable", extra={"type": str(e)})
+        return None
+
+    project_ids = sorted(project_ids)
+    return "search:{}:{}".format(
+        prefix,
+        hash_values(
+            [project_ids, get_project_versions(project_ids, depends_on_events), *normalized]
+        ),
+    )
+
+
+def get_or_compute(key: str, ttl: int, stale_ttl: int, compute: Callable[[], T]) -> T:
+    """
+    Returns the value cached at ``key``, computing and caching it if there
+    is none. Values are fresh for ``ttl`` seconds and are served stale for
+    another ``stale_ttl`` seconds while one caller revalidates them.
+    """
+    entry: Optional[Tuple[float, T]] = cache.get(key)
+    now = time.time()
+    if entry is not None:
+        expires_at, value = entry
+        if now < expires_at:
+            metrics.incr("snuba.search.result_cache", tags={"result": "hit"})
+            return value
+        if not cache.add(f"{key}:revalidate", 1, ttl):
+            metrics.incr("snuba.search.result_cache", tags={"result": "stale"})
+            return value
+        metrics.incr("snuba.search.result_cache", tags={"result": "revalidate"})
+    else:
+        metrics.incr("snuba.search.result_cache", tags={"result": "miss"})
+
+    value = compute()
+    cache.set(key, (now + ttl, value), ttl + stale_ttl)
+    return value
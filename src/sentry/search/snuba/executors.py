@@ -46,9 +46,11 @@ from sentry.issues.search import (
 from sentry.models import Environment, Group, Organization, Project
 from sentry.search.events.fields import DateArg
 from sentry.search.events.filter import convert_search_filter_to_snuba_query
+from sentry.search.snuba import cache as search_cache
 from sentry.search.utils import validate_cdc_search_filters
 from sentry.types.issues import PERFORMANCE_TYPES, GroupCategory, GroupType
 from sentry.utils import json, metrics, snuba
+from sentry.utils.cache import cache
 from sentry.utils.cursors import Cursor, CursorResult
 from sentry.utils.snuba import SnubaQueryParams, aliased_query_params, bulk_raw_query
 
@@ -78,6 +80,16 @@ def get_search_filter(
     return found_val
 
 
+# Sorts and filters on values that every new event of a group changes. Cached
+# searches using them are invalidated by new events, see `search_cache`.
+EVENT_DEPENDENT_SORTS = frozenset(["date", "freq", "priority", "user", "trend"])
+EVENT_DEPENDENT_FILTERS = frozenset(["times_seen", "last_seen", "first_seen", "date"])
+
+
+def _filters_depend_on_events(search_filters: Optional[Sequence[SearchFilter]]) -> bool:
+    return any(sf.key.name in EVENT_DEPENDENT_FILTERS for sf in search_filters or ())
+
+
 class AbstractQueryExecutor(metaclass=ABCMeta):
     """This class serves as a template for Query Executors.
     We subclass it in order to implement query methods (we use it to implement two classes: joined
@@ -446,6 +458,98 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         date_from: Optional[datetime],
         date_to: Optional[datetime],
         max_hits: Optional[int] = None,
+    ) -> CursorResult[Group]:
+        args = (
+            projects,
+            retention_window_start,
+            group_queryset,
+            environments,
+            sort_by,
+            limit,
+            cursor,
+            count_hits,
+            paginator_options,
+            search_filters,
+            date_from,
+            date_to,
+            max_hits,
+        )
+
+        ttl = options.get("snuba.search.result-cache-ttl")
+        cache_key = None
+        if ttl > 0:
+            cache_key = search_cache.get_cache_key(
+                "results",
+                [p.id for p in projects],
+                ttl,
+                type(self).__name__,
+                retention_window_start,
+                None if environments is None else [e.id for e in environments],
+                sort_by,
+                limit,
+                None if cursor is None else [cursor.value, cursor.offset, cursor.is_prev],
+                count_hits,
+                paginator_options,
+                search_filters,
+                date_from,
+                date_to,
+                max_hits,
+                depends_on_events=(
+                    sort_by in EVENT_DEPENDENT_SORTS or _filters_depend_on_events(search_filters)
+                ),
+            )
+        if cache_key is None:
+            return self._query(*args)
+
+        def compute() -> Tuple[Any, ...]:
+            result = self._query(*args)
+            return (
+                [group.id for group in result.results],
+                [
+                    result.next.value,
+                    result.next.offset,
+                    result.next.is_prev,
+                    result.next.has_results,
+                ],
+                [
+                    result.prev.value,
+                    result.prev.offset,
+                    result.prev.is_prev,
+                    result.prev.has_results,
+                ],
+                result.hits,
+                result.max_hits,
+            )
+
+        group_ids, next_cursor, prev_cursor, hits, max_hits = search_cache.get_or_compute(
+            cache_key, ttl, options.get("snuba.search.result-cache-stale-ttl"), compute
+        )
+
+        # only ids are cached, groups are loaded fresh to reflect their current state
+        groups = Group.objects.in_bulk(group_ids)
+        return CursorResult(
+            [groups[group_id] for group_id in group_ids if group_id in groups],
+            Cursor(*next_cursor),
+            Cursor(*prev_cursor),
+            hits=hits,
+            max_hits=max_hits,
+        )
+
+    def _query(
+        self,
+        projects: Sequence[Project],
+        retention_window_start: Optional[datetime],
+        group_queryset: BaseQuerySet,
+        environments: Optional[Sequence[Environment]],
+        sort_by: str,
+        limit: int,
+        cursor: Cursor | None,
+        count_hits: bool,
+        paginator_options: Optional[Mapping[str, Any]],
+        search_filters: Optional[Sequence[SearchFilter]],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        max_hits: Optional[int] = None,
     ) -> CursorResult[Group]:
         now = timezone.now()
         end = None
@@ -567,23 +671,48 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         chunk_limit = limit
         offset = 0
         num_chunks = 0
-        hits = self.calculate_hits(
-            group_ids,
-            too_many_candidates,
-            sort_field,
-            projects,
-            retention_window_start,
-            group_queryset,
-            environments,
-            sort_by,
-            limit,
-            cursor,
-            count_hits,
-            paginator_options,
-            search_filters,
-            start,
-            end,
-        )
+
+        # Hit counts don't depend on the sort or the page, and change slowly
+        # enough to be cached for longer than results.
+        hits_ttl = options.get("snuba.search.hits-cache-ttl")
+        hits_cache_key = None
+        hits = None
+        if count_hits and hits_ttl > 0:
+            hits_cache_key = search_cache.get_cache_key(
+                "hits",
+                [p.id for p in projects],
+                hits_ttl,
+                type(self).__name__,
+                None if environments is None else [e.id for e in environments],
+                search_filters,
+                start,
+                end,
+                depends_on_events=_filters_depend_on_events(search_filters),
+            )
+            if hits_cache_key is not None:
+                hits = cache.get(hits_cache_key)
+                metrics.incr(
+                    "snuba.search.hits_cache",
+                    tags={"result": "miss" if hits is None else "hit"},
+                )
+        if hits is None:
+            hits = self.calculate_hits(
+                group_ids,
+                too_many_candidates,
+                sort_field,
+                projects,
+                retention_window_start,
+                group_queryset,
+                environments,
+                sort_by,
+                limit,
+                cursor,
+                count_hits,
+                paginator_options,
+                search_filters,
+                start,
+                end,
+            )
         if count_hits and hits == 0:
             return self.empty_result
 
@@ -695,6 +824,10 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
 
         metrics.timing("snuba.search.num_chunks", num_chunks)
 
+        # Zero hits are not cached, so that new groups show up right away
+        if hits_cache_key is not None and hits:
+            cache.set(hits_cache_key, hits, hits_ttl)
+
         groups = Group.objects.in_bulk(paginator_results.results)
         paginator_results.results = [groups[k] for k in paginator_results.results if k in groups]
 
@@ -11,6 +11,7 @@ from typing import (
     Sequence,
     Set,
     TypedDict,
+    Union,
     cast,
 )
 
@@ -210,7 +211,7 @@ class IndexerBatch:
         mapping: Mapping[int, Mapping[str, Optional[int]]],
         bulk_record_meta: Mapping[int, Mapping[str, Metadata]],
     ) -> IndexerOutputMessageBatch:
-        new_messages: IndexerOutputMessageBatch = []
+        new_messages: List[Message[Union[RoutingPayload, KafkaPayload]]] = []
 
         for message in self.outer_message.payload:
             used_tags: Set[str] = set()
@@ -0,0 +1,222 @@
+"""
+Columnar representation of message batches passed between the indexer
+consumer and its worker processes.
+
+The parallel transform step pickles every batch it hands to (and receives
+from) a worker process. Pickling a list of `Message` objects walks every
+message, payload, partition and timestamp object of the batch, which is a
+considerable part of the per-message cost of the consumer.
+
+`ColumnarMessageBatch` stores the same batch as a handful of flat columns:
+
+- payload values concatenated into a single buffer, with an array of end
+  offsets,
+- Kafka offsets and timestamps (microseconds) as arrays,
+- partitions, keys and header lists as indices into small interning
+  tables, since they are shared by most messages of a batch.
+
+With pickle protocol 5 the value buffer is passed out-of-band, so the
+parallel transform step copies it into its shared memory blocks in one
+piece. Messages are only materialized again when the batch is iterated.
+
+This module must not depend on Django settings, it is imported when
+worker processes unpickle a batch.
+"""
+
+from __future__ import annotations
+
+import pickle
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import BrokerValue, Message
+
+T = TypeVar("T", bound=Hashable)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _InternTable(Generic[T]):
+    def __init__(self) -> None:
+        self.values: List[T] = []
+        self.__ids: Dict[T, int] = {}
+
+    def add(self, value: T) -> int:
+        try:
+            return self.__ids[value]
+        except KeyError:
+            id = self.__ids[value] = len(self.values)
+            self.values.append(value)
+            return id
+
+
+def _to_microseconds(timestamp: datetime) -> int:
+    # Arroyo produces naive UTC timestamps, aware ones are normalized to that
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+class ColumnarMessageBatch(Sequence[Message[KafkaPayload]]):
+    """
+    An immutable sequence of `Message[KafkaPayload]` with broker values,
+    stored in columns. See the module docstring.
+    """
+
+    def __init__(
+        self,
+        values: Union[bytes, bytearray],
+        value_ends: array,
+        offsets: array,
+        timestamps: array,
+        partitions: List[Any],
+        partition_ids: array,
+        keys: List[Any],
+        key_ids: array,
+        headers: List[Tuple[Tuple[str, Any], ...]],
+        header_ids: array,
+    ) -> None:
+        self.__values = values
+        self.__value_ends = value_ends
+        self.__offsets = offsets
+        self.__timestamps = timestamps
+        self.__partitions = partitions
+        self.__partition_ids = partition_ids
+        self.__keys = keys
+        self.__key_ids = key_ids
+        self.__headers = headers
+        self.__header_ids = header_ids
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Message[KafkaPayload]]) -> ColumnarMessageBatch:
+        values = bytearray()
+        value_ends = array("Q")
+        offsets = array("q")
+        timestamps = array("q")
+        partitions: _InternTable[Any] = _InternTable()
+        partition_ids = array("I")
+        keys: _InternTable[Any] = _InternTable()
+        key_ids = array("I")
+        headers: _InternTable[Tuple[Tuple[str, Any], ...]] = _InternTable()
+        header_ids = array("I")
+
+        for message in messages:
+            broker_value = message.value
+            assert isinstance(broker_value, BrokerValue)
+            payload = broker_value.payload
+            assert isinstance(payload, KafkaPayload)
+
+            values += payload.value
+            value_ends.append(len(values))
+            offsets.append(broker_value.offset)
+            timestamps.append(_to_microseconds(broker_value.timestamp))
+            partition_ids.append(partitions.add(broker_value.partition))
+            key_ids.append(keys.add(payload.key))
+            header_ids.append(headers.add(tuple(payload.headers)))
+
+        return cls(
+            bytes(values),
+            value_ends,
+            offsets,
+            timestamps,
+            partitions.values,
+            partition_ids,
+            keys.values,
+            key_ids,
+            headers.values,
+            header_ids,
+        )
+
+    def __len__(self) -> int:
+        return len(self.__value_ends)
+
+    def value(self, index: int) -> bytes:
+        """
+        Returns the payload value of the message at ``index`` without
+        materializing the message.
+        """
+        start = self.__value_ends[index - 1] if index > 0 else 0
+        return self.__values[start : self.__value_ends[index]]
+
+    @overload
+    def __getitem__(self, index: int) -> Message[KafkaPayload]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Message[KafkaPayload]]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Message[KafkaPayload], List[Message[KafkaPayload]]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        return Message(
+            BrokerValue(
+                KafkaPayload(
+                    self.__keys[self.__key_ids[index]],
+                    self.value(index),
+                    list(self.__headers[self.__header_ids[index]]),
+                ),
+                self.__partitions[self.__partition_ids[index]],
+                self.__offsets[index],
+                _EPOCH + timedelta(microseconds=self.__timestamps[index]),
+            )
+        )
+
+    def __iter__(self) -> Iterator[Message[KafkaPayload]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColumnarMessageBatch):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __reduce_ex__(self, protocol: Any) -> Tuple[Any, ...]:
+        values: Any = self.__values
+        if isinstance(protocol, int) and protocol >= 5:
+            values = pickle.PickleBuffer(values)
+        return (
+            _restore,
+            (
+                values,
+                self.__value_ends,
+                self.__offsets,
+                self.__timestamps,
+                self.__partitions,
+                self.__partition_ids,
+                self.__keys,
+                self.__key_ids,
+                self.__headers,
+                self.__header_ids,
+            ),
+        )
+
+
+def _restore(values: Any, *columns: Any) -> ColumnarMessageBatch:
+    # Out-of-band buffers are views into the shared memory blocks of the
+    # parallel transform step, which are reused for the next batch as soon as
+    # this one is processed. Take a single copy of the whole buffer.
+    return ColumnarMessageBatch(bytes(values), *columns)
@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import Any, List, MutableMapping, MutableSequence, Optional, Union
+from typing import Any, List, MutableMapping, Optional, Sequence, Union
 
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.backends.kafka.configuration import build_kafka_consumer_configuration
@@ -10,11 +10,12 @@ from arroyo.processing.strategies import ProcessingStrategy as ProcessingStep
 from arroyo.types import Message, Value
 from django.conf import settings
 
+from sentry.sentry_metrics.consumers.indexer.columnar import ColumnarMessageBatch
 from sentry.sentry_metrics.consumers.indexer.routing_producer import RoutingPayload
 from sentry.utils import kafka_config, metrics
 
-MessageBatch = List[Message[KafkaPayload]]
-IndexerOutputMessageBatch = MutableSequence[Message[Union[RoutingPayload, KafkaPayload]]]
+MessageBatch = Sequence[Message[KafkaPayload]]
+IndexerOutputMessageBatch = Sequence[Message[Union[RoutingPayload, KafkaPayload]]]
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +47,7 @@ class MetricsBatchBuilder:
     """
 
     def __init__(self, max_batch_size: int, max_batch_time: float) -> None:
-        self.__messages: MessageBatch = []
+        self.__messages: List[Message[KafkaPayload]] = []
         self.__max_batch_size = max_batch_size
         self.__deadline = time.time() + max_batch_time / 1000.0
 
@@ -54,7 +55,7 @@ class MetricsBatchBuilder:
         return len(self.__messages)
 
     @property
-    def messages(self) -> MessageBatch:
+    def messages(self) -> List[Message[KafkaPayload]]:
         return self.__messages
 
     def append(self, message: Message[KafkaPayload]) -> None:
@@ -79,6 +80,9 @@ class BatchMessages(ProcessingStep[KafkaPayload]):
     Flushing the batch here means wrapping the batch in a Message, the batch
     itself being the payload. This is what the ParallelTransformStep will
     process in the process_message function.
+
+    With `columnar` set, the payload is a ColumnarMessageBatch instead of a
+    list of messages, which is much cheaper to pass to worker processes.
     """
 
     def __init__(
@@ -86,9 +90,11 @@ class BatchMessages(ProcessingStep[KafkaPayload]):
         next_step: ProcessingStrategy[MessageBatch],
         max_batch_time: float,
         max_batch_size: int,
+        columnar: bool = False,
     ):
         self.__max_batch_size = max_batch_size
         self.__max_batch_time = max_batch_time
+        self.__columnar = columnar
 
         self.__next_step = next_step
         self.__batch: Optional[MetricsBatchBuilder] = None
@@ -124,7 +130,10 @@ class BatchMessages(ProcessingStep[KafkaPayload]):
             return
         last = self.__batch.messages[-1]
 
-        new_message = Message(Value(self.__batch.messages, last.committable))
+        payload: MessageBatch = self.__batch.messages
+        if self.__columnar:
+            payload = ColumnarMessageBatch.from_messages(payload)
+        new_message = Message(Value(payload, last.committable))
         if self.__batch_start is not None:
             elapsed_time = time.time() - self.__batch_start
             metrics.timing("batch_messages.build_time", elapsed_time)
@@ -84,6 +84,9 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
       together. The load tests show it is still useful.
     - messages are exploded back into individual ones after the parallel
       transform step.
+
+    With `columnar_batches`, batches are passed to and from the worker
+    processes as `ColumnarMessageBatch` instead of lists of messages.
     """
 
     def __init__(
@@ -97,6 +100,7 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         output_block_size: int,
         config: MetricsIngestConfiguration,
         slicing_router: Optional[SlicingRouter],
+        columnar_batches: bool = False,
     ):
         self.__config = config
 
@@ -114,6 +118,7 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         self.__input_block_size = input_block_size
         self.__output_block_size = output_block_size
         self.__slicing_router = slicing_router
+        self.__columnar_batches = columnar_batches
 
     def create_with_partitions(
         self,
@@ -147,7 +152,10 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         )
 
         strategy = BatchMessages(
-            parallel_strategy, self.__max_msg_batch_time, self.__max_msg_batch_size
+            parallel_strategy,
+            self.__max_msg_batch_time,
+            self.__max_msg_batch_size,
+            columnar=self.__columnar_batches,
         )
 
         return strategy
@@ -186,6 +194,7 @@ def get_parallel_metrics_consumer(
     auto_offset_reset: str,
     indexer_profile: MetricsIngestConfiguration,
     slicing_router: Optional[SlicingRouter],
+    columnar_batches: bool = False,
     **options: Mapping[str, Union[str, int]],
 ) -> StreamProcessor[KafkaPayload]:
     processing_factory = MetricsConsumerStrategyFactory(
@@ -198,6 +207,7 @@ def get_parallel_metrics_consumer(
         output_block_size=output_block_size,
         config=indexer_profile,
         slicing_router=slicing_router,
+        columnar_batches=columnar_batches,
     )
 
     cluster_name: str = settings.KAFKA_TOPICS[indexer_profile.input_topic]["cluster"]
@@ -1,11 +1,13 @@
 import logging
-from typing import Callable, Mapping
+from typing import Callable, Mapping, Sequence, cast
 
+from arroyo.backends.kafka import KafkaPayload
 from arroyo.types import Message
 
 from sentry import options
 from sentry.sentry_metrics.configuration import IndexerStorage, MetricsIngestConfiguration
 from sentry.sentry_metrics.consumers.indexer.batch import IndexerBatch
+from sentry.sentry_metrics.consumers.indexer.columnar import ColumnarMessageBatch
 from sentry.sentry_metrics.consumers.indexer.common import IndexerOutputMessageBatch, MessageBatch
 from sentry.sentry_metrics.indexer.base import StringIndexer
 from sentry.sentry_metrics.indexer.cloudspanner.cloudspanner import CloudSpannerIndexer
@@ -99,4 +101,11 @@ class MessageProcessor:
             # TODO: move to separate thread
             cardinality_limiter.apply_cardinality_limits(cardinality_limiter_state)
 
+        # Send the output back in the same format. Routed messages are not
+        # KafkaPayloads, they are always returned as a list.
+        if isinstance(outer_message.payload, ColumnarMessageBatch) and not is_output_sliced:
+            return ColumnarMessageBatch.from_messages(
+                cast(Sequence[Message[KafkaPayload]], new_messages)
+            )
+
         return new_messages
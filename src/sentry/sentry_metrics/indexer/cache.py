@@ -1,6 +1,9 @@
 import logging
 import random
-from typing import Mapping, MutableMapping, Optional, Sequence, Set
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
 
 from django.conf import settings
 from django.core.cache import caches
@@ -21,13 +24,82 @@ logger = logging.getLogger(__name__)
 _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+
+
+class LocalStringIndexerCache:
+    """
+    Bounded, in-process LRU tier in front of the shared indexer cache.
+
+    Indexed ids never change once assigned, so entries only expire to make
+    room for new strings over time, using the same jittered TTL as the
+    shared cache.
+    """
+
+    def __init__(self, max_size: int, ttl: Callable[[], int]):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Sequence[str], cache_namespace: str) -> Dict[str, Any]:
+        """
+        Returns only the keys that were found in the cache.
+        """
+        now = time.monotonic()
+        results = {}
+        with self._lock:
+            for key in keys:
+                entry_key = (cache_namespace, key)
+                entry = self._entries.get(entry_key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[entry_key]
+                    continue
+                self._entries.move_to_end(entry_key)
+                results[key] = value
+
+        metrics.incr(_INDEXER_LOCAL_CACHE_METRIC, tags={"cache_hit": "true"}, amount=len(results))
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "false"},
+            amount=len(keys) - len(results),
+        )
+        return results
+
+    def set_many(self, key_values: Mapping[str, Any], cache_namespace: str) -> None:
+        expires_at = time.monotonic() + self.ttl()
+        with self._lock:
+            for key, value in key_values.items():
+                entry_key = (cache_namespace, key)
+                self._entries[entry_key] = (value, expires_at)
+                self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: Sequence[str], cache_namespace: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop((cache_namespace, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 
 class StringIndexerCache:
-    def __init__(self, cache_name: str, partition_key: str):
+    def __init__(self, cache_name: str, partition_key: str, local_cache_size: int = 0):
         self.version = 1
         self.cache = caches[cache_name]
         self.partition_key = partition_key
+        self.local: Optional[LocalStringIndexerCache] = None
+        if local_cache_size:
+            self.local = LocalStringIndexerCache(local_cache_size, lambda: self.randomized_ttl)
 
     @property
     def randomized_ttl(self) -> int:
@@ -60,9 +132,17 @@ class StringIndexerCache:
         return formatted
 
     def get(self, key: str, cache_namespace: str) -> int:
+        if self.local is not None:
+            local_results = self.local.get_many([key], cache_namespace)
+            if key in local_results:
+                local_result: int = local_results[key]
+                return local_result
+
         result: int = self.cache.get(
             self.make_cache_key(key, cache_namespace), version=self.version
         )
+        if result is not None and self.local is not None:
+            self.local.set_many({key: result}, cache_namespace)
         return result
 
     def set(self, key: str, value: int, cache_namespace: str) -> None:
@@ -72,9 +152,31 @@ class StringIndexerCache:
             timeout=self.randomized_ttl,
             version=self.version,
         )
+        if self.local is not None:
+            self.local.set_many({key: value}, cache_namespace)
 
     def get_many(
         self, keys: Sequence[str], cache_namespace: str
+    ) -> MutableMapping[str, Optional[int]]:
+        if self.local is None:
+            return self._get_many(keys, cache_namespace)
+
+        local_results = self.local.get_many(keys, cache_namespace)
+        if len(local_results) == len(keys):
+            return {key: local_results[key] for key in keys}
+
+        shared_results = self._get_many(
+            [key for key in keys if key not in local_results], cache_namespace
+        )
+        self.local.set_many(
+            {k: v for k, v in shared_results.items() if v is not None}, cache_namespace
+        )
+        return {
+            key: local_results[key] if key in local_results else shared_results[key] for key in keys
+        }
+
+    def _get_many(
+        self, keys: Sequence[str], cache_namespace: str
     ) -> MutableMapping[str, Optional[int]]:
         cache_keys = {self.make_cache_key(key, cache_namespace): key for key in keys}
         results: Mapping[str, Optional[int]] = self.cache.get_many(
@@ -87,14 +189,20 @@ class StringIndexerCache:
             self.make_cache_key(k, cache_namespace): v for k, v in key_values.items()
         }
         self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
+        if self.local is not None:
+            self.local.set_many(key_values, cache_namespace)
 
     def delete(self, key: str, cache_namespace: str) -> None:
         cache_key = self.make_cache_key(key, cache_namespace)
         self.cache.delete(cache_key, version=self.version)
+        if self.local is not None:
+            self.local.delete_many([key], cache_namespace)
 
     def delete_many(self, keys: Sequence[str], cache_namespace: str) -> None:
         cache_keys = [self.make_cache_key(key, cache_namespace) for key in keys]
         self.cache.delete_many(cache_keys, version=self.version)
+        if self.local is not None:
+            self.local.delete_many(keys, cache_namespace)
 
 
 class CachingIndexer(StringIndexer):
@@ -166,4 +274,19 @@ class CachingIndexer(StringIndexer):
         return id
 
     def reverse_resolve(self, use_case_id: UseCaseKey, org_id: int, id: int) -> Optional[str]:
-        return self.indexer.reverse_resolve(use_case_id, org_id, id)
+        # reverse lookups are only cached in-process, in their own namespace
+        local = self.cache.local
+        key = f"{org_id}:{id}"
+        cache_namespace = f"{use_case_id.value}:reverse"
+        if local is not None:
+            local_results = local.get_many([key], cache_namespace)
+            if key in local_results:
+                result: str = local_results[key]
+                return result
+
+        string = self.indexer.reverse_resolve(use_case_id, org_id, id)
+
+        if string is not None and local is not None:
+            local.set_many({key: string}, cache_namespace)
+
+        return string
@@ -162,6 +162,7 @@ ownership_rule_created = BetterSignal(providing_args=["project"])
 
 # issues
 issue_assigned = BetterSignal(providing_args=["project", "group", "user"])
+issue_unassigned = BetterSignal(providing_args=["project", "group", "user"])
 issue_deleted = BetterSignal(providing_args=["group", "user", "delete_type"])
 issue_resolved = BetterSignal(
     providing_args=["organization_id", "project", "group", "user", "resolution_type"]
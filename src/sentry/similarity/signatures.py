@@ -7,7 +7,30 @@ class MinHashSignatureBuilder:
         self.rows = rows
 
     def __call__(self, features):
-        return [
-            min(mmh3.hash(feature, column) % self.rows for feature in features)
-            for column in range(self.columns)
-        ]
+        return self.build_many([features])[0]
+
+    def build_many(self, feature_sets):
+        """
+        Builds the signatures of several feature sets at once.
+
+        Feature sets of a batch share most of their features (frames of the
+        same stack trace, shingles of the same message), so every distinct
+        feature is hashed only once per batch. The per-column minimum is then
+        taken over the rows of hashes of each feature set.
+        """
+        columns = range(self.columns)
+        rows = self.rows
+
+        hashes = {}
+        signatures = []
+        for features in feature_sets:
+            feature_hashes = []
+            for feature in features:
+                value = hashes.get(feature)
+                if value is None:
+                    value = hashes[feature] = [
+                        mmh3.hash(feature, column) % rows for column in columns
+                    ]
+                feature_hashes.append(value)
+            signatures.append(list(map(min, zip(*feature_hashes))))
+        return signatures
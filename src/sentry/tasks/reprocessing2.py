@@ -36,6 +36,7 @@ def reprocess_group(
         CannotReprocess,
         buffered_handle_remaining_events,
         logger,
+        pull_events_data,
         reprocess_event,
         start_group_reprocessing,
     )
@@ -78,6 +79,17 @@ def reprocess_group(
 
         return
 
+    # Events that cannot be reprocessed do not count towards max_events, so
+    # the whole page is loaded unless no event is going to be reprocessed.
+    reprocessable_events = {}
+    if max_events is None or max_events > 0:
+        with sentry_sdk.start_span(op="pull_events_data"):
+            try:
+                reprocessable_events = pull_events_data(project_id, events)
+            except Exception:
+                # events are pulled one by one below instead
+                sentry_sdk.capture_exception()
+
     remaining_event_ids = []
 
     for event in events:
@@ -88,6 +100,7 @@ def reprocess_group(
                         project_id=project_id,
                         event_id=event.event_id,
                         start_time=start_time,
+                        reprocessable_event=reprocessable_events.get(event.event_id),
                     )
                 except CannotReprocess as e:
                     logger.error(f"reprocessing2.{e}")
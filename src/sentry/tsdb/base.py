@@ -108,7 +108,9 @@ class BaseTSDB(Service):
     __read_methods__ = frozenset(
         [
             "get_range",
+            "get_range_multi",
             "get_sums",
+            "get_sums_multi",
             "get_distinct_counts_series",
             "get_distinct_counts_totals",
             "get_distinct_counts_union",
@@ -393,6 +395,46 @@ class BaseTSDB(Service):
         sum_set = {key: sum(p for _, p in points) for (key, points) in range_set.items()}
         return sum_set
 
+    def get_range_multi(self, queries, start, end, rollup=None):
+        """
+        Fetch ranges for many ``(model, key, environment_id)`` queries at once.
+
+        Returns a mapping of ``(model, key, environment_id)`` => [(timestamp,
+        count), ...]. The default implementation issues one ``get_range`` call
+        per model and environment, backends should override this to batch
+        queries further.
+
+        >>> now = timezone.now()
+        >>> get_range_multi([(TSDBModel.group, 1, None), (TSDBModel.project, 2, 3)],
+        >>>                 start=now - timedelta(days=1),
+        >>>                 end=now)
+        """
+        keys_by_model_environment = {}
+        for model, key, environment_id in queries:
+            keys_by_model_environment.setdefault((model, environment_id), []).append(key)
+
+        results = {}
+        for (model, environment_id), keys in keys_by_model_environment.items():
+            range_set = self.get_range(
+                model,
+                keys,
+                start,
+                end,
+                rollup,
+                environment_ids=[environment_id] if environment_id is not None else None,
+            )
+            for key, points in range_set.items():
+                results[(model, key, environment_id)] = points
+        return results
+
+    def get_sums_multi(self, queries, start, end, rollup=None):
+        """
+        Like ``get_range_multi``, but returns a mapping of ``(model, key,
+        environment_id)`` => total count.
+        """
+        range_set = self.get_range_multi(queries, start, end, rollup)
+        return {query: sum(p for _, p in points) for query, points in range_set.items()}
+
     def _add_jitter_to_series(self, series, start, rollup, jitter_value):
         if jitter_value and series:
             jitter = jitter_value % rollup
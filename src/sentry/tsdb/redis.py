@@ -3,6 +3,7 @@ import logging
 import random
 import uuid
 from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
 from hashlib import md5
 from typing import Callable, ContextManager, TypeVar
@@ -311,6 +312,70 @@ class RedisTSDB(BaseTSDB):
             results_by_key[key] = sorted(points.items())
         return dict(results_by_key)
 
+    def get_range_multi(self, queries, start, end, rollup=None):
+        """
+        Fetch ranges for many ``(model, key, environment_id)`` queries at once.
+
+        Counters that share a hash (same model, epoch and vnode) are fetched
+        with a single ``HMGET``, and the clusters of all requested environments
+        are queried concurrently.
+        """
+        queries = list(queries)
+        environment_ids = {environment_id for _, _, environment_id in queries}
+        self.validate_arguments({model for model, _, _ in queries}, environment_ids)
+
+        rollup, series = self.get_optimal_rollup_series(start, end, rollup)
+        series = [to_datetime(item) for item in series]
+
+        requests = []
+        for (cluster, _), cluster_environment_ids in self.get_cluster_groups(environment_ids):
+            cluster_environment_ids = set(cluster_environment_ids)
+            requests.append(
+                (
+                    cluster,
+                    [query for query in queries if query[2] in cluster_environment_ids],
+                )
+            )
+
+        if len(requests) == 1:
+            responses = [self._get_range_multi(*requests[0], rollup, series)]
+        else:
+            with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+                responses = list(
+                    executor.map(
+                        lambda request: self._get_range_multi(*request, rollup, series), requests
+                    )
+                )
+
+        results = {}
+        for response in responses:
+            results.update(response)
+        return results
+
+    def _get_range_multi(self, cluster, queries, rollup, series):
+        # hash_key -> hash_field -> [(query, epoch), ...]
+        fields_by_hash_key = defaultdict(lambda: defaultdict(list))
+        for query in queries:
+            model, key, environment_id = query
+            for timestamp in series:
+                hash_key, hash_field = self.make_counter_key(
+                    model, rollup, timestamp, key, environment_id
+                )
+                fields_by_hash_key[hash_key][hash_field].append((query, to_timestamp(timestamp)))
+
+        promises = []
+        with cluster.map() as client:
+            for hash_key, fields in fields_by_hash_key.items():
+                promises.append((fields, client.hmget(hash_key, list(fields))))
+
+        points_by_query = {query: {} for query in queries}
+        for fields, promise in promises:
+            for targets, count in zip(fields.values(), promise.value):
+                for query, epoch in targets:
+                    points_by_query[query][epoch] = int(count or 0)
+
+        return {query: sorted(points.items()) for query, points in points_by_query.items()}
+
     def merge(self, model, destination, sources, timestamp=None, environment_ids=None):
         environment_ids = (set(environment_ids) if environment_ids is not None else set()).union(
             [None]
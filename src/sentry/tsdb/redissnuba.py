@@ -18,6 +18,10 @@ def multiple_model_argument(callargs):
     return set(callargs["models"])
 
 
+def query_models_argument(callargs):
+    return {model for model, key, environment_id in callargs["queries"]}
+
+
 def dont_do_this(callargs):
     raise NotImplementedError("do not run this please")
 
@@ -25,7 +29,9 @@ def dont_do_this(callargs):
 method_specifications = {
     # method: (type, function(callargs) -> set[model])
     "get_range": (READ, single_model_argument),
+    "get_range_multi": (READ, query_models_argument),
     "get_sums": (READ, single_model_argument),
+    "get_sums_multi": (READ, query_models_argument),
     "get_distinct_counts_series": (READ, single_model_argument),
     "get_distinct_counts_totals": (READ, single_model_argument),
     "get_distinct_counts_union": (READ, single_model_argument),
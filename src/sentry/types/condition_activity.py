@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Sequence
 
 FREQUENCY_CONDITION_BUCKET_SIZE = timedelta(minutes=5)
 
@@ -28,3 +28,39 @@ def round_to_five_minute(time: datetime) -> datetime:
     return time - timedelta(
         minutes=time.minute % 5, seconds=time.second, microseconds=time.microsecond
     )
+
+
+class FrequencyBuckets:
+    """
+    Cumulative event counts of a group, one per FREQUENCY_CONDITION_BUCKET_SIZE bucket starting
+    at ``start``. Buckets are addressed by their position, and the count in the window between
+    two positions is the difference of their cumulative counts.
+    """
+
+    def __init__(self, start: datetime, counts: Sequence[int]):
+        self.start = round_to_five_minute(start)
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def position(self, time: datetime) -> int:
+        return (round_to_five_minute(time) - self.start) // FREQUENCY_CONDITION_BUCKET_SIZE
+
+    def time(self, position: int) -> datetime:
+        return self.start + position * FREQUENCY_CONDITION_BUCKET_SIZE
+
+    def cumulative(self, position: int) -> int:
+        # positions outside of the buckets count as 0, like a missing bucket
+        return self.counts[position] if 0 <= position < len(self.counts) else 0
+
+    def window_counts(self, positions: Iterable[int], size: int, offset: int = 0) -> List[int]:
+        """
+        Returns the number of events in the ``size`` buckets before each position, shifted back
+        by ``offset`` buckets.
+        """
+        cumulative = self.cumulative
+        return [
+            cumulative(position - offset) - cumulative(position - offset - size)
+            for position in positions
+        ]
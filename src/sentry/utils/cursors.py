@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Iterator, Protocol, Sequence, Tuple, TypeVar, Union
+import base64
+from datetime import datetime
+from typing import Any, Callable, Iterator, List, Protocol, Sequence, Tuple, TypeVar, Union
 
+from sentry.utils import json
 from sentry.utils.json import JSONData
 
 T = TypeVar("T")
@@ -84,6 +87,58 @@ class StringCursor(Cursor):
             raise ValueError
 
 
+class KeysetCursor(Cursor):
+    """
+    Cursor for `sentry.api.paginator.KeysetPaginator`. Its value is the list
+    of sort values of the row to continue after (or before, for a previous
+    cursor), encoded as url-safe base64 JSON.
+
+    Plain numeric values of offset cursors are still accepted, so that
+    links handed out before an endpoint switched to keyset pagination keep
+    working.
+    """
+
+    @staticmethod
+    def encode_value(value: Any) -> str:
+        if not isinstance(value, (list, tuple)):
+            return str(value)
+        values: List[Any] = [
+            {"datetime": v.isoformat()} if isinstance(v, datetime) else v for v in value
+        ]
+        return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode().rstrip("=")
+
+    @staticmethod
+    def decode_value(value: str) -> Any:
+        try:
+            return float(value) if "." in value else int(value)
+        except ValueError:
+            pass
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+        except Exception:
+            raise ValueError
+        if not isinstance(values, list):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v["datetime"]) if isinstance(v, dict) and "datetime" in v else v
+            for v in values
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.encode_value(self.value)}:{self.offset}:{int(self.is_prev)}"
+
+    @classmethod
+    def from_string(cls, cursor_str: str) -> KeysetCursor:
+        bits = cursor_str.rsplit(":", 2)
+        if len(bits) != 3:
+            raise ValueError
+        try:
+            return KeysetCursor(cls.decode_value(bits[0]), int(bits[1]), int(bits[2]))
+        except (TypeError, ValueError):
+            raise ValueError
+
+
 class CursorResult(Sequence[T]):
     def __init__(
         self,
@@ -24,6 +24,7 @@ from sentry.utils.event_frames import get_sdk_name
 from sentry.utils.safe import get_path
 
 from .performance_problem import PerformanceProblem
+from .span_index import SpanIndex
 
 
 def join_regexes(regexes: Sequence[str]) -> str:
@@ -308,8 +309,9 @@ def _detect_performance_problems(
         UncompressedAssetSpanDetector(detection_settings, data),
     ]
 
+    span_index = SpanIndex(data.get("spans", []))
     for detector in detectors:
-        run_detector_on_data(detector, data)
+        run_detector_on_data(detector, data, span_index)
 
     # Metrics reporting only for detection, not created issues.
     report_metrics_for_detectors(data, event_id, detectors, sdk_span)
@@ -350,11 +352,15 @@ def _detect_performance_problems(
     return list(unique_problems)
 
 
-def run_detector_on_data(detector, data):
+def run_detector_on_data(detector, data, span_index: Optional[SpanIndex] = None):
     if not detector.is_event_eligible(data):
         return
 
     spans = data.get("spans", [])
+    if span_index is None:
+        span_index = SpanIndex(spans)
+    detector.span_index = span_index
+
     for span in spans:
         detector.visit_span(span)
 
@@ -464,6 +470,8 @@ class PerformanceDetector(ABC):
     def __init__(self, settings: Dict[DetectorType, Any], event: Event):
         self.settings = settings[self.settings_key]
         self._event = event
+        # Set by `run_detector_on_data`, shared by all detectors of the event
+        self.span_index: Optional[SpanIndex] = None
         self.init()
 
     @abstractmethod
@@ -482,7 +490,7 @@ class PerformanceDetector(ABC):
         if not op or not span_id:
             return None
 
-        span_duration = get_span_duration(span)
+        span_duration = self.span_duration(span)
         for setting in self.settings:
             op_prefix = self.find_span_prefix(setting, op)
             if op_prefix:
@@ -492,6 +500,52 @@ class PerformanceDetector(ABC):
     def event(self) -> Event:
         return self._event
 
+    def _span_position(self, span: Span) -> Optional[int]:
+        if self.span_index is None:
+            return None
+        position = self.span_index.position(span)
+        if position is None or not self.span_index.has_timestamps(position):
+            return None
+        return position
+
+    def span_duration(self, span: Span) -> timedelta:
+        position = self._span_position(span)
+        if position is None:
+            return get_span_duration(span)
+        return self.span_index.duration(position)
+
+    def span_start(self, span: Span) -> timedelta:
+        position = self._span_position(span)
+        if position is None:
+            return timedelta(seconds=span.get("start_timestamp", 0))
+        return self.span_index.start(position)
+
+    def span_end(self, span: Span) -> timedelta:
+        position = self._span_position(span)
+        if position is None:
+            return timedelta(seconds=span.get("timestamp", 0))
+        return self.span_index.end(position)
+
+    def span_overlaps(self, previous_span: Span, span: Span) -> bool:
+        """Whether ``previous_span`` ends after ``span`` begins."""
+        previous = self._span_position(previous_span)
+        position = self._span_position(span)
+        if previous is None or position is None:
+            return timedelta(seconds=previous_span.get("timestamp", 0)) > timedelta(
+                seconds=span.get("start_timestamp", 0)
+            )
+        return self.span_index.overlaps(previous, position)
+
+    def span_fingerprint(self, span: Span) -> Optional[str]:
+        position = self.span_index.position(span) if self.span_index is not None else None
+        if position is None:
+            return fingerprint_span(span)
+
+        fingerprints = self.span_index.fingerprints
+        if position not in fingerprints:
+            fingerprints[position] = fingerprint_span(span)
+        return fingerprints[position]
+
     @property
     @abstractmethod
     def settings_key(self) -> DetectorType:
@@ -553,7 +607,7 @@ class SlowDBQueryDetector(PerformanceDetector):
         op, span_id, op_prefix, span_duration, settings = settings_for_span
         duration_threshold = settings.get("duration_threshold")
 
-        fingerprint = fingerprint_span(span)
+        fingerprint = self.span_fingerprint(span)
 
         if not fingerprint:
             return
@@ -646,7 +700,7 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
 
         if self._is_blocking_render(span):
             span_id = span.get("span_id", None)
-            fingerprint = fingerprint_span(span)
+            fingerprint = self.span_fingerprint(span)
             if span_id and fingerprint:
                 self.stored_problems[fingerprint] = PerformanceProblem(
                     fingerprint=fingerprint,
@@ -660,19 +714,19 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
 
         # If we visit a span that starts after FCP, then we know we've already
         # seen all possible render-blocking resource spans.
-        span_start_timestamp = timedelta(seconds=span.get("start_timestamp", 0))
+        span_start_timestamp = self.span_start(span)
         fcp_timestamp = self.transaction_start + self.fcp
         if span_start_timestamp >= fcp_timestamp:
             # Early return for all future span visits.
             self.fcp = None
 
     def _is_blocking_render(self, span):
-        span_end_timestamp = timedelta(seconds=span.get("timestamp", 0))
+        span_end_timestamp = self.span_end(span)
         fcp_timestamp = self.transaction_start + self.fcp
         if span_end_timestamp >= fcp_timestamp:
             return False
 
-        span_duration = get_span_duration(span)
+        span_duration = self.span_duration(span)
         fcp_ratio_threshold = self.settings.get("fcp_ratio_threshold")
         return span_duration / self.fcp > fcp_ratio_threshold
 
@@ -709,7 +763,7 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
             return
 
         duration_threshold = timedelta(milliseconds=self.settings.get("duration_threshold"))
-        span_duration = get_span_duration(span)
+        span_duration = self.span_duration(span)
 
         if span_duration < duration_threshold:
             return
@@ -918,7 +972,7 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
             "consecutive_count_threshold"
         )
         exceeds_span_duration_threshold = all(
-            get_span_duration(span).total_seconds() * 1000
+            self.span_duration(span).total_seconds() * 1000
             > self.settings.get("span_duration_threshold")
             for span in self.independent_db_spans
         )
@@ -956,7 +1010,7 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
         "Given a list of spans, find the sum of the span durations in milliseconds"
         sum = 0
         for span in spans:
-            sum += get_span_duration(span).total_seconds() * 1000
+            sum += self.span_duration(span).total_seconds() * 1000
         return sum
 
     def _set_independent_spans(self, spans: list[Span]):
@@ -987,13 +1041,13 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
         total_duration = self._sum_span_duration(consecutive_spans)
 
         max_independent_span_duration = max(
-            [get_span_duration(span).total_seconds() * 1000 for span in independent_spans]
+            [self.span_duration(span).total_seconds() * 1000 for span in independent_spans]
         )
 
         sum_of_dependent_span_durations = 0
         for span in consecutive_spans:
             if span not in independent_spans:
-                sum_of_dependent_span_durations += get_span_duration(span).total_seconds() * 1000
+                sum_of_dependent_span_durations += self.span_duration(span).total_seconds() * 1000
 
         return total_duration - max(max_independent_span_duration, sum_of_dependent_span_durations)
 
@@ -1002,10 +1056,7 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
             return False
 
         last_span = self.consecutive_db_spans[-1]
-
-        last_span_ends = timedelta(seconds=last_span.get("timestamp", 0))
-        current_span_begins = timedelta(seconds=span.get("start_timestamp", 0))
-        return last_span_ends > current_span_begins
+        return self.span_overlaps(last_span, span)
 
     def _reset_variables(self) -> None:
         self.consecutive_db_spans = []
@@ -1062,7 +1113,7 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
 
     __slots__ = (
         "stored_problems",
-        "potential_parents",
+        "root_span",
         "source_span",
         "n_hash",
         "n_spans",
@@ -1073,13 +1124,10 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
 
     def init(self):
         self.stored_problems = {}
-        self.potential_parents = {}
         self.n_hash = None
         self.n_spans = []
         self.source_span = None
-        root_span = get_path(self._event, "contexts", "trace")
-        if root_span:
-            self.potential_parents[root_span.get("span_id")] = root_span
+        self.root_span = get_path(self._event, "contexts", "trace")
 
     def is_creation_allowed_for_organization(self, organization: Optional[Organization]) -> bool:
         return True  # This detector is fully rolled out
@@ -1097,9 +1145,6 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
             # This breaks up the N+1 we're currently tracking.
             self._maybe_store_problem()
             self._reset_detection()
-            # Treat it as a potential parent as long as it isn't the root span.
-            if span.get("parent_span_id", None):
-                self.potential_parents[span_id] = span
             return
 
         if not self.source_span:
@@ -1132,12 +1177,34 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
         return op.startswith("db") and not op.startswith("db.redis")
 
     def _maybe_use_as_source(self, span: Span):
-        parent_span_id = span.get("parent_span_id", None)
-        if not parent_span_id or parent_span_id not in self.potential_parents:
+        if self._potential_parent(span) is None:
             return
 
         self.source_span = span
 
+    def _potential_parent(self, span: Span) -> Optional[Span]:
+        """
+        The parent of ``span`` if it can be the parent of an N+1: the
+        transaction, or a non-DB span that isn't the root span and was
+        visited before ``span``.
+        """
+        parent_span_id = span.get("parent_span_id", None)
+        if not parent_span_id:
+            return None
+        if self.root_span and parent_span_id == self.root_span.get("span_id"):
+            return self.root_span
+
+        position = self.span_index.position(span)
+        parent = self.span_index.parent(position) if position is not None else None
+        if parent is None or parent > position:
+            return None
+
+        parent_span = self.span_index.spans[parent]
+        op = parent_span.get("op", None)
+        if not op or self._is_db_op(op) or not parent_span.get("parent_span_id", None):
+            return None
+        return parent_span
+
     def _continues_n_plus_1(self, span: Span):
         if self._overlaps_last_span(span):
             return False
@@ -1166,9 +1233,7 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
         if self.n_spans:
             last_span = self.n_spans[-1]
 
-        last_span_ends = timedelta(seconds=last_span.get("timestamp", 0))
-        current_span_begins = timedelta(seconds=span.get("start_timestamp", 0))
-        return last_span_ends > current_span_begins
+        return self.span_overlaps(last_span, span)
 
     def _maybe_store_problem(self):
         if not self.source_span or not self.n_spans:
@@ -1184,15 +1249,13 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
         # Do the spans take enough total time?
         total_duration = timedelta()
         for span in self.n_spans:
-            total_duration += get_span_duration(span)
+            total_duration += self.span_duration(span)
         if total_duration < duration_threshold:
             return
 
         # We require a parent span in order to improve our fingerprint accuracy.
         parent_span_id = self.source_span.get("parent_span_id", None)
-        if not parent_span_id:
-            return
-        parent_span = self.potential_parents[parent_span_id]
+        parent_span = self._potential_parent(self.source_span)
         if not parent_span:
             return
 
@@ -1235,12 +1298,16 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
         # Checks for any extra spans that match the detected problem but are not part of affected spans.
         # Temporary check since we eventually want to capture extra perf problems on the initial pass while walking spans.
         n_count = len(self.n_spans)
-        all_matching_spans = [
-            span
-            for span in self._event.get("spans", [])
-            if span.get("span_id", None) == self.n_hash
-        ]
-        all_count = len(all_matching_spans)
+        if self.span_index is not None:
+            all_count = self.span_index.count_span_id(self.n_hash)
+        else:
+            all_count = len(
+                [
+                    span
+                    for span in self._event.get("spans", [])
+                    if span.get("span_id", None) == self.n_hash
+                ]
+            )
         if n_count > 0 and n_count != all_count:
             metrics.incr("performance.performance_issue.np1_db.extra_spans")
 
@@ -1267,7 +1334,7 @@ class NPlusOneDBSpanDetectorExtended(NPlusOneDBSpanDetector):
 
     __slots__ = (
         "stored_problems",
-        "potential_parents",
+        "root_span",
         "source_span",
         "n_hash",
         "n_spans",
@@ -1632,7 +1699,7 @@ class UncompressedAssetSpanDetector(PerformanceDetector):
             return
 
         # Ignore assets under a certain duration threshold
-        if get_span_duration(span).total_seconds() * 1000 <= self.settings.get(
+        if self.span_duration(span).total_seconds() * 1000 <= self.settings.get(
             "duration_threshold"
         ):
             return
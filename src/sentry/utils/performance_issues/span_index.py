@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+Span = Dict[str, Any]
+
+_MICROSECOND = timedelta(microseconds=1)
+# Stored for timestamps that cannot be parsed
+_INVALID = -sys.maxsize - 1
+
+
+def _to_microseconds(seconds: Any) -> Optional[int]:
+    # Round exactly like the `timedelta` arithmetic the detectors used to do
+    # on every visit, so that comparisons on the index give the same results.
+    try:
+        return timedelta(seconds=seconds) // _MICROSECOND
+    except (TypeError, OverflowError, ValueError):
+        return None
+
+
+class SpanIndex:
+    """
+    Index over the spans of a transaction, built in a single pass and shared
+    by all performance detectors that run on the event.
+
+    Spans are addressed by their position in the event's span list.
+    Timestamps are parsed once into arrays of microseconds, and the span tree
+    is available as parent positions and, built on first use, lists of
+    children in sibling (start time) order. Span fingerprints are memoized as
+    detectors compute them.
+    """
+
+    __slots__ = (
+        "spans",
+        "starts",
+        "ends",
+        "parents",
+        "fingerprints",
+        "_children",
+        "_positions",
+        "_span_ids",
+    )
+
+    def __init__(self, spans: Sequence[Span]):
+        self.spans = spans
+        self.starts = array("q")
+        self.ends = array("q")
+        # position -> position of the parent span, -1 if it isn't in the event
+        self.parents = array("q")
+        self._children: Optional[Dict[int, List[int]]] = None
+
+        # id(span) -> position, spans are looked up by identity
+        self._positions: Dict[int, int] = {}
+        # span_id -> positions of spans with that id
+        self._span_ids: Dict[str, List[int]] = {}
+        # position -> `fingerprint_span` of the span, filled in by detectors
+        self.fingerprints: Dict[int, Optional[str]] = {}
+
+        for position, span in enumerate(spans):
+            self._positions[id(span)] = position
+
+            start = _to_microseconds(span.get("start_timestamp", 0))
+            end = _to_microseconds(span.get("timestamp", 0))
+            self.starts.append(_INVALID if start is None else start)
+            self.ends.append(_INVALID if end is None else end)
+
+            span_id = span.get("span_id")
+            if span_id:
+                self._span_ids.setdefault(span_id, []).append(position)
+
+        span_ids = self._span_ids
+        for span in spans:
+            parent_positions = span_ids.get(span.get("parent_span_id"))
+            self.parents.append(parent_positions[0] if parent_positions else -1)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def position(self, span: Span) -> Optional[int]:
+        return self._positions.get(id(span))
+
+    def has_timestamps(self, position: int) -> bool:
+        return self.starts[position] != _INVALID and self.ends[position] != _INVALID
+
+    def start(self, position: int) -> timedelta:
+        return timedelta(microseconds=self.starts[position])
+
+    def end(self, position: int) -> timedelta:
+        return timedelta(microseconds=self.ends[position])
+
+    def duration(self, position: int) -> timedelta:
+        return timedelta(microseconds=self.ends[position] - self.starts[position])
+
+    def overlaps(self, previous: int, position: int) -> bool:
+        """Whether the span at ``previous`` ends after the one at ``position`` starts."""
+        return self.ends[previous] > self.starts[position]
+
+    def parent(self, position: int) -> Optional[int]:
+        parent = self.parents[position]
+        return parent if parent >= 0 else None
+
+    def children_of(self, position: int) -> List[int]:
+        if self._children is None:
+            children: Dict[int, List[int]] = {}
+            for child, parent in enumerate(self.parents):
+                if parent >= 0:
+                    children.setdefault(parent, []).append(child)
+            # positions break ties, so siblings starting together keep their
+            # order in the event
+            starts = self.starts
+            for child_positions in children.values():
+                child_positions.sort(key=starts.__getitem__)
+            self._children = children
+        return self._children.get(position, [])
+
+    def count_span_id(self, span_id: Optional[str]) -> int:
+        return len(self._span_ids.get(span_id, ())) if span_id else 0
@@ -134,6 +134,15 @@ def pytest_configure(config):
         "nodedata": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
     }
 
+    # The in-process indexer cache would outlive the caches cleared between tests
+    settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS = {
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS,
+        "local_cache_size": 0,
+    }
+
+    # Cached search results would hide patched builders and configs
+    settings.SENTRY_EVENT_SEARCH_RESULT_CACHE_SIZE = 0
+
     settings.SENTRY_RATELIMITER = "sentry.ratelimits.redis.RedisRateLimiter"
     settings.SENTRY_RATELIMITER_OPTIONS = {}
 
@@ -174,6 +183,7 @@ def pytest_configure(config):
             "aws-lambda.node.layer-version": "3",
             "aws-lambda.python.layer-name": "my-python-layer",
             "aws-lambda.python.layer-version": "34",
+            "rules.frequency-condition-cache-ttl": 0,
         }
     )
 
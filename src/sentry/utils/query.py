@@ -206,9 +206,7 @@ class WithProgressBar:
             pbar.finish()
 
 
-def bulk_delete_objects(
-    model, limit=10000, transaction_id=None, logger=None, partition_key=None, **filters
-):
+def _get_bulk_delete_conditions(model, partition_key, filters):
     connection = connections[router.db_for_write(model)]
     quote_name = connection.ops.quote_name
 
@@ -230,6 +228,15 @@ def bulk_delete_objects(
             query.append(f"{quote_name(column)} = %s")
             params.append(value)
 
+    return partition_query, query, params
+
+
+def bulk_delete_objects(
+    model, limit=10000, transaction_id=None, logger=None, partition_key=None, **filters
+):
+    connection = connections[router.db_for_write(model)]
+    partition_query, query, params = _get_bulk_delete_conditions(model, partition_key, filters)
+
     query = """
         delete from %(table)s
         where %(partition_query)s id = any(array(
@@ -257,3 +264,41 @@ def bulk_delete_objects(
         )
 
     return has_more
+
+
+def bulk_delete_objects_after(model, after_id=0, limit=10000, partition_key=None, **filters):
+    """
+    Deletes up to ``limit`` rows matching ``filters`` with an id greater than
+    ``after_id``, in id order. Returns the greatest deleted id, or ``None`` if
+    there were no such rows.
+
+    Unlike `bulk_delete_objects`, successive calls continue from the last
+    deleted id instead of scanning past the rows deleted by earlier calls
+    (which stay in the indexes until they are vacuumed) again.
+    """
+    connection = connections[router.db_for_write(model)]
+    partition_query, query, params = _get_bulk_delete_conditions(model, partition_key, filters)
+
+    query = """
+        with deleted as (
+            delete from %(table)s
+            where %(partition_query)s id = any(array(
+                select id
+                from %(table)s
+                where (%(query)s) and id > %%s
+                order by id
+                limit %(limit)d
+            ))
+            returning id
+        )
+        select max(id) from deleted
+    """ % dict(
+        partition_query=(" AND ".join(partition_query)) + (" AND " if partition_query else ""),
+        query=" AND ".join(query),
+        table=model._meta.db_table,
+        limit=limit,
+    )
+
+    cursor = connection.cursor()
+    cursor.execute(query, params + [after_id])
+    return cursor.fetchone()[0]
@@ -1,5 +1,5 @@
 import threading
-from typing import Callable
+from typing import Callable, Hashable
 
 from celery.signals import task_failure, task_success
 from django.core.signals import request_finished
@@ -18,23 +18,31 @@ def request_cache(func: Callable[..., Any]) -> Callable[..., Any]:
     """
 
     def wrapped(*args: Any, **kwargs: Any) -> Any:
-        # if no request, skip cache
-        if app.env.request is None:
-            return func(*args, **kwargs)
-
-        if not hasattr(_cache, "items"):
-            _cache.items = {}
-        cache_key = (func, repr(args), repr(kwargs))
-        if cache_key in _cache.items:
-            rv = _cache.items[cache_key]
-        else:
-            rv = func(*args, **kwargs)
-            _cache.items[cache_key] = rv
-        return rv
+        return get_or_compute((func, repr(args), repr(kwargs)), lambda: func(*args, **kwargs))
 
     return wrapped
 
 
+def get_or_compute(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """
+    Returns the value memoized under ``key`` for the current request, calling
+    ``compute`` for it on the first lookup. Outside of requests nothing is
+    memoized.
+    """
+    # if no request, skip cache
+    if app.env.request is None:
+        return compute()
+
+    if not hasattr(_cache, "items"):
+        _cache.items = {}
+    if key in _cache.items:
+        rv = _cache.items[key]
+    else:
+        rv = compute()
+        _cache.items[key] = rv
+    return rv
+
+
 def clear_cache(**kwargs: Any) -> None:
     _cache.items = {}
 
@@ -5,7 +5,7 @@ import re
 import time
 from collections import namedtuple
 from concurrent.futures import ThreadPoolExecutor
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta
 from hashlib import sha1
@@ -22,6 +22,8 @@ from sentry_sdk import Hub
 from snuba_sdk import Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
+from sentry.locks import locks
 from sentry.models import (
     Environment,
     Group,
@@ -37,7 +39,10 @@ from sentry.snuba.dataset import Dataset
 from sentry.snuba.events import Columns
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
+from sentry.utils.codecs import BytesCodec, JSONCodec, ZstdCodec
 from sentry.utils.dates import outside_retention_with_modified_start, to_timestamp
+from sentry.utils.locking import UnableToAcquireLock
+from sentry.utils.locking.lock import Lock
 
 logger = logging.getLogger(__name__)
 
@@ -747,6 +752,29 @@ def bulk_raw_query(
     return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
 
 
+# Results are stored in the query cache as compressed JSON when the
+# `snuba.query-cache.compress` option is enabled, and as JSON strings otherwise
+_cache_codec = JSONCodec() | BytesCodec() | ZstdCodec()
+
+
+def _decode_cached_result(value: Union[str, bytes]) -> Mapping[str, Any]:
+    if isinstance(value, str):
+        return json.loads(value)  # type: ignore[no-any-return]
+    return _cache_codec.decode(value)  # type: ignore[no-any-return]
+
+
+def _cache_lease_seconds() -> int:
+    """
+    How long a request that runs a query missing from the cache holds the
+    lease that makes concurrent identical requests wait for its result.
+
+    The lease outlives the slowest query, so that waiters don't give up on a
+    leader that is still running and send the same query to Snuba. It is
+    released as soon as the leader is done.
+    """
+    return settings.SENTRY_SNUBA_TIMEOUT + 5
+
+
 def _apply_cache_and_build_results(
     snuba_param_list: Sequence[SnubaQueryBody],
     referrer: Optional[str] = None,
@@ -774,16 +802,39 @@ def _apply_cache_and_build_results(
                 to_query.append((query_pos, query_params, cache_key))
             else:
                 metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
+                results.append((query_pos, _decode_cached_result(cached_result)))
+
+        # Only one request at a time runs a query that is missing from the
+        # cache. Concurrent identical requests wait for its result to be
+        # cached instead of sending the same query to Snuba.
+        leased = []
+        waiting = []
+        with ExitStack() as leases:
+            for item in to_query:
+                lease = locks.get(
+                    f"{item[2]}:lease",
+                    duration=_cache_lease_seconds(),
+                    name="snuba_query_cache",
+                )
+                try:
+                    leases.enter_context(lease.acquire())
+                except UnableToAcquireLock:
+                    waiting.append((item, lease))
+                else:
+                    leased.append(item)
+
+            if leased:
+                results.extend(_query_and_cache_results(leased, headers))
+
+        to_query = []
+        if waiting:
+            coalesced_results, to_query = _wait_for_cached_results(waiting, referrer)
+            results.extend(coalesced_results)
     else:
         to_query = [(query_pos, query_params, None) for query_pos, query_params in query_param_list]
 
     if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
-        for result, (query_pos, _, cache_key) in zip(query_results, to_query):
-            if cache_key:
-                cache.set(cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
-            results.append((query_pos, result))
+        results.extend(_query_and_cache_results(to_query, headers))
 
     # Sort so that we get the results back in the original param list order
     results.sort()
@@ -791,6 +842,78 @@ def _apply_cache_and_build_results(
     return [result[1] for result in results]
 
 
+def _query_and_cache_results(
+    to_query: Sequence[Tuple[int, SnubaQueryBody, Optional[str]]],
+    headers: Mapping[str, str],
+) -> List[Tuple[int, Mapping[str, Any]]]:
+    results = []
+    query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
+    for result, (query_pos, _, cache_key) in zip(query_results, to_query):
+        if cache_key:
+            if options.get("snuba.query-cache.compress"):
+                value = _cache_codec.encode(result)
+            else:
+                value = json.dumps(result)
+            if len(value) > settings.SENTRY_SNUBA_CACHE_MAX_RESULT_SIZE:
+                metrics.incr(
+                    "snuba.query_cache.too_large",
+                    tags={"referrer": headers.get("referer", "<unknown>")},
+                )
+            else:
+                cache.set(cache_key, value, settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
+        results.append((query_pos, result))
+    return results
+
+
+def _wait_for_cached_results(
+    waiting: Sequence[Tuple[Tuple[int, SnubaQueryBody, Optional[str]], Lock]],
+    referrer: Optional[str],
+) -> Tuple[List[Tuple[int, Mapping[str, Any]]], List[Tuple[int, SnubaQueryBody, Optional[str]]]]:
+    """
+    Polls the cache for the results of queries that another request is
+    running.
+
+    Returns the results that were found, and the queries that still have to
+    be run because the other request failed, did not cache its result or
+    did not finish before its lease expired.
+    """
+    metric_tags = {"referrer": referrer} if referrer else None
+    results = []
+    to_query = []
+    lease_seconds = _cache_lease_seconds()
+    waited = 0.0
+    delay = 0.05
+
+    while waiting:
+        time.sleep(delay)
+        waited += delay
+        delay = min(delay * 1.5, 0.5)
+
+        cache_data = cache.get_many([item[2] for item, _ in waiting])
+        expired = waited >= lease_seconds
+        still_waiting = []
+        for item, lease in waiting:
+            cached_result = cache_data.get(item[2])
+            if cached_result is not None:
+                metrics.incr("snuba.query_cache.coalesced", tags=metric_tags)
+                results.append((item[0], _decode_cached_result(cached_result)))
+            elif expired or not _is_leased(lease):
+                metrics.incr("snuba.query_cache.coalesce_failed", tags=metric_tags)
+                to_query.append(item)
+            else:
+                still_waiting.append((item, lease))
+        waiting = still_waiting
+
+    return results, to_query
+
+
+def _is_leased(lease: Lock) -> bool:
+    try:
+        return lease.locked()
+    except Exception:
+        return False
+
+
 def _bulk_snuba_query(
     snuba_param_list: Sequence[SnubaQueryBody],
     headers: Mapping[str, str],
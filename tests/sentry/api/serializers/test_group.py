@@ -352,6 +352,7 @@ class GroupSerializerTest(TestCase):
                 "syncCount": 0,
                 "totalEvents": 0,
                 "dateCreated": result["statusDetails"]["info"]["dateCreated"],
+                "eventsPerSecond": 0.0,
             },
         }
 
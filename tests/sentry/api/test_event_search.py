@@ -15,11 +15,15 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    SearchVisitor,
+    _parse_result_cache,
+    _parse_tree,
     parse_search_query,
 )
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.utils import parse_datetime_string, parse_duration, parse_numeric_value
+from sentry.testutils.skips import requires_benchmark
 from sentry.utils import json
 
 fixture_path = "fixtures/search-syntax"
@@ -631,6 +635,43 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
         # the slash should be removed in the final value
         assert search_filter.value.value == 'a"b'
 
+    def test_empty_query(self):
+        assert parse_search_query("") == []
+        assert parse_search_query("   ") == []
+
+    def test_result_cache(self):
+        _parse_result_cache.clear()
+        with self.settings(SENTRY_EVENT_SEARCH_RESULT_CACHE_SIZE=10), patch(
+            "sentry.api.event_search.SearchVisitor", wraps=SearchVisitor
+        ) as visitor:
+            expected = [
+                SearchFilter(
+                    key=SearchKey(name="user.email"), operator="=", value=SearchValue("a")
+                ),
+            ]
+            assert parse_search_query("user.email:a") == expected
+            result = parse_search_query("user.email:a")
+            assert result == expected
+            assert visitor.call_count == 1
+
+            # callers get their own list
+            result.append(None)
+            assert parse_search_query("user.email:a") == expected
+
+            # other configs and config overrides are not served from the cache
+            assert parse_search_query("user.email:a", config=SearchConfig()) == expected
+            assert (
+                parse_search_query("user.email:a", config_overrides={"allow_boolean": True})
+                == expected
+            )
+            assert visitor.call_count == 3
+
+            # results depending on the current time are not cached
+            parse_search_query("time:+7d")
+            parse_search_query("time:+7d")
+            assert visitor.call_count == 5
+        _parse_result_cache.clear()
+
 
 @pytest.mark.parametrize(
     "raw,result",
@@ -657,3 +698,28 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
 def test_search_value(raw, result):
     search_value = SearchValue(raw)
     assert search_value.value == result
+
+
+@requires_benchmark
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def test_parse_search_query_benchmark(benchmark, settings, cached):
+    queries = []
+    for file in os.listdir(abs_fixtures_path):
+        with open(os.path.join(abs_fixtures_path, file)) as fp:
+            queries.extend(case["query"] for case in json.load(fp) if not case.get("raisesError"))
+
+    settings.SENTRY_EVENT_SEARCH_RESULT_CACHE_SIZE = 10000 if cached else 0
+
+    def parse_all():
+        if not cached:
+            _parse_tree.cache_clear()
+        for query in queries:
+            try:
+                parse_search_query(query)
+            except InvalidSearchQuery:
+                pass
+
+    _parse_result_cache.clear()
+    benchmark(parse_all)
+    benchmark.extra_info["queries"] = len(queries)
+    _parse_result_cache.clear()
@@ -1,3 +1,4 @@
+import time
 from datetime import timedelta
 from unittest import TestCase as SimpleTestCase
 
@@ -11,6 +12,7 @@ from sentry.api.paginator import (
     CombinedQuerysetPaginator,
     DateTimePaginator,
     GenericOffsetPaginator,
+    KeysetPaginator,
     OffsetPaginator,
     Paginator,
     SequencePaginator,
@@ -19,7 +21,8 @@ from sentry.api.paginator import (
 from sentry.incidents.models import AlertRule
 from sentry.models import Rule, User
 from sentry.testutils import APITestCase, TestCase
-from sentry.utils.cursors import Cursor
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.cursors import Cursor, KeysetCursor
 
 
 class PaginatorTest(TestCase):
@@ -360,6 +363,101 @@ class DateTimePaginatorTest(TestCase):
         assert result7[0] == res4
 
 
+class KeysetPaginatorTest(TestCase):
+    def test_simple(self):
+        res1 = self.create_user("foo@example.com", name="a")
+        res2 = self.create_user("bar@example.com", name="b")
+        res3 = self.create_user("baz@example.com", name="b")
+        res4 = self.create_user("qux@example.com", name="c")
+
+        paginator = KeysetPaginator(User.objects.all(), "name")
+        result1 = paginator.get_result(limit=2, cursor=None)
+        assert list(result1) == [res1, res2]
+        assert result1.next
+        assert not result1.prev
+
+        # rows with the same name are paged through by id
+        result2 = paginator.get_result(limit=2, cursor=result1.next)
+        assert list(result2) == [res3, res4]
+        assert not result2.next
+        assert result2.prev
+
+        result3 = paginator.get_result(limit=2, cursor=result2.prev)
+        assert list(result3) == [res1, res2]
+        assert result3.next
+        assert not result3.prev
+
+        # cursors survive being passed around as strings
+        cursor = KeysetCursor.from_string(str(result3.next))
+        assert list(paginator.get_result(limit=2, cursor=cursor)) == [res3, res4]
+
+    def test_descending(self):
+        joined = timezone.now()
+        res1 = self.create_user("foo@example.com", date_joined=joined)
+        res2 = self.create_user("bar@example.com", date_joined=joined)
+        res3 = self.create_user("baz@example.com", date_joined=joined - timedelta(seconds=1))
+
+        paginator = KeysetPaginator(User.objects.all(), ["-date_joined"])
+        result1 = paginator.get_result(limit=1)
+        assert list(result1) == [res2]
+
+        cursor = KeysetCursor.from_string(str(result1.next))
+        result2 = paginator.get_result(limit=1, cursor=cursor)
+        assert list(result2) == [res1]
+        result3 = paginator.get_result(limit=1, cursor=result2.next)
+        assert list(result3) == [res3]
+        assert not result3.next
+
+        result4 = paginator.get_result(limit=1, cursor=result3.prev)
+        assert list(result4) == [res1]
+        assert result4.prev
+
+    def test_offset_cursor(self):
+        users = [self.create_user(f"{i}@example.com", name="a") for i in range(3)]
+
+        paginator = KeysetPaginator(User.objects.all(), "name")
+        result = paginator.get_result(limit=1, cursor=KeysetCursor(1, 1, False))
+        assert list(result) == [users[1]]
+        assert result.next
+        assert result.prev
+
+        assert list(paginator.get_result(limit=1, cursor=result.next)) == [users[2]]
+
+        with pytest.raises(BadPaginationError):
+            paginator.get_result(cursor=KeysetCursor(1, -1, False))
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(User.objects.all(), "name")
+        with pytest.raises(BadPaginationError):
+            paginator.get_result(cursor=KeysetCursor(["a"], 0, False))
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("paginator_cls", [OffsetPaginator, KeysetPaginator])
+def test_deep_page_benchmark(benchmark, paginator_cls):
+    User.objects.bulk_create(
+        User(username=f"user-{i}", email=f"user-{i}@example.com", name=f"user {i % 100}")
+        for i in range(20000)
+    )
+    paginator = paginator_cls(User.objects.all(), ["name", "id"])
+
+    def page_through():
+        # Latency of every 20th page, offset queries get slower with depth
+        latencies = []
+        cursor = None
+        for page in range(200):
+            start = time.perf_counter()
+            result = paginator.get_result(limit=100, cursor=cursor)
+            if page % 20 == 0:
+                latencies.append(time.perf_counter() - start)
+            cursor = result.next
+        return latencies
+
+    latencies = benchmark.pedantic(page_through, rounds=1, iterations=1)
+    benchmark.extra_info["page_latencies"] = latencies
+
+
 def test_reverse_bisect_left():
     assert reverse_bisect_left([], 0) == 0
 
@@ -69,3 +69,38 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    def test_process_batch_groups(self):
+        group = Group.objects.create(project=Project(id=1))
+        other = Group.objects.create(project=Project(id=1), times_seen=3)
+        the_date = timezone.now() + timedelta(days=5)
+        self.buf.process_batch(
+            Group,
+            [
+                ({"times_seen": 2}, {"id": group.id}, {"last_seen": the_date}, None),
+                ({"times_seen": 5}, {"pk": other.id}, None, None),
+            ],
+        )
+        group_ = Group.objects.get(id=group.id)
+        assert group_.times_seen == group.times_seen + 2
+        assert group_.last_seen == the_date
+        other_ = Group.objects.get(id=other.id)
+        assert other_.times_seen == 8
+        assert other_.last_seen == other.last_seen
+
+    def test_process_batch_merges_filters_of_same_group(self):
+        group = Group.objects.create(project=Project(id=1), times_seen=3)
+        self.buf.process_batch(
+            Group,
+            [
+                ({"times_seen": 2}, {"id": group.id}, None, None),
+                ({"times_seen": 5}, {"pk": group.id}, None, None),
+            ],
+        )
+        assert Group.objects.get(id=group.id).times_seen == 10
+
+    def test_process_batch_falls_back_to_process(self):
+        columns = {"new_groups": 1}
+        filters = {"project_id": self.project.id, "release_id": self.release.id}
+        self.buf.process_batch(ReleaseProject, [(columns, filters, None, None)])
+        assert ReleaseProject.objects.filter(new_groups=1, **filters).exists()
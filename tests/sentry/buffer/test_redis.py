@@ -195,6 +195,53 @@ class RedisBufferTest(TestCase):
         # Make sure we didn't queue up more
         assert len(process_pending.apply_async.mock_calls) == 2
 
+    @freeze_time()
+    @mock.patch("sentry.buffer.redis.process_incr")
+    def test_process_pending_batch_mode(self, process_incr):
+        self.buf.flush_mode = "batch"
+        other = self.create_group(project=self.project)
+        orig_times_seen = Group.objects.get_from_cache(id=self.group.id).times_seen
+        now = timezone.now()
+        self.buf.incr(Group, {"times_seen": 2}, {"pk": self.group.id}, {"last_seen": now})
+        self.buf.incr(Group, {"times_seen": 3}, {"pk": self.group.id}, {"last_seen": now})
+        self.buf.incr(Group, {"times_seen": 1}, {"pk": other.id})
+        with mock.patch("sentry.buffer", self.buf):
+            self.buf.process_pending()
+
+        assert process_incr.apply_async.mock_calls == []
+        client = self.buf.cluster.get_routing_client()
+        assert client.zrange("b:p", 0, -1) == []
+        assert client.keys("b:k:*") == []
+
+        group = Group.objects.get_from_cache(id=self.group.id)
+        assert group.times_seen == orig_times_seen + 5
+        assert group.last_seen == now
+        assert Group.objects.get(id=other.id).times_seen == other.times_seen + 1
+
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    def test_process_pending_batch_mode_skips_flushed_keys(self, process_batch):
+        self.buf.flush_mode = "batch"
+        client = self.buf.cluster.get_routing_client()
+        client.hmset(
+            "foo",
+            {"f": '{"pk": ["i","1"]}', "i+times_seen": "2", "m": "sentry.models.Group"},
+        )
+        client.hmset(
+            "bar",
+            {"f": '{"pk": ["i","2"]}', "i+times_seen": "1", "m": "sentry.models.Group"},
+        )
+        with self.buf.cluster.map() as conn:
+            conn.zadd("b:p", {"foo": 1, "bar": 2, "baz": 3})
+        self.buf.process_pending()
+
+        process_batch.assert_called_once()
+        model, batch = process_batch.call_args[0]
+        assert model is Group
+        assert sorted(batch, key=lambda item: item[1]["pk"]) == [
+            ({"times_seen": 2}, {"pk": 1}, {}, None),
+            ({"times_seen": 1}, {"pk": 2}, {}, None),
+        ]
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.base.Buffer.process")
     def test_process_uses_signal_only(self, process):
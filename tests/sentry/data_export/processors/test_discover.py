@@ -60,3 +60,27 @@ class DiscoverProcessorTest(TestCase, SnubaTestCase):
         assert new_result_list[0] != result_list
         assert new_result_list[0]["count(id) / fake(field)"] == 5
         assert new_result_list[0]["count(id) / 2"] == 8
+
+    def test_get_keyset_sort(self):
+        assert DiscoverProcessor.get_keyset_sort(["title"], [], None) == "-timestamp"
+        assert DiscoverProcessor.get_keyset_sort(["title"], [], "timestamp") == "timestamp"
+        assert DiscoverProcessor.get_keyset_sort(["title"], [], "title") is None
+        assert DiscoverProcessor.get_keyset_sort(["count(id)"], [], None) is None
+        assert DiscoverProcessor.get_keyset_sort(["title"], ["count(id) / 2"], None) is None
+
+    def test_get_next_cursor(self):
+        self.discover_query["field"] = ["title"]
+        processor = DiscoverProcessor(
+            organization_id=self.org.id, discover_query=self.discover_query
+        )
+        rows = [
+            {"timestamp": "2020-01-01T00:00:02+00:00"},
+            {"timestamp": "2020-01-01T00:00:01+00:00"},
+            {"timestamp": "2020-01-01T00:00:01+00:00"},
+        ]
+        assert processor.get_next_cursor(rows, None) == [1577836801, 2]
+        assert processor.get_next_cursor(rows[1:], [1577836801, 2]) == [1577836801, 4]
+        assert processor.get_next_cursor(rows[:1], [1577836801, 2]) == [1577836802, 1]
+        assert processor.get_next_cursor([], [1577836801, 2]) == [1577836801, 2]
+        # rows without timestamps continue from the offset
+        assert processor.get_next_cursor([{"count": 3}], [1577836801, 2]) is None
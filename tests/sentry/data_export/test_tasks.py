@@ -1,3 +1,4 @@
+import gzip
 from unittest.mock import patch
 
 from django.db import IntegrityError
@@ -361,6 +362,61 @@ class AssembleDownloadTest(TestCase, SnubaTestCase):
 
         assert emailer.called
 
+    @patch("sentry.data_export.tasks.MAX_FRAGMENTS_PER_BATCH", 1)
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_keyset_pagination(self, emailer):
+        timestamp = iso_format(before_now(minutes=4))
+        for value in ["baz1", "baz2"]:
+            self.store_event(
+                data={"tags": {"foo": value}, "timestamp": timestamp},
+                project_id=self.project.id,
+            )
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["foo"], "query": ""},
+        )
+        with self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        assert de.date_finished is not None
+        file = de._get_file()
+        # every row is exported once, even those sharing a timestamp across tasks
+        with file.getfile() as f:
+            header, *rows = f.read().strip().split(b"\r\n")
+        assert header == b"foo"
+        assert rows[:3] == [b"bar2", b"bar2", b"bar"]
+        assert sorted(rows[3:]) == [b"baz1", b"baz2"]
+
+        assert emailer.called
+
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_export_compressed(self, emailer):
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["title"], "query": ""},
+        )
+        with self.tasks():
+            assemble_download(de.id, batch_size=1, compress=True)
+        de = ExportedData.objects.get(id=de.id)
+        assert de.date_finished is not None
+        file = de._get_file()
+        assert file.name == f"{de.file_name}.gz"
+        assert file.headers == {"Content-Type": "application/gzip"}
+        # every batch is a separate gzip member of the file
+        with file.getfile() as f:
+            header, raw1, raw2, raw3 = gzip.decompress(f.read()).strip().split(b"\r\n")
+        assert header == b"title"
+
+        assert raw1.startswith(b"<unlabeled event>")
+        assert raw2.startswith(b"<unlabeled event>")
+        assert raw3.startswith(b"<unlabeled event>")
+
+        assert emailer.called
+
     @patch("sentry.data_export.models.ExportedData.email_success")
     def test_discover_export_too_many_rows(self, emailer):
         de = ExportedData.objects.create(
@@ -0,0 +1,152 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from sentry import deletions
+from sentry.deletions.base import BaseDeletionTask, BulkModelDeletionTask, ModelRelation
+from sentry.models import (
+    Group,
+    GroupHash,
+    GroupSeen,
+    Project,
+    ProjectCodeOwners,
+    RepositoryProjectPathConfig,
+)
+from sentry.testutils import TestCase, TransactionTestCase
+from sentry.testutils.silo import region_silo_test
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.cache import cache
+from sentry.utils.query import bulk_delete_objects, bulk_delete_objects_after
+
+
+class DeletionTaskManagerPlanTest(TestCase):
+    def test_plan(self):
+        relations = [
+            ModelRelation(GroupHash, {"project_id": 1}, BulkModelDeletionTask),
+            ModelRelation(GroupSeen, {"project_id": 1}, BulkModelDeletionTask),
+            ModelRelation(ProjectCodeOwners, {"project_id": 1}, BulkModelDeletionTask),
+            # referenced by ProjectCodeOwners
+            ModelRelation(RepositoryProjectPathConfig, {"project_id": 1}, BulkModelDeletionTask),
+            # not a bulk deletion
+            ModelRelation(Group, {"project_id": 1}),
+            ModelRelation(GroupHash, {"project_id": 1}),
+            # the same model again
+            ModelRelation(GroupHash, {"project_id": 1}, BulkModelDeletionTask),
+        ]
+        plan = deletions.default_manager.plan(relations)
+        assert [[relation.params["model"] for relation in group] for group in plan] == [
+            [GroupHash, GroupSeen, ProjectCodeOwners],
+            [RepositoryProjectPathConfig],
+            [Group],
+            [GroupHash],
+            [GroupHash],
+        ]
+
+
+@region_silo_test
+class BulkModelDeletionTaskTest(TestCase):
+    def create_hashes(self, count):
+        return [
+            GroupHash.objects.create(project=self.project, hash=uuid4().hex) for _ in range(count)
+        ]
+
+    def get_task(self):
+        return deletions.get(
+            model=GroupHash,
+            query={"project_id": self.project.id},
+            task=BulkModelDeletionTask,
+            transaction_id="abc",
+            chunk_size=2,
+        )
+
+    def test_resumes_from_progress(self):
+        hashes = self.create_hashes(5)
+
+        task = self.get_task()
+        assert task.chunk()
+        assert task.get_last_id() == hashes[1].id
+        assert GroupHash.objects.filter(project=self.project).count() == 3
+
+        # another task of the same deletion continues after the deleted rows
+        task = self.get_task()
+        assert task.get_last_id() == hashes[1].id
+        while task.chunk():
+            pass
+        assert not GroupHash.objects.filter(project=self.project).exists()
+        assert cache.get(task.get_progress_key()) is None
+
+    def test_final_pass(self):
+        hashes = self.create_hashes(3)
+
+        task = self.get_task()
+        # progress past rows that still match the query
+        task.set_last_id(hashes[-1].id)
+        assert task.chunk()
+        assert task.get_last_id() == 0
+        while task.chunk():
+            pass
+        assert not GroupHash.objects.filter(project=self.project).exists()
+
+    @patch("sentry.deletions.base.time.sleep")
+    @patch("sentry.deletions.base.get_replication_lag", side_effect=[30, 0])
+    def test_replication_lag_throttle(self, get_replication_lag, sleep):
+        self.create_hashes(1)
+
+        task = self.get_task()
+        with self.options({"deletions.max-replication-lag": 10}):
+            assert task.chunk()
+        assert get_replication_lag.call_count == 2
+        sleep.assert_called_once_with(5)
+
+
+@region_silo_test
+class DeleteChildrenTest(TransactionTestCase):
+    def test_concurrent(self):
+        project = self.create_project()
+        group = self.create_group(project=project)
+        GroupHash.objects.create(project=project, group=group, hash="a" * 32)
+        GroupSeen.objects.create(project=project, group=group, user=self.user)
+
+        relations = [
+            ModelRelation(GroupHash, {"project_id": project.id}, BulkModelDeletionTask),
+            ModelRelation(GroupSeen, {"project_id": project.id}, BulkModelDeletionTask),
+        ]
+        task = deletions.get(model=Project, query={"id": project.id})
+        with patch.object(
+            BaseDeletionTask,
+            "_delete_relation_in_thread",
+            autospec=True,
+            side_effect=BaseDeletionTask._delete_relation_in_thread,
+        ) as delete_relation_in_thread, self.options({"deletions.relation-concurrency": 4}):
+            task.delete_children(relations)
+
+        assert delete_relation_in_thread.call_count == 2
+        assert not GroupHash.objects.filter(project=project).exists()
+        assert not GroupSeen.objects.filter(project=project).exists()
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("keyset", [False, True])
+def test_bulk_delete_benchmark(benchmark, default_project, keyset):
+    # a synthetic project with a million rows in one of its relations
+    def setup():
+        GroupHash.objects.bulk_create(
+            [GroupHash(project=default_project, hash=uuid4().hex) for _ in range(1000000)],
+            batch_size=10000,
+        )
+
+    def delete():
+        if keyset:
+            last_id = 0
+            while last_id is not None:
+                last_id = bulk_delete_objects_after(
+                    GroupHash, after_id=last_id, project_id=default_project.id
+                )
+        else:
+            while bulk_delete_objects(GroupHash, project_id=default_project.id):
+                pass
+
+    benchmark.pedantic(delete, setup=setup, rounds=1, iterations=1)
+    assert not GroupHash.objects.filter(project=default_project).exists()
@@ -0,0 +1,112 @@
+import time
+import tracemalloc
+import uuid
+from unittest import mock
+
+import pytest
+
+from sentry.digests import Record
+from sentry.digests.codecs import CompressedPickleCodec, NotificationReferenceCodec
+from sentry.digests.notifications import Notification, fetch_state
+from sentry.eventstore.models import Event
+from sentry.nodestore.base import NodeStorage
+from sentry.testutils import TestCase
+from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.samples import load_data
+
+
+class NotificationReferenceCodecTestCase(TestCase):
+    codec = NotificationReferenceCodec()
+
+    def store_notification(self, rule):
+        event = self.store_event(
+            data={"message": "hello", "timestamp": iso_format(before_now(minutes=1))},
+            project_id=self.project.id,
+        )
+        return Notification(event, [rule.id])
+
+    def test_roundtrip(self):
+        rule = self.create_project_rule(project=self.project)
+        notification = self.store_notification(rule)
+        event = notification.event
+
+        with self.options({"digests.write-event-references": True}):
+            value = self.codec.encode(notification)
+        assert value.startswith(NotificationReferenceCodec.MAGIC)
+
+        notification = self.codec.decode(value)
+        assert notification.rules == [rule.id]
+        decoded = notification.event
+        assert decoded.event_id == event.event_id
+        assert decoded.project_id == event.project_id
+        assert decoded.group_id == event.group_id
+        assert decoded.datetime == event.datetime
+        # the payload is loaded from nodestore when accessed
+        assert decoded.data["logentry"] == event.data["logentry"]
+
+    def test_fallback(self):
+        assert self.codec.decode(self.codec.encode("value")) == "value"
+
+        # records written with the previous default codec can still be read
+        legacy = CompressedPickleCodec().encode(("event", [1]))
+        assert self.codec.decode(legacy) == ("event", [1])
+
+    def test_references_disabled(self):
+        rule = self.create_project_rule(project=self.project)
+        value = self.codec.encode(self.store_notification(rule))
+        assert not value.startswith(NotificationReferenceCodec.MAGIC)
+        assert self.codec.decode(value).event.data["logentry"]
+
+    def test_fetch_state_binds_payloads(self):
+        rule = self.create_project_rule(project=self.project)
+        records = []
+        with self.options({"digests.write-event-references": True}):
+            for _ in range(3):
+                notification = self.codec.decode(self.codec.encode(self.store_notification(rule)))
+                records.append(
+                    Record(
+                        notification.event.event_id,
+                        notification,
+                        notification.event.datetime.timestamp(),
+                    )
+                )
+
+        with mock.patch.object(
+            NodeStorage, "get_multi", autospec=True, side_effect=NodeStorage.get_multi
+        ) as get_multi, mock.patch.object(NodeStorage, "get", autospec=True) as get:
+            fetch_state(self.project, records)
+            for record in records:
+                assert record.value.event.data["logentry"]
+        assert get_multi.call_count == 1
+        assert not get.called
+
+
+def make_timeline(size):
+    data = load_data("python")
+    data["timestamp"] = time.time()
+    return [
+        Notification(Event(1, uuid.uuid4().hex, i % 100 + 1, data=dict(data)), [1, 2])
+        for i in range(size)
+    ]
+
+
+@requires_benchmark
+@pytest.mark.parametrize("codec", [CompressedPickleCodec(), NotificationReferenceCodec()])
+def test_decode_timeline_benchmark(benchmark, codec):
+    with override_options({"digests.write-event-references": True}):
+        values = [codec.encode(notification) for notification in make_timeline(50000)]
+
+    def decode():
+        tracemalloc.start()
+        try:
+            records = [codec.decode(value) for value in values]
+            benchmark.extra_info["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return records
+
+    records = benchmark.pedantic(decode, rounds=1, iterations=1)
+    benchmark.extra_info["encoded_size"] = sum(len(value) for value in values)
+    assert len(records) == len(values)
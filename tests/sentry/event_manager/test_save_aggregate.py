@@ -1,11 +1,13 @@
 import contextlib
 import time
+import uuid
 from threading import Thread
 
 import pytest
 
-from sentry.event_manager import _save_aggregate
+from sentry.event_manager import _save_aggregate, _save_aggregate_many
 from sentry.eventstore.models import CalculatedHashes, Event
+from sentry.models import GroupHash
 
 
 @pytest.mark.django_db(transaction=True)
@@ -87,3 +89,43 @@ def test_group_creation_race(monkeypatch, default_project, is_race_free):
         # assert many groups are new
         assert 1 < len({rv.group.id for rv in return_values}) <= CONCURRENCY
         assert 1 < sum(rv.is_new for rv in return_values) <= CONCURRENCY
+
+
+def _make_job(project, hashes):
+    event = Event(project.id, uuid.uuid4().hex, data={"timestamp": time.time(), "type": "error"})
+    return {
+        "project_id": project.id,
+        "event": event,
+        "hashes": CalculatedHashes(hashes=hashes, hierarchical_hashes=[], tree_labels=[]),
+        "release": None,
+        "event_metadata": {},
+        "received_timestamp": time.time(),
+        "platform": "python",
+        "logger_name": "",
+        "level": "error",
+        "culprit": "",
+    }
+
+
+@pytest.mark.django_db
+def test_save_aggregate_many(default_project):
+    GroupHash.objects.create(project=default_project, hash="d" * 32, group_tombstone_id=1)
+
+    jobs = [
+        _make_job(default_project, ["a" * 32]),
+        _make_job(default_project, ["a" * 32, "b" * 32]),
+        _make_job(default_project, ["c" * 32]),
+        _make_job(default_project, ["d" * 32]),
+    ]
+    _save_aggregate_many(jobs, {default_project.id: default_project})
+
+    first, second, third = (job["groups"][0] for job in jobs[:3])
+    assert [first.is_new, second.is_new, third.is_new] == [True, False, True]
+    assert first.group.id == second.group.id != third.group.id
+    assert {gh.hash for gh in GroupHash.objects.filter(group=first.group)} == {
+        "a" * 32,
+        "b" * 32,
+    }
+
+    assert jobs[3]["groups"] == []
+    assert jobs[3]["discarded"].tombstone_id == 1
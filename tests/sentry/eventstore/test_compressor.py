@@ -1,6 +1,6 @@
 import copy
 
-from sentry.eventstore.compressor import assemble, deduplicate
+from sentry.eventstore.compressor import assemble, deduplicate, get_checksums
 
 
 def _assert_roundtrip(data, assert_extra_keys=None):
@@ -52,3 +52,32 @@ def test_basic():
             }
         },
     )
+
+
+def test_modules():
+    _assert_roundtrip({"modules": None})
+    _assert_roundtrip({"modules": {"django": "2.2.28", "sentry-sdk": "1.11.0"}})
+
+    new_data, extra_keys = deduplicate({"modules": {"django": "2.2.28"}, "message": "foo"})
+    assert new_data == {
+        "message": "foo",
+        "__nodestore_patchsets": [["modules", get_checksums(new_data)[0], None]],
+    }
+    assert list(extra_keys.values()) == [{"django": "2.2.28"}]
+
+
+def test_missing_extra_keys():
+    data = {
+        "debug_meta": {"images": [{"image_addr": "0xdeadbeef", "debug_id": "1234abcdef"}]},
+        "modules": {"django": "2.2.28"},
+    }
+    new_data, _ = deduplicate(copy.deepcopy(data))
+
+    assert assemble(new_data, lambda checksums: {}) == {
+        "debug_meta": {"images": [{"image_addr": "0xdeadbeef"}]},
+    }
+
+
+def test_empty_values_are_not_deduplicated():
+    data = {"modules": None, "debug_meta": {}}
+    assert deduplicate(copy.deepcopy(data)) == (data, {})
@@ -1,12 +1,16 @@
 from typing import Any, Mapping, Optional, Union
 from unittest import mock
 
+from celery.signals import task_success
 from django.conf import settings
+from django.core.signals import request_finished
 
 from sentry import features
+from sentry.app import env
 from sentry.features import Feature
 from sentry.models import User
 from sentry.testutils import TestCase
+from sentry.utils import request_cache
 
 
 class MockBatchHandler(features.BatchFeatureHandler):
@@ -239,3 +243,66 @@ class FeatureManagerTest(TestCase):
             NotImplementedError, "User flags not allowed with entity_feature=True"
         ):
             manager.add("users:feature-2", features.UserFeature, True)
+
+    def test_request_cache(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:entity-feature", features.OrganizationFeature, True)
+        manager.add("organizations:other-entity-feature", features.OrganizationFeature, True)
+        manager.add("organizations:feature", features.OrganizationFeature)
+        manager.add("projects:entity-feature", features.ProjectFeature, True)
+
+        entity_handler = mock.Mock()
+        entity_handler.has.return_value = True
+        entity_handler.batch_has.return_value = {
+            f"organization:{self.organization.id}": {"organizations:entity-feature": True}
+        }
+        manager.add_entity_handler(entity_handler)
+
+        # outside of requests nothing is cached
+        assert manager.has("organizations:entity-feature", self.organization, actor=self.user)
+        assert manager.has("organizations:entity-feature", self.organization, actor=self.user)
+        assert entity_handler.has.call_count == 2
+
+        entity_handler.reset_mock()
+        self.addCleanup(request_cache.clear_cache)
+        with mock.patch.object(env, "request", mock.Mock()):
+            # only the requested feature is evaluated
+            assert manager.has("organizations:entity-feature", self.organization, actor=self.user)
+            assert manager.has("organizations:entity-feature", self.organization, actor=self.user)
+            assert entity_handler.has.call_count == 1
+            assert entity_handler.batch_has.call_count == 0
+            assert manager.has(
+                "organizations:other-entity-feature", self.organization, actor=self.user
+            )
+            assert manager.has("projects:entity-feature", self.project, actor=self.user)
+            assert entity_handler.has.call_count == 3
+
+            manager.batch_has(
+                ["organizations:entity-feature"], self.user, organization=self.organization
+            )
+            manager.batch_has(
+                ["organizations:entity-feature"], self.user, organization=self.organization
+            )
+            assert entity_handler.batch_has.call_count == 1
+
+            # the cache is emptied when the request finishes
+            request_finished.send(sender=self.__class__)
+            assert manager.has("organizations:entity-feature", self.organization, actor=self.user)
+            assert entity_handler.has.call_count == 4
+
+            # when a task finishes
+            task_success.send(sender=self.__class__)
+            assert manager.has("organizations:entity-feature", self.organization, actor=self.user)
+            assert entity_handler.has.call_count == 5
+
+            # and when an organization or project is saved
+            self.organization.update(flags=self.organization.flags)
+            assert manager.has("organizations:entity-feature", self.organization, actor=self.user)
+            assert entity_handler.has.call_count == 6
+            self.project.save()
+            assert manager.has("organizations:entity-feature", self.organization, actor=self.user)
+            manager.batch_has(
+                ["organizations:entity-feature"], self.user, organization=self.organization
+            )
+            assert entity_handler.has.call_count == 7
+            assert entity_handler.batch_has.call_count == 2
@@ -1,22 +1,17 @@
+import copy
+
 import pytest
 
 from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.enhancer import Enhancements, create_match_frame
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_benchmark
 from tests.sentry.grouping import grouping_input as grouping_inputs
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
 
-def benchmark_available():
-    try:
-        import pytest_benchmark  # NOQA
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_benchmark
 @pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
@@ -37,3 +32,41 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+def _iter_frames(data):
+    for key in ("exception", "threads"):
+        for value in (data.get(key) or {}).get("values") or ():
+            frames = ((value or {}).get("stacktrace") or {}).get("frames")
+            if frames:
+                yield frames, value if key == "exception" else None
+
+
+@requires_benchmark
+@pytest.mark.parametrize("mode", ["rules", "index"])
+def test_benchmark_enhancements(mode, benchmark):
+    enhancements = Enhancements.loads(CONFIGS[max(CONFIGS)]["enhancements"])
+    stacktraces = [
+        (copy.deepcopy(frames), grouping_input.data.get("platform"), exception_data)
+        for grouping_input in grouping_inputs
+        for frames, exception_data in _iter_frames(grouping_input.data)
+    ]
+
+    def run_rules():
+        # Evaluates every rule against every frame, as before the matcher index
+        modifier_rules = [rule for rule in enhancements.iter_rules() if rule.is_modifier]
+        for frames, platform, exception_data in stacktraces:
+            cache = {}
+            match_frames = [create_match_frame(frame, platform) for frame in frames]
+            for rule in modifier_rules:
+                for idx, action in rule.get_matching_frame_actions(
+                    match_frames, platform, exception_data, cache
+                ):
+                    action.apply_modifications_to_frame(frames, match_frames, idx, rule=rule)
+
+    def run_index():
+        for frames, platform, exception_data in stacktraces:
+            enhancements.apply_modifications_to_frame(frames, platform, exception_data)
+
+    benchmark.extra_info["stacktraces"] = len(stacktraces)
+    benchmark({"rules": run_rules, "index": run_index}[mode])
@@ -442,3 +442,57 @@ def test_app_no_matches(frame):
     enhancements = Enhancements.from_config_string("app:no +app")
     enhancements.apply_modifications_to_frame([frame], "native", None)
     assert frame.get("in_app")
+
+
+def test_matcher_index_sees_modifications():
+    enhancements = Enhancements.from_config_string(
+        """
+        function:foo                        category=bar
+        category:bar                        +app
+        [ app:yes ] | function:baz          +app
+        error.type:Foo function:qux         +app
+        """
+    )
+    frames = [
+        {"function": "foo"},
+        {"function": "baz"},
+        {"function": "qux"},
+        {"function": "foo"},
+    ]
+
+    enhancements.apply_modifications_to_frame(frames, "native", {"type": "Foo"})
+    assert [frame.get("in_app") for frame in frames] == [True, True, True, True]
+    assert frames[0]["data"]["category"] == "bar"
+
+    # The frame masks are memoized, a different exception must still be checked
+    frames = [{"function": "qux"}]
+    enhancements.apply_modifications_to_frame(frames, "native", {"type": "Bar"})
+    assert not frames[0].get("in_app")
+
+
+def test_matcher_index_matches_rules():
+    enhancements = Enhancements.from_config_string(
+        """
+        [ function:foo ] | function:* | [ function:baz ] -group
+        function:bar | [ function:baz ] +group
+        family:native !function:ba*                      -group
+        [ error.type:Foo ] | function:bar                -group
+        """
+    )
+    frames = [
+        {"function": "main"},
+        {"function": "foo"},
+        {"function": "bar"},
+        {"function": "baz"},
+        {"function": "abort"},
+    ]
+    match_frames = [create_match_frame(frame, "native") for frame in frames]
+    exception_data = {"type": "Foo"}
+
+    index = enhancements._matcher_index
+    frame_masks = index.get_frame_masks(match_frames, "native", {})
+    for compiled_rule in index.updater_rules:
+        rule = compiled_rule[0]
+        assert index.get_matching_frame_actions(
+            compiled_rule, frame_masks, match_frames, "native", exception_data, {}
+        ) == rule.get_matching_frame_actions(match_frames, "native", exception_data, {})
@@ -1,3 +1,4 @@
+import tracemalloc
 from unittest import mock
 
 import pytest
@@ -20,6 +21,7 @@ from sentry.ingest.transaction_clusterer.tree import TreeClusterer
 from sentry.models.project import Project
 from sentry.relay.config import get_project_config
 from sentry.testutils.helpers import Feature
+from sentry.testutils.skips import requires_benchmark
 
 
 def test_multi_fanout():
@@ -239,3 +241,29 @@ def test_transaction_clusterer_generates_rules(default_project):
                 "redaction": {"method": "replace", "substitution": "*"},
             },
         ]
+
+
+@requires_benchmark
+def test_clusterer_benchmark(benchmark):
+    transaction_names = [
+        f"/api/0/organizations/org-{i % 5000}/projects/project-{i}/{segment}/"
+        for i in range(100000)
+        for segment in ("issues", "releases")
+    ]
+
+    def run():
+        tracemalloc.start()
+        try:
+            clusterer = TreeClusterer(merge_threshold=100)
+            clusterer.add_input(transaction_names)
+            rules = clusterer.get_rules()
+            benchmark.extra_info["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return rules
+
+    rules = benchmark.pedantic(run, rounds=1, iterations=1)
+    assert rules == [
+        "/api/0/organizations/*/projects/*/**",
+        "/api/0/organizations/*/**",
+    ]
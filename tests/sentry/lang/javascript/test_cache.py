@@ -1,6 +1,7 @@
 from unittest import TestCase
+from unittest.mock import patch
 
-from sentry.lang.javascript.cache import SourceCache
+from sentry.lang.javascript.cache import MemoizedSourceMapView, SharedSourceMapCache, SourceCache
 
 
 class BasicCacheTest(TestCase):
@@ -34,3 +35,65 @@ class BasicCacheTest(TestCase):
         # fall back to utf-8
         cache.add(url, "foobar".encode("utf-32"), encoding="utf-32")
         assert cache.get(url)[0] == "foobar"
+
+
+class FakeSourceMapView:
+    def __init__(self):
+        self.lookups = 0
+
+    def lookup(self, line, col, context_lines):
+        self.lookups += 1
+        return (line, col)
+
+
+class SharedSourceMapCacheTest(TestCase):
+    def test_lru_eviction(self):
+        cache = SharedSourceMapCache(max_size=10, ttl=60, memo_size=0)
+        cache.add("a", FakeSourceMapView(), 4)
+        cache.add("b", FakeSourceMapView(), 4)
+        assert cache.get("a") is not None
+
+        cache.add("c", FakeSourceMapView(), 4)
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+        # too large to be cached at all
+        view = FakeSourceMapView()
+        assert cache.add("d", view, 11) is view
+        assert cache.get("d") is None
+        assert len(cache) == 2
+
+    def test_expiry(self):
+        cache = SharedSourceMapCache(max_size=10, ttl=60, memo_size=0)
+        with patch("time.time", return_value=1000):
+            cache.add("a", FakeSourceMapView(), 4)
+        with patch("time.time", return_value=1059):
+            assert cache.get("a") is not None
+        with patch("time.time", return_value=1060):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_memoized_lookups(self):
+        view = FakeSourceMapView()
+        cache = SharedSourceMapCache(max_size=1000, ttl=60, memo_size=200)
+        memoized = cache.add("a", view, 4)
+        assert isinstance(memoized, MemoizedSourceMapView)
+
+        assert memoized.lookup(1, 2, 5) == (1, 2)
+        assert memoized.lookup(1, 2, 5) == (1, 2)
+        assert memoized.lookup(1, 3, 5) == (1, 3)
+        assert view.lookups == 2
+
+        # the memo is full, further lookups are not memoized
+        assert memoized.size == 200
+        assert memoized.lookup(1, 4, 5) == (1, 4)
+        assert memoized.lookup(1, 4, 5) == (1, 4)
+        assert view.lookups == 4
+
+    def test_memo_size_is_weighted(self):
+        cache = SharedSourceMapCache(max_size=10, ttl=60, memo_size=4)
+        cache.add("a", FakeSourceMapView(), 4)
+        cache.add("b", FakeSourceMapView(), 4)
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
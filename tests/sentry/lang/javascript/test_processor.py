@@ -21,6 +21,7 @@ from sentry.lang.javascript.processor import (
     cache,
     discover_sourcemap,
     fetch_file,
+    fetch_mapped_release_archive,
     fetch_release_archive_for_url,
     fetch_release_file,
     fetch_sourcemap,
@@ -30,11 +31,16 @@ from sentry.lang.javascript.processor import (
     get_max_age,
     get_release_file_cache_key,
     get_release_file_cache_key_meta,
+    shared_sourcemap_cache,
     should_retry_fetch,
     trim_line,
 )
 from sentry.models import EventError, File, Release, ReleaseFile
-from sentry.models.releasefile import ARTIFACT_INDEX_FILENAME, update_artifact_index
+from sentry.models.releasefile import (
+    ARTIFACT_INDEX_FILENAME,
+    read_artifact_index,
+    update_artifact_index,
+)
 from sentry.stacktraces.processing import ProcessableFrame, find_stacktraces_in_data
 from sentry.testutils import TestCase
 from sentry.testutils.helpers.features import with_feature
@@ -687,6 +693,52 @@ class FetchFileTest(TestCase):
         result2 = fetch_file("/example.js", release=release)
         assert result2 == result
 
+    @responses.activate
+    def test_non_url_with_mapped_release_archive(self):
+        compressed = BytesIO()
+        with zipfile.ZipFile(compressed, mode="w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr("example.js", b"foo")
+            zip_file.writestr(
+                "manifest.json",
+                json.dumps(
+                    {
+                        "files": {
+                            "example.js": {
+                                "url": "/example.js",
+                                "headers": {"content-type": "application/json"},
+                            }
+                        }
+                    }
+                ),
+            )
+
+        release = Release.objects.create(version="1", organization_id=self.project.organization_id)
+        release.add_project(self.project)
+
+        compressed.seek(0)
+        file_ = File.objects.create(name="foo", type="release.bundle")
+        file_.putfile(compressed)
+        update_artifact_index(release, None, file_)
+
+        with override_options({"releasefile.mapped-archives": True}):
+            with pytest.raises(http.BadSource):
+                fetch_file("does-not-exist.js", release=release)
+
+            result = fetch_file("/example.js", release=release)
+            assert result.url == "/example.js"
+            assert result.body == b"foo"
+            assert result.headers == {"content-type": "application/json"}
+            assert result.encoding == "utf-8"
+
+        # The archive stays mapped, later lookups skip the database
+        archive_ident = read_artifact_index(release, None)["files"]["/example.js"]["archive_ident"]
+        archive = fetch_mapped_release_archive(release, None, archive_ident)
+        with self.assertNumQueries(0):
+            assert fetch_mapped_release_archive(release, None, archive_ident) is archive
+        assert archive.read("example.js") == b"foo"
+        archive.release()
+        archive.release()
+
     def _create_archive(self, release, url):
         pseudo_archive = File.objects.create(name="", type="release.bundle")
         pseudo_archive.putfile(BytesIO(b"0123456789"))
@@ -1188,6 +1240,25 @@ class FetchSourcemapTest(TestCase):
         with pytest.raises(UnparseableSourcemap):
             fetch_sourcemap("http://example.com")
 
+    def test_shared_cache(self):
+        shared_sourcemap_cache.clear()
+        project = self.create_project()
+        release = self.create_release(project=project, version="abc")
+
+        smap_view = fetch_sourcemap(base64_sourcemap, project=project, release=release)
+        assert fetch_sourcemap(base64_sourcemap, project=project, release=release) is smap_view
+        assert smap_view.lookup(1, 1, 0).src == "/test.js"
+
+        # different minified source, different view
+        other_view = fetch_sourcemap(
+            base64_sourcemap, source=b"foo", project=project, release=release
+        )
+        assert other_view is not smap_view
+
+        # events without release do not use the shared cache
+        assert fetch_sourcemap(base64_sourcemap, project=project) is not smap_view
+        assert len(shared_sourcemap_cache) == 2
+
 
 class TrimLineTest(unittest.TestCase):
     long_line = "The public is more familiar with bad design than good design. It is, in effect, conditioned to prefer bad design, because that is what it lives with. The new becomes threatening, the old reassuring."
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from hashlib import sha1
 from io import BytesIO
 from unittest.mock import patch
 
@@ -6,7 +9,8 @@ import pytest
 from django.core.files.base import ContentFile
 from django.db import DatabaseError
 
-from sentry.models import File, FileBlob, FileBlobIndex
+from sentry.models import File, FileBlob, FileBlobIndex, FileBlobOwner
+from sentry.models.file import MULTI_BLOB_UPLOAD_CONCURRENCY, get_storage
 from sentry.testutils import TestCase
 from sentry.testutils.silo import region_silo_test
 
@@ -58,6 +62,85 @@ class FileBlobTest(TestCase):
         # blob is still around.
         assert FileBlob.objects.get(id=blob.id)
 
+    def test_from_files_concurrent_upload(self):
+        storage = get_storage()
+        lock = threading.Lock()
+        state = {"uploading": 0, "max_uploading": 0, "uploaded": 0, "max_unsaved": 0}
+
+        class SlowStorage:
+            def save(self, path, fileobj):
+                with lock:
+                    state["uploading"] += 1
+                    state["max_uploading"] = max(state["max_uploading"], state["uploading"])
+                time.sleep(0.05)
+                storage.save(path, fileobj)
+                with lock:
+                    state["uploading"] -= 1
+                    state["uploaded"] += 1
+                    state["max_unsaved"] = max(
+                        state["max_unsaved"], state["uploaded"] - mock_save.call_count
+                    )
+
+        files = [ContentFile(b"blob %d" % i) for i in range(3 * MULTI_BLOB_UPLOAD_CONCURRENCY)]
+        checksums = [sha1(fileobj.read()).hexdigest() for fileobj in files]
+        for fileobj in files:
+            fileobj.seek(0)
+
+        with patch("sentry.models.file.get_storage", return_value=SlowStorage()), patch.object(
+            FileBlob, "save", autospec=True, side_effect=FileBlob.save
+        ) as mock_save:
+            FileBlob.from_files(files, organization=self.organization)
+
+        assert 1 < state["max_uploading"] <= MULTI_BLOB_UPLOAD_CONCURRENCY
+        # uploaded blobs are saved before more uploads are started
+        assert state["max_unsaved"] <= MULTI_BLOB_UPLOAD_CONCURRENCY
+        assert FileBlob.objects.filter(checksum__in=checksums).count() == len(files)
+        assert FileBlobOwner.objects.filter(organization_id=self.organization.id).count() == len(
+            files
+        )
+
+    def test_from_files_upload_failure(self):
+        storage = get_storage()
+
+        class FailingStorage:
+            def save(self, path, fileobj):
+                fileobj.seek(0)
+                if fileobj.read() == b"broken":
+                    raise OSError("upload failed")
+                fileobj.seek(0)
+                return storage.save(path, fileobj)
+
+        with patch("sentry.models.file.get_storage", return_value=FailingStorage()):
+            with pytest.raises(OSError, match="upload failed"):
+                FileBlob.from_files([ContentFile(b"foo"), ContentFile(b"broken")])
+
+        broken_checksum = sha1(b"broken").hexdigest()
+        assert not FileBlob.objects.filter(checksum=broken_checksum).exists()
+
+        # the lock of the failed blob was released
+        blob = FileBlob.from_file(ContentFile(b"broken"))
+        assert blob.checksum == broken_checksum
+
+    def test_from_files_deduplicates(self):
+        existing = FileBlob.from_file(ContentFile(b"foo"))
+
+        with patch.object(
+            FileBlob, "generate_unique_path", side_effect=FileBlob.generate_unique_path
+        ) as mock_generate_path:
+            FileBlob.from_files(
+                [ContentFile(b"foo"), ContentFile(b"bar"), ContentFile(b"bar")],
+                organization=self.organization,
+            )
+
+        # only "bar" is uploaded, and only once
+        assert mock_generate_path.call_count == 1
+        bar = FileBlob.objects.get(checksum=sha1(b"bar").hexdigest())
+        assert set(
+            FileBlobOwner.objects.filter(organization_id=self.organization.id).values_list(
+                "blob_id", flat=True
+            )
+        ) == {existing.id, bar.id}
+
 
 class FileTest(TestCase):
     def test_delete_also_removes_blobs(self):
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from io import BytesIO
 from threading import Thread
 from time import sleep
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
 import pytest
 
@@ -14,6 +14,8 @@ from sentry.models.distribution import Distribution
 from sentry.models.file import File
 from sentry.models.releasefile import (
     ARTIFACT_INDEX_FILENAME,
+    MappedReleaseArchive,
+    ReleaseArchiveIndex,
     _ArtifactIndexGuard,
     delete_from_artifact_index,
     read_artifact_index,
@@ -116,6 +118,48 @@ class ReleaseFileCacheTest(TestCase):
             assert False, "file should not exist"
 
 
+def test_mapped_release_archive(tmpdir):
+    path = str(tmpdir.join("archive.zip"))
+    with ZipFile(path, mode="w") as zf:
+        zf.writestr("stored.js", b"foo" * 100, compress_type=ZIP_STORED)
+        zf.writestr("deflated.js", b"bar" * 100, compress_type=ZIP_DEFLATED)
+        zf.writestr("empty.js", b"", compress_type=ZIP_DEFLATED)
+
+    with MappedReleaseArchive(path) as archive:
+        assert archive.read("stored.js") == b"foo" * 100
+        assert archive.read("deflated.js") == b"bar" * 100
+        assert archive.read("empty.js") == b""
+        with pytest.raises(KeyError):
+            archive.read("missing.js")
+
+    # The index is written next to the archive and reused
+    with open(path + ".index", "rb") as f:
+        index = ReleaseArchiveIndex.loads(f.read())
+    assert set(index.entries) == {"stored.js", "deflated.js", "empty.js"}
+    assert ReleaseArchiveIndex.loads(index.dumps()).entries == index.entries
+
+    with MappedReleaseArchive(path) as archive:
+        assert archive.index.entries == index.entries
+        assert archive.read("deflated.js") == b"bar" * 100
+
+
+def test_mapped_release_archive_closed_after_last_reader(tmpdir):
+    path = str(tmpdir.join("archive.zip"))
+    with ZipFile(path, mode="w") as zf:
+        zf.writestr("stored.js", b"foo", compress_type=ZIP_STORED)
+
+    archive = MappedReleaseArchive(path)
+    assert archive.acquire()
+    archive.close()
+    # still readable by the reader that acquired it before
+    assert archive.read("stored.js") == b"foo"
+    assert not archive.acquire()
+
+    archive.release()
+    with pytest.raises(ValueError):
+        archive.read("stored.js")
+
+
 class ReleaseArchiveTestCase(TestCase):
     def create_archive(self, fields, files, dist=None):
         manifest = dict(
@@ -0,0 +1,172 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from sentry.nodestore.compression import (
+    DictionaryCompressor,
+    _header,
+    clear_caches,
+    dictionary_node_id,
+    is_compressed,
+)
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.samples import load_data
+from tests.sentry.nodestore.bigtable.test_backend import MockedBigtableNodeStorage
+
+PLATFORMS = ("python", "javascript", "cocoa", "native", "android")
+
+
+def make_events(project_id, count):
+    events = []
+    for i in range(count):
+        data = load_data(PLATFORMS[i % len(PLATFORMS)])
+        data["project"] = project_id
+        data["event_id"] = uuid.uuid4().hex
+        events.append((uuid.uuid4().hex, data))
+    return events
+
+
+@pytest.fixture(autouse=True)
+def compression_caches():
+    clear_caches()
+    yield
+    clear_caches()
+
+
+@pytest.fixture
+def ns():
+    ns = MockedBigtableNodeStorage(project="test", dictionary_compression=True)
+    ns.cache = None
+    return ns
+
+
+def test_roundtrip_without_dictionary(ns):
+    ns.set("node_1", {"project": 1, "foo": "bar"})
+    assert is_compressed(ns.store.get("node_1"))
+    assert ns.get("node_1") == {"project": 1, "foo": "bar"}
+
+
+def test_roundtrip_with_dictionary(ns):
+    events = make_events(1, 20)
+    for node_id, data in events:
+        ns.set(node_id, data)
+
+    dict_id = ns.train_compression_dictionary(1, [node_id for node_id, _ in events])
+    assert dict_id
+
+    ns.set_subkeys("node_1", {None: events[0][1], "unprocessed": {"foo": "bar"}})
+    assert ns.get("node_1") == events[0][1]
+    assert ns.get("node_1", subkey="unprocessed") == {"foo": "bar"}
+
+    # a fresh instance has to load the dictionary from the nodestore
+    other = MockedBigtableNodeStorage(project="test")
+    other.store = ns.store
+    other.cache = None
+    assert other.get_multi(["node_1", events[1][0]]) == {
+        "node_1": events[0][1],
+        events[1][0]: events[1][1],
+    }
+
+
+def test_legacy_nodes_are_readable(ns):
+    legacy = MockedBigtableNodeStorage(project="test", compression="zstd")
+    legacy.store = ns.store
+    legacy.cache = None
+    legacy.set("node_1", {"foo": "bar"})
+
+    assert not is_compressed(ns.store.get("node_1"))
+    assert ns.get("node_1") == {"foo": "bar"}
+    assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "bar"}}
+
+
+def test_expired_dictionary_is_not_used(ns):
+    events = make_events(1, 20)
+    for node_id, data in events:
+        ns.set(node_id, data)
+    ns.train_compression_dictionary(1, [node_id for node_id, _ in events])
+
+    ns.compressor.dictionary_max_age = ns.compressor.dictionary_max_age * 0
+    ns.set("node_1", events[0][1])
+    _, _, project_id, dict_id = _header.unpack_from(ns.store.get("node_1"))
+    assert (project_id, dict_id) == (1, 0)
+    assert ns.get("node_1") == events[0][1]
+
+
+def test_missing_dictionary(ns):
+    events = make_events(1, 20)
+    for node_id, data in events:
+        ns.set(node_id, data)
+    dict_id = ns.train_compression_dictionary(1, [node_id for node_id, _ in events])
+    ns.set("node_1", events[0][1])
+    ns.set("node_2", {"project": 2, "foo": "bar"})
+
+    ns.store.delete(dictionary_node_id(1, dict_id))
+    clear_caches()
+
+    # only the node of the missing dictionary is lost, not the whole batch
+    assert ns.get("node_1") is None
+    assert ns.get_multi(["node_1", "node_2"]) == {
+        "node_1": None,
+        "node_2": {"project": 2, "foo": "bar"},
+    }
+
+
+def test_needs_training(ns):
+    assert ns.compression_dictionary_needs_training(1)
+    assert ns.train_compression_dictionary(1, []) is None
+    assert ns.compression_dictionary_needs_training(1)
+
+    events = make_events(1, 20)
+    for node_id, data in events:
+        ns.set(node_id, data)
+    assert ns.train_compression_dictionary(1, [node_id for node_id, _ in events])
+    assert not ns.compression_dictionary_needs_training(1)
+    assert ns.compression_dictionary_needs_training(2)
+
+    # rotated well before the dictionary stops being used for writes
+    ns.compressor.dictionary_max_age = ns.compressor.dictionary_max_age * 0
+    assert ns.compression_dictionary_needs_training(1)
+
+    uncompressed = MockedBigtableNodeStorage(project="test")
+    assert not uncompressed.uses_compression_dictionaries()
+    assert not uncompressed.compression_dictionary_needs_training(1)
+
+
+def test_dictionary_ttl():
+    compressor = DictionaryCompressor(node_ttl=timedelta(days=30))
+    assert compressor.dictionary_ttl == timedelta(days=37)
+
+    with pytest.raises(ValueError):
+        DictionaryCompressor(node_ttl=timedelta(days=30), dictionary_ttl=timedelta(days=30))
+
+    ns = MockedBigtableNodeStorage(
+        project="test", default_ttl=timedelta(days=30), dictionary_compression=True
+    )
+    assert ns.compressor.dictionary_ttl == timedelta(days=37)
+
+
+@requires_benchmark
+@pytest.mark.parametrize("dictionary", [False, True], ids=["plain", "dictionary"])
+def test_benchmark_nodestore_compression(dictionary, benchmark):
+    ns = MockedBigtableNodeStorage(project="test", compression="zstd")
+    if dictionary:
+        ns = MockedBigtableNodeStorage(project="test", dictionary_compression=True)
+    ns.cache = None
+
+    events = make_events(1, 200)
+    for node_id, data in events:
+        ns.set(node_id, data)
+    if dictionary:
+        ns.train_compression_dictionary(1, [node_id for node_id, _ in events[:100]])
+        for node_id, data in events:
+            ns.set(node_id, data)
+
+    id_list = [node_id for node_id, _ in events[100:]]
+    rows = ns.store._get_table()._rows
+    benchmark.extra_info["stored_bytes"] = sum(
+        len(rows[node_id.encode("utf8")][ns.store.data_column][0].value) for node_id in id_list
+    )
+
+    result = benchmark(ns.get_multi, id_list)
+    assert len(result) == len(id_list)
@@ -0,0 +1,131 @@
+import copy
+import logging
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+
+from sentry.nodestore.base import shared_node_id
+from tests.sentry.nodestore.bigtable.test_backend import MockedBigtableNodeStorage
+
+EVENT = {
+    "message": "hello world",
+    "modules": {"django": "2.2.28", "sentry-sdk": "1.11.0"},
+    "debug_meta": {
+        "images": [
+            {
+                "image_addr": "0xdeadbeef",
+                "debug_file": "C:/Ding/bla.pdb",
+                "code_file": "C:/Ding/bla.exe",
+                "debug_id": "1234abcdef",
+                "code_id": "1234abcdefgggg",
+            }
+        ]
+    },
+}
+
+
+@pytest.fixture
+def ns():
+    ns = MockedBigtableNodeStorage(
+        project="test", default_ttl=timedelta(days=30), deduplicate_interfaces=True
+    )
+    ns.cache = None
+    return ns
+
+
+def test_roundtrip(ns):
+    data = copy.deepcopy(EVENT)
+    ns.set("node_1", data)
+    assert data == EVENT
+
+    subkeys = {None: data, "unprocessed": {"foo": "bar"}}
+    ns.set_subkeys("node_2", subkeys)
+    assert subkeys[None] is data
+    assert data == EVENT
+
+    stored = ns._decode(ns.store.get("node_1"), subkey=None)
+    assert "modules" not in stored
+    assert stored["debug_meta"] == {"images": [{"image_addr": "0xdeadbeef"}]}
+    assert len(stored["__nodestore_patchsets"]) == 2
+
+    assert ns.get("node_1") == EVENT
+
+
+def test_shared_nodes_written_once(ns):
+    with mock.patch.object(ns, "_set_bytes", wraps=ns._set_bytes) as set_bytes:
+        ns.set("node_1", copy.deepcopy(EVENT))
+        ns.set("node_2", copy.deepcopy(EVENT))
+
+    # two shared nodes plus the two events themselves
+    assert set_bytes.call_count == 4
+
+
+def test_shared_nodes_outlive_nodes(ns):
+    with mock.patch.object(ns, "_set_bytes", wraps=ns._set_bytes) as set_bytes:
+        ns.set("node_1", copy.deepcopy(EVENT), ttl=timedelta(days=1))
+        # shared nodes written for a day don't last long enough for this node
+        ns.set("node_2", copy.deepcopy(EVENT), ttl=timedelta(days=30))
+        ns.set("node_3", copy.deepcopy(EVENT), ttl=timedelta(days=30))
+
+    shared_ttls = [
+        call.kwargs["ttl"]
+        for call in set_bytes.call_args_list
+        if call.args[0].startswith(shared_node_id(""))
+    ]
+    refresh = timedelta(seconds=ns.deduplication_refresh_interval)
+    assert shared_ttls == [timedelta(days=1) + refresh] * 2 + [timedelta(days=30) + refresh] * 2
+
+
+def test_nodes_without_ttl_are_not_deduplicated():
+    ns = MockedBigtableNodeStorage(project="test", deduplicate_interfaces=True)
+    ns.cache = None
+    ns.set("node_1", copy.deepcopy(EVENT))
+
+    assert "__nodestore_patchsets" not in ns._decode(ns.store.get("node_1"), subkey=None)
+    assert not ns._written_shared_nodes
+    assert ns.get("node_1") == EVENT
+
+    ns.set("node_2", copy.deepcopy(EVENT), ttl=timedelta(days=1))
+    assert "__nodestore_patchsets" in ns._decode(ns.store.get("node_2"), subkey=None)
+
+
+def test_get_multi_fetches_shared_nodes_once(ns):
+    ns.set("node_1", copy.deepcopy(EVENT))
+    ns.set("node_2", copy.deepcopy(EVENT))
+    ns.set("node_3", {"message": "legacy"})
+
+    with mock.patch.object(ns, "_get_bytes_multi", wraps=ns._get_bytes_multi) as get_bytes_multi:
+        assert ns.get_multi(["node_1", "node_2", "node_3"]) == {
+            "node_1": EVENT,
+            "node_2": EVENT,
+            "node_3": {"message": "legacy"},
+        }
+
+    assert get_bytes_multi.call_count == 2
+    assert len(get_bytes_multi.call_args[0][0]) == 2
+
+
+def test_legacy_nodes(ns):
+    legacy = MockedBigtableNodeStorage(project="test")
+    legacy.store = ns.store
+    legacy.cache = None
+    legacy.set("node_1", copy.deepcopy(EVENT))
+
+    assert ns.get("node_1") == EVENT
+
+
+def test_missing_shared_node(ns, caplog):
+    ns.set("node_1", copy.deepcopy(EVENT))
+    for key in list(ns._written_shared_nodes):
+        ns.store.delete(shared_node_id(key))
+
+    with caplog.at_level(logging.WARNING, logger="sentry.nodestore.base"):
+        assert ns.get("node_1") == {
+            "message": "hello world",
+            "debug_meta": {"images": [{"image_addr": "0xdeadbeef"}]},
+        }
+
+    [record] = [r for r in caplog.records if r.msg == "nodestore.deduplicate.missing_shared_nodes"]
+    assert record.node_id == "node_1"
+    assert sorted(record.checksums) == sorted(ns._written_shared_nodes)
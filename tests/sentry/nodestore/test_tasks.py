@@ -0,0 +1,63 @@
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.utils import timezone
+
+from sentry.eventstore.models import Event
+from sentry.nodestore.tasks import (
+    MIN_SAMPLES,
+    schedule_compression_dictionary_training,
+    train_compression_dictionary,
+)
+from sentry.testutils import TestCase
+from sentry.testutils.silo import region_silo_test
+
+
+@region_silo_test
+@patch("sentry.nodestore.tasks.nodestore")
+class ScheduleCompressionDictionaryTrainingTest(TestCase):
+    @patch("sentry.nodestore.tasks.train_compression_dictionary.delay")
+    def test_schedules_active_projects(self, mock_delay, mock_nodestore):
+        now = timezone.now()
+        trained = self.create_project()
+        idle = self.create_project()
+        self.create_group(project=self.project, last_seen=now)
+        self.create_group(project=trained, last_seen=now)
+        self.create_group(project=idle, last_seen=now - timedelta(days=2))
+
+        mock_nodestore.uses_compression_dictionaries.return_value = True
+        mock_nodestore.compression_dictionary_needs_training.side_effect = (
+            lambda project_id: project_id != trained.id
+        )
+        schedule_compression_dictionary_training(1)
+
+        mock_delay.assert_called_once_with(project_id=self.project.id)
+        assert mock_nodestore.compression_dictionary_needs_training.call_count == 2
+
+    @patch("sentry.nodestore.tasks.train_compression_dictionary.delay")
+    def test_compression_disabled(self, mock_delay, mock_nodestore):
+        self.create_group(project=self.project, last_seen=timezone.now())
+
+        mock_nodestore.uses_compression_dictionaries.return_value = False
+        schedule_compression_dictionary_training()
+
+        assert not mock_nodestore.compression_dictionary_needs_training.called
+        assert not mock_delay.called
+
+    @patch("sentry.nodestore.tasks.eventstore.get_unfetched_events")
+    def test_train(self, mock_get_events, mock_nodestore):
+        events = [Mock(event_id=f"{i:032x}") for i in range(MIN_SAMPLES)]
+        mock_get_events.return_value = events
+        train_compression_dictionary(self.project.id)
+
+        mock_nodestore.train_compression_dictionary.assert_called_once_with(
+            self.project.id,
+            [Event.generate_node_id(self.project.id, event.event_id) for event in events],
+        )
+
+    @patch("sentry.nodestore.tasks.eventstore.get_unfetched_events")
+    def test_train_too_few_events(self, mock_get_events, mock_nodestore):
+        mock_get_events.return_value = [Mock(event_id="a" * 32)]
+        train_compression_dictionary(self.project.id)
+
+        assert not mock_nodestore.train_compression_dictionary.called
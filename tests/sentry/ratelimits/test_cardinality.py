@@ -1,4 +1,5 @@
 from typing import Collection, Optional, Sequence
+from unittest import mock
 
 import pytest
 
@@ -9,6 +10,8 @@ from sentry.ratelimits.cardinality import (
     RedisCardinalityLimiter,
     RedisClusterBackend,
     RequestedQuota,
+    _BloomFilter,
+    _LocalFilter,
 )
 from sentry.utils import redis
 
@@ -235,3 +238,45 @@ def test_regression_mixed_order(limiter: RedisCardinalityLimiter):
     # there used to be a bug where anything after 10 (i.e. 5) was dropped as
     # well (due to a wrong `break` somewhere in a loop)
     assert helper.add_values([0, 1, 2, 3, 4, 6, 7, 8, 9, 10, 5]) == [0, 1, 2, 3, 4, 6, 7, 8, 9, 5]
+
+
+def test_local_filter(limiter: RedisCardinalityLimiter):
+    limiter.local_filter = _LocalFilter(capacity=1000, error_rate=0.001)
+    helper = LimiterHelper(limiter)
+
+    assert helper.add_values(list(range(12))) == list(range(10))
+
+    with mock.patch.object(
+        limiter.backend, "run_check_within_quotas", wraps=limiter.backend.run_check_within_quotas
+    ) as run_check_within_quotas:
+        # known hashes are admitted without being looked up, new ones still
+        # count against the quota
+        assert helper.add_values(list(range(12))) == list(range(10))
+        unit_keys_to_get, _ = run_check_within_quotas.call_args[0]
+        assert unit_keys_to_get == [
+            "cardinality:timeseries:hello-10",
+            "cardinality:timeseries:hello-11",
+        ]
+
+    # the local filter forgets hashes once they are out of the window
+    helper.timestamp += 3600
+    assert limiter.local_filter.get_known(
+        RequestedQuota(prefix="hello", unit_hashes=[1], quota=helper.quota), helper.timestamp
+    ) == ([], [1])
+
+
+def test_bloom_filter():
+    bloom_filter = _BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom_filter.add(bloom_filter.positions(("hello", i)))
+    assert all(bloom_filter.contains(bloom_filter.positions(("hello", i))) for i in range(1000))
+
+    false_positives = sum(
+        bloom_filter.contains(bloom_filter.positions(("hello", i))) for i in range(1000, 11000)
+    )
+    assert false_positives < 300
+    assert 0 < bloom_filter.estimate_false_positive_rate() < 0.03
+
+    # additions beyond the capacity are ignored
+    bloom_filter.add(bloom_filter.positions(("hello", 11000)))
+    assert bloom_filter.count == 1000
@@ -8,6 +8,7 @@ from sentry.rules.history.preview import (
     FREQUENCY_CONDITION_GROUP_LIMIT,
     PREVIEW_TIME_RANGE,
     get_events,
+    get_frequency_buckets,
     get_top_groups,
     preview,
 )
@@ -16,7 +17,11 @@ from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import iso_format
 from sentry.testutils.silo import region_silo_test
 from sentry.types.activity import ActivityType
-from sentry.types.condition_activity import ConditionActivity, ConditionActivityType
+from sentry.types.condition_activity import (
+    FREQUENCY_CONDITION_BUCKET_SIZE,
+    ConditionActivity,
+    ConditionActivityType,
+)
 from sentry.types.issues import GroupType
 from sentry.utils.samples import load_data
 
@@ -762,6 +767,36 @@ class FrequencyConditionTest(TestCase, SnubaTestCase):
         result = preview(self.project, conditions, [], *MATCH_ARGS)
         assert group.id not in result
 
+    def test_get_frequency_buckets(self):
+        end = timezone.now()
+        start = end - PREVIEW_TIME_RANGE
+        prev_hour = end - timedelta(hours=1)
+        groups = []
+        for fingerprint, count in (("group-1", 3), ("group-2", 1)):
+            for i in range(count):
+                group = self.store_event(
+                    project_id=self.project.id,
+                    data={"timestamp": iso_format(prev_hour), "fingerprint": [fingerprint]},
+                ).group
+            groups.append(group.id)
+
+        group_buckets = get_frequency_buckets(
+            self.project,
+            start,
+            end,
+            groups + [-1],
+            {groups[0]: Dataset.Events, groups[1]: Dataset.Events, -1: None},
+            ("count", "roundedTime"),
+        )
+        assert len(group_buckets[-1]) == 0
+        for group_id, count in zip(groups, (3, 1)):
+            buckets = group_buckets[group_id]
+            assert len(buckets) == PREVIEW_TIME_RANGE // FREQUENCY_CONDITION_BUCKET_SIZE + 1
+            position = buckets.position(prev_hour)
+            assert buckets.window_counts([position], 1) == [count]
+            assert buckets.window_counts([position + 1, position - 1], 1) == [0, 0]
+            assert buckets.cumulative(len(buckets) - 1) == count
+
 
 @freeze_time()
 @region_silo_test
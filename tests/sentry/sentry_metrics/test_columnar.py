@@ -0,0 +1,162 @@
+import pickle
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
+
+from sentry.sentry_metrics.configuration import IndexerStorage, UseCaseKey, get_ingest_config
+from sentry.sentry_metrics.consumers.indexer.columnar import ColumnarMessageBatch
+from sentry.sentry_metrics.consumers.indexer.common import BatchMessages
+from sentry.sentry_metrics.consumers.indexer.processing import MessageProcessor
+from sentry.snuba.metrics.naming_layer.mri import SessionMRI
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils import json
+
+pytestmark = pytest.mark.sentry_metrics
+
+ts = int(datetime.now(tz=timezone.utc).timestamp())
+
+
+def _make_payload(i):
+    return {
+        "name": SessionMRI.SESSION.value,
+        "tags": {
+            "environment": "production",
+            "release": f"1.0.{i % 50}",
+            "session.status": "init",
+        },
+        "timestamp": ts,
+        "type": "c",
+        "value": 1.0,
+        "org_id": i % 3 + 1,
+        "project_id": 3,
+    }
+
+
+def _make_messages(count):
+    return [
+        Message(
+            BrokerValue(
+                KafkaPayload(
+                    b"key" if i % 2 else None,
+                    json.dumps(_make_payload(i)).encode("utf-8"),
+                    [("metric_type", b"c")] if i % 3 else [],
+                ),
+                Partition(Topic("topic"), i % 2),
+                i,
+                datetime(2022, 1, 1, 0, 0, i % 60, i),
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def _pickle_out_of_band(message):
+    # What the parallel transform step does with its shared memory blocks
+    buffers = []
+    data = pickle.dumps(message, protocol=5, buffer_callback=buffers.append)
+    return data, buffers
+
+
+def test_roundtrip():
+    messages = _make_messages(10)
+    batch = ColumnarMessageBatch.from_messages(messages)
+
+    assert len(batch) == 10
+    assert list(batch) == messages
+    assert batch[-1] == messages[-1]
+    assert batch[2:4] == messages[2:4]
+    assert batch.value(3) == messages[3].payload.value
+    with pytest.raises(IndexError):
+        batch[10]
+
+    assert ColumnarMessageBatch.from_messages([]) == ColumnarMessageBatch.from_messages([])
+
+
+def test_aware_timestamps():
+    message = Message(
+        BrokerValue(
+            KafkaPayload(None, b"{}", []),
+            Partition(Topic("topic"), 0),
+            0,
+            datetime(2022, 1, 1, 12, tzinfo=timezone.utc),
+        )
+    )
+    batch = ColumnarMessageBatch.from_messages([message])
+    assert batch[0].value.timestamp == datetime(2022, 1, 1, 12)
+
+
+def test_pickle():
+    messages = _make_messages(10)
+    batch = ColumnarMessageBatch.from_messages(messages)
+
+    assert list(pickle.loads(pickle.dumps(batch))) == messages
+
+    data, buffers = _pickle_out_of_band(Message(Value(batch, messages[-1].committable)))
+    # payload values are passed out-of-band in a single buffer
+    assert len(buffers) == 1
+    assert len(data) < len(buffers[0].raw())
+
+    restored = pickle.loads(data, buffers=[memoryview(buffer) for buffer in buffers])
+    assert list(restored.payload) == messages
+    assert restored.committable == messages[-1].committable
+
+
+def test_batch_messages_columnar():
+    next_step = Mock()
+    step = BatchMessages(next_step=next_step, max_batch_time=100.0, max_batch_size=2, columnar=True)
+    messages = _make_messages(2)
+    for message in messages:
+        step.submit(message)
+
+    (outer_message,), _ = next_step.submit.call_args
+    assert isinstance(outer_message.payload, ColumnarMessageBatch)
+    assert list(outer_message.payload) == messages
+    assert outer_message.committable == messages[-1].committable
+
+
+@pytest.mark.django_db
+def test_process_messages_columnar():
+    processor = MessageProcessor(get_ingest_config(UseCaseKey.RELEASE_HEALTH, IndexerStorage.MOCK))
+    messages = _make_messages(10)
+
+    expected = processor.process_messages(Message(Value(messages, messages[-1].committable)))
+    result = processor.process_messages(
+        Message(Value(ColumnarMessageBatch.from_messages(messages), messages[-1].committable))
+    )
+
+    # the strings are already indexed by the first call, so ignore the mapping metadata
+    def deconstruct(messages):
+        rv = []
+        for message in messages:
+            value = json.loads(message.payload.value)
+            del value["mapping_meta"]
+            headers = [(k, v) for k, v in message.payload.headers if k != "mapping_sources"]
+            rv.append((message.committable, message.payload.key, headers, value))
+        return rv
+
+    assert isinstance(result, ColumnarMessageBatch)
+    assert deconstruct(result) == deconstruct(expected)
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("columnar", [False, True], ids=["list", "columnar"])
+def test_benchmark_process_messages(columnar, benchmark):
+    processor = MessageProcessor(get_ingest_config(UseCaseKey.RELEASE_HEALTH, IndexerStorage.MOCK))
+    messages = _make_messages(500)
+    benchmark.extra_info["messages"] = len(messages)
+
+    def run():
+        # round trip through pickle like the parallel transform step does
+        # between the consumer and a worker process
+        payload = ColumnarMessageBatch.from_messages(messages) if columnar else messages
+        data, buffers = _pickle_out_of_band(Message(Value(payload, messages[-1].committable)))
+        outer_message = pickle.loads(data, buffers=buffers)
+        result = processor.process_messages(outer_message)
+        data, buffers = _pickle_out_of_band(Message(Value(result, messages[-1].committable)))
+        return list(pickle.loads(data, buffers=buffers).payload)
+
+    assert len(benchmark(run)) == len(messages)
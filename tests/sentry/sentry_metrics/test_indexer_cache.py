@@ -1,8 +1,12 @@
+from unittest import mock
+
 import pytest
 from django.conf import settings
 
 from sentry.sentry_metrics.configuration import UseCaseKey
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.base import FetchType
+from sentry.sentry_metrics.indexer.cache import CachingIndexer, StringIndexerCache
+from sentry.sentry_metrics.indexer.mock import RawSimpleIndexer
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import md5_text
 
@@ -71,3 +75,64 @@ def test_separate_namespacing() -> None:
     indexer_cache.set("a", 2, UseCaseKey.PERFORMANCE.value)
     assert indexer_cache.get("a", UseCaseKey.RELEASE_HEALTH.value) == 1
     assert indexer_cache.get("a", UseCaseKey.PERFORMANCE.value) == 2
+
+
+def test_local_cache(use_case_id: str) -> None:
+    cache.clear()
+    local_indexer_cache = StringIndexerCache(
+        cache_name="default", partition_key=_PARTITION_KEY, local_cache_size=2
+    )
+    local_indexer_cache.set_many({"hello": 2, "bye": 3}, use_case_id)
+
+    # served from the local tier without going to the shared cache
+    cache.clear()
+    assert local_indexer_cache.get_many(["hello", "bye", "hi"], use_case_id) == {
+        "hello": 2,
+        "bye": 3,
+        "hi": None,
+    }
+    assert local_indexer_cache.get("hello", use_case_id) == 2
+
+    # shared cache hits fill the local tier, evicting the least recently used key
+    indexer_cache.set("hi", 4, use_case_id)
+    assert local_indexer_cache.get("hi", use_case_id) == 4
+    assert len(local_indexer_cache.local) == 2
+    assert local_indexer_cache.get_many(["bye"], use_case_id) == {"bye": None}
+
+    local_indexer_cache.delete("hello", use_case_id)
+    assert local_indexer_cache.get("hello", use_case_id) is None
+
+
+def test_local_cache_expiry(use_case_id: str) -> None:
+    local_indexer_cache = StringIndexerCache(
+        cache_name="default", partition_key=_PARTITION_KEY, local_cache_size=10
+    )
+    local_indexer_cache.local.set_many({"hello": 2}, use_case_id)
+    assert local_indexer_cache.local.get_many(["hello"], use_case_id) == {"hello": 2}
+
+    with mock.patch("time.monotonic", return_value=float("inf")):
+        assert local_indexer_cache.local.get_many(["hello"], use_case_id) == {}
+    assert len(local_indexer_cache.local) == 0
+
+
+def test_caching_indexer_local_cache() -> None:
+    cache.clear()
+    use_case_id = UseCaseKey.RELEASE_HEALTH
+    local_indexer_cache = StringIndexerCache(
+        cache_name="default", partition_key=_PARTITION_KEY, local_cache_size=10
+    )
+    raw_indexer = RawSimpleIndexer()
+    indexer = CachingIndexer(local_indexer_cache, raw_indexer)
+
+    id = indexer.record(use_case_id, 1, "hello")
+    cache.clear()
+    results = indexer.bulk_record(use_case_id, {1: {"hello"}})
+    assert results[1]["hello"] == id
+    assert results.get_fetch_metadata()[1]["hello"].fetch_type == FetchType.CACHE_HIT
+
+    with mock.patch.object(
+        raw_indexer, "reverse_resolve", wraps=raw_indexer.reverse_resolve
+    ) as reverse_resolve:
+        assert indexer.reverse_resolve(use_case_id, 1, id) == "hello"
+        assert indexer.reverse_resolve(use_case_id, 1, id) == "hello"
+    assert reverse_resolve.call_count == 1
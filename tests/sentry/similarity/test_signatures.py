@@ -1,6 +1,8 @@
 from collections import Counter
 from unittest import TestCase
 
+import mmh3
+
 from sentry.similarity.signatures import MinHashSignatureBuilder
 
 
@@ -28,3 +30,21 @@ class MinHashSignatureBuilderTestCase(TestCase):
         self.assertAlmostEqual(
             similarity, estimation, delta=0.1  # totally made up constant, seems reasonable
         )
+
+    def test_build_many(self):
+        get_signature = MinHashSignatureBuilder(16, 0xFFFF)
+        feature_sets = [
+            ["foo", "bar", "baz"],
+            ["foo", "bar"],
+            "hello world",
+            ["foo"],
+        ]
+
+        assert get_signature.build_many(feature_sets) == [
+            [
+                min(mmh3.hash(feature, column) % 0xFFFF for feature in features)
+                for column in range(16)
+            ]
+            for features in feature_sets
+        ]
+        assert get_signature.build_many([]) == []
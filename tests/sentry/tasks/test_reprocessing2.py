@@ -5,7 +5,7 @@ from unittest import mock
 
 import pytest
 
-from sentry import eventstore
+from sentry import eventstore, nodestore
 from sentry.attachments import attachment_cache
 from sentry.event_manager import EventManager
 from sentry.eventstore.processing import event_processing_store
@@ -22,7 +22,12 @@ from sentry.models import (
 )
 from sentry.plugins.base.v2 import Plugin2
 from sentry.projectoptions.defaults import DEFAULT_GROUPING_CONFIG
-from sentry.reprocessing2 import is_group_finished
+from sentry.reprocessing2 import (
+    CannotReprocess,
+    is_group_finished,
+    pull_event_data,
+    pull_events_data,
+)
 from sentry.tasks.reprocessing2 import reprocess_group
 from sentry.tasks.store import preprocess_event
 from sentry.testutils.helpers import Feature
@@ -457,6 +462,41 @@ def test_nodestore_missing(
     assert logs == ["reprocessing2.unprocessed_event.not_found"]
 
 
+@pytest.mark.django_db
+@pytest.mark.snuba
+def test_pull_events_data(default_project, reset_snuba, process_and_save, monkeypatch):
+    # required such that minidump is loaded into attachments cache
+    MINIDUMP_PLACEHOLDER = {
+        "platform": "native",
+        "exception": {"values": [{"mechanism": {"type": "minidump"}, "type": "test bogus"}]},
+    }
+
+    event_ids = [
+        process_and_save({"message": "hello world", **MINIDUMP_PLACEHOLDER}, seconds_ago=i + 1)
+        for i in range(3)
+    ]
+    events = [eventstore.get_event_by_id(default_project.id, event_id) for event_id in event_ids]
+    for evt in events[:2]:
+        for type in ("event.attachment", "event.minidump"):
+            _create_event_attachment(evt, type)
+
+    get_multi = mock.Mock(wraps=nodestore.get_multi)
+    monkeypatch.setattr("sentry.reprocessing2.nodestore.get_multi", get_multi)
+    result = pull_events_data(default_project.id, events)
+    assert get_multi.call_count == 1
+
+    for event_id in event_ids[:2]:
+        expected = pull_event_data(default_project.id, event_id)
+        assert result[event_id].data == expected.data
+        assert result[event_id].attachments == expected.attachments
+        assert [ea.type for ea in result[event_id].attachments] == ["event.minidump"]
+        assert result[event_id].attachments[0].file_id in result[event_id].files
+
+    # the minidump of the last event is missing
+    assert isinstance(result[event_ids[2]], CannotReprocess)
+    assert str(result[event_ids[2]]) == "attachment.not_found"
+
+
 @pytest.mark.django_db
 @pytest.mark.snuba
 def test_apply_new_fingerprinting_rules(
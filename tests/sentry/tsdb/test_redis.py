@@ -6,7 +6,9 @@ import pytz
 from django.test import override_settings
 
 from sentry.testutils import TestCase
+from sentry.testutils.skips import requires_benchmark
 from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE, TSDBModel
+from sentry.tsdb.inmemory import InMemoryTSDB
 from sentry.tsdb.redis import CountMinScript, RedisTSDB, SuppressionWrapper
 from sentry.utils.dates import to_datetime, to_timestamp
 
@@ -188,6 +190,50 @@ class RedisTSDBTest(TestCase):
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert results == {1: 0, 2: 0}
 
+    def test_get_range_multi(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+        rollups = self.db.rollups.items()
+        inmemory = InMemoryTSDB(rollups=tuple(rollups))
+
+        for db in (self.db, inmemory):
+            for i, dt in enumerate(dts):
+                db.incr(TSDBModel.project, 1, dt, count=i + 1)
+                db.incr(TSDBModel.project, "foo", dt, count=2, environment_id=1)
+                db.incr_multi(
+                    [(TSDBModel.group, 1), (TSDBModel.group, 2)], dt, count=i, environment_id=2
+                )
+
+        queries = [
+            (TSDBModel.project, 1, None),
+            (TSDBModel.project, "foo", 1),
+            (TSDBModel.project, "foo", None),
+            (TSDBModel.group, 1, 2),
+            (TSDBModel.group, 2, None),
+            (TSDBModel.group, 3, None),
+        ]
+        results = self.db.get_range_multi(queries, dts[0], dts[-1])
+
+        assert set(results) == set(queries)
+        for model, key, environment_id in queries:
+            expected = inmemory.get_range(
+                model,
+                [key],
+                dts[0],
+                dts[-1],
+                environment_ids=[environment_id] if environment_id is not None else None,
+            )[key]
+            assert results[(model, key, environment_id)] == expected
+
+        assert self.db.get_sums_multi(queries, dts[0], dts[-1]) == {
+            (TSDBModel.project, 1, None): 10,
+            (TSDBModel.project, "foo", 1): 8,
+            (TSDBModel.project, "foo", None): 8,
+            (TSDBModel.group, 1, 2): 6,
+            (TSDBModel.group, 2, None): 6,
+            (TSDBModel.group, 3, None): 0,
+        }
+
     def test_count_distinct(self):
         now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -820,3 +866,31 @@ class RedisTSDBTest(TestCase):
             [b"eta", b"7"],
             [b"bar", b"7"],
         ]
+
+
+@requires_benchmark
+@pytest.mark.parametrize("method", ["get_range", "get_range_multi"])
+def test_benchmark_get_range_multi(method, benchmark):
+    with override_settings(SENTRY_OPTIONS={"redis.clusters": {"tsdb": {"hosts": {0: {"db": 6}}}}}):
+        db = RedisTSDB(rollups=((ONE_HOUR, 24),), vnodes=64, cluster="tsdb")
+
+    end = datetime.utcnow().replace(tzinfo=pytz.UTC)
+    start = end - timedelta(hours=23)
+    keys = list(range(500))
+    for hours in range(24):
+        db.incr_multi([(TSDBModel.group, key) for key in keys], end - timedelta(hours=hours))
+
+    def run_get_range():
+        return db.get_range(TSDBModel.group, keys, start, end)
+
+    def run_get_range_multi():
+        return db.get_range_multi([(TSDBModel.group, key, None) for key in keys], start, end)
+
+    try:
+        results = benchmark(
+            {"get_range": run_get_range, "get_range_multi": run_get_range_multi}[method]
+        )
+        assert len(results) == len(keys)
+    finally:
+        with db.cluster.all() as client:
+            client.flushdb()
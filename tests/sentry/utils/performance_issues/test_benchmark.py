@@ -0,0 +1,81 @@
+import tracemalloc
+
+import pytest
+
+from sentry.testutils.performance_issues.event_generators import create_event, create_span
+from sentry.testutils.skips import requires_benchmark
+from sentry.utils.performance_issues.performance_detection import (
+    ConsecutiveDBSpanDetector,
+    MNPlusOneDBSpanDetector,
+    NPlusOneAPICallsDetector,
+    NPlusOneDBSpanDetector,
+    RenderBlockingAssetSpanDetector,
+    SlowDBQueryDetector,
+    UncompressedAssetSpanDetector,
+    get_detection_settings,
+    run_detector_on_data,
+)
+from sentry.utils.performance_issues.span_index import SpanIndex
+
+DETECTORS = [
+    ConsecutiveDBSpanDetector,
+    SlowDBQueryDetector,
+    RenderBlockingAssetSpanDetector,
+    NPlusOneDBSpanDetector,
+    NPlusOneAPICallsDetector,
+    MNPlusOneDBSpanDetector,
+    UncompressedAssetSpanDetector,
+]
+
+
+def make_large_event(span_count):
+    spans = []
+    ops = [
+        ("http.server", "GET /api/0/organizations/"),
+        ("db", "SELECT * FROM sentry_project WHERE id = %s"),
+        ("db", "SELECT * FROM sentry_team WHERE id = %s"),
+        ("http.client", "GET https://example.com/api/items/?id=1"),
+        ("resource.script", "https://example.com/static/app.js"),
+    ]
+    for i in range(span_count):
+        op, description = ops[i % len(ops)]
+        span = create_span(op, 10.0, description, hash=str(i % len(ops)))
+        span["span_id"] = "%016x" % (i + 1)
+        span["parent_span_id"] = "%016x" % (i // 10) if i >= 10 else "a" * 16
+        span["start_timestamp"] = i * 0.005
+        span["timestamp"] = span["start_timestamp"] + 0.01
+        spans.append(span)
+    return create_event(spans)
+
+
+def detect(settings, event):
+    span_index = SpanIndex(event["spans"])
+    for detector_cls in DETECTORS:
+        run_detector_on_data(detector_cls(settings, event), event, span_index)
+
+
+def detect_without_shared_index(settings, event):
+    # the baseline, every detector indexes the spans on its own
+    for detector_cls in DETECTORS:
+        run_detector_on_data(detector_cls(settings, event), event)
+
+
+@requires_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("span_count", [1000, 10000])
+@pytest.mark.parametrize(
+    "detect_fn", [detect_without_shared_index, detect], ids=["baseline", "span_index"]
+)
+def test_benchmark_performance_detection(span_count, detect_fn, benchmark):
+    settings = get_detection_settings()
+    event = make_large_event(span_count)
+
+    tracemalloc.start()
+    try:
+        detect_fn(settings, event)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_memory_bytes"] = peak
+
+    benchmark(detect_fn, settings, event)
@@ -89,6 +89,23 @@ class NPlusOneDbDetectorTest(unittest.TestCase):
             )
         ]
 
+    def test_requires_parent_visited_before_source(self):
+        event = get_event("n-plus-one-in-django-index-view-activerecord")
+        assert len(self.find_problems(event)) == 1
+
+        # the parent has to be visited before the source query
+        spans = event["spans"]
+        parent_span = next(span for span in spans if span["span_id"] == "8dd7a5869a4f4583")
+        spans.remove(parent_span)
+        spans.append(parent_span)
+        assert self.find_problems(event) == []
+
+    def test_requires_non_db_parent(self):
+        event = get_event("n-plus-one-in-django-index-view-activerecord")
+        parent_span = next(span for span in event["spans"] if span["span_id"] == "8dd7a5869a4f4583")
+        parent_span["op"] = "db"
+        assert self.find_problems(event) == []
+
     def test_n_plus_one_db_detector_has_different_fingerprints_for_different_n_plus_one_events(
         self,
     ):
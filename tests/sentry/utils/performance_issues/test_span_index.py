@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from sentry.testutils.performance_issues.span_builder import SpanBuilder
+from sentry.utils.performance_issues.span_index import SpanIndex
+
+
+def make_span(span_id, parent_span_id, start, end, op="db", description="SELECT 1"):
+    span = SpanBuilder().with_span_id(span_id).with_op(op).with_description(description).build()
+    span["parent_span_id"] = parent_span_id
+    span["start_timestamp"] = start
+    span["timestamp"] = end
+    return span
+
+
+def test_span_tree():
+    spans = [
+        make_span("a", "root", 0.0, 1.0),
+        make_span("c", "a", 0.5, 0.6),
+        make_span("b", "a", 0.1, 0.2),
+        make_span("d", "b", 0.1, 0.15),
+        make_span("e", "unknown", 0.3, 0.4),
+        make_span("f", "a", 0.1, 0.3),
+    ]
+    index = SpanIndex(spans)
+
+    assert len(index) == 6
+    assert index.parent(3) == 2
+    assert index.parent(0) is None
+    assert index.parent(4) is None
+    # children in sibling order, ties in event order
+    assert index.children_of(0) == [2, 5, 1]
+    assert index.children_of(2) == [3]
+    assert index.children_of(3) == []
+    assert index.position(spans[3]) == 3
+    assert index.position(make_span("a", "root", 0.0, 1.0)) is None
+
+
+def test_timestamps():
+    spans = [
+        make_span("a", None, 1.0000001, 1.0000004),
+        make_span("b", None, 1.0000004, 1.5),
+        make_span("c", None, None, 1.5),
+    ]
+    index = SpanIndex(spans)
+
+    assert index.duration(0) == timedelta(seconds=1.0000004) - timedelta(seconds=1.0000001)
+    assert index.start(1) == timedelta(seconds=1.0000004)
+    assert index.end(1) == timedelta(seconds=1.5)
+    # Overlap is decided on microsecond precision, like on `timedelta`s
+    assert not index.overlaps(0, 1)
+    assert index.overlaps(1, 0)
+
+    assert index.has_timestamps(1)
+    assert not index.has_timestamps(2)
+
+
+def test_span_ids():
+    spans = [
+        make_span("a", None, 0.0, 1.0),
+        make_span("a", None, 0.0, 1.0),
+    ]
+    index = SpanIndex(spans)
+
+    assert index.count_span_id("a") == 2
+    assert index.count_span_id("b") == 0
+    assert index.count_span_id(None) == 0
@@ -1,7 +1,10 @@
 import math
+from datetime import datetime, timezone
 from unittest.mock import Mock
 
-from sentry.utils.cursors import Cursor, build_cursor
+import pytest
+
+from sentry.utils.cursors import Cursor, KeysetCursor, build_cursor
 
 
 def build_mock(**attrs):
@@ -44,3 +47,19 @@ def test_build_cursor():
     assert isinstance(cursor.prev, Cursor)
     assert cursor.prev
     assert list(cursor) == [event3]
+
+
+def test_keyset_cursor():
+    value = ["foo:bar", 3, datetime(2022, 1, 1, 12, 30, tzinfo=timezone.utc)]
+    cursor = KeysetCursor(value, 0, True)
+    parsed = KeysetCursor.from_string(str(cursor))
+    assert parsed.value == value
+    assert parsed.is_prev
+
+    # offset cursors are accepted as well
+    parsed = KeysetCursor.from_string("100:2:0")
+    assert parsed.value == 100
+    assert parsed.offset == 2
+
+    with pytest.raises(ValueError):
+        KeysetCursor.from_string("not base64:0:0")
@@ -1,18 +1,27 @@
 import unittest
+import uuid
 from datetime import datetime, timedelta
 from unittest import mock
 
 import pytest
 import pytz
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 
+from sentry.locks import locks
 from sentry.models import GroupRelease, Project, Release
 from sentry.testutils import TestCase
+from sentry.utils import json
 from sentry.utils.snuba import (
     Dataset,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
+    _cache_codec,
+    _cache_lease_seconds,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -374,3 +383,104 @@ class QuantizeTimeTest(unittest.TestCase):
                 break
 
         assert i != j
+
+
+class QueryCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.query = {"dataset": "events", "project": [self.project.id], "uuid": uuid.uuid4().hex}
+        self.cache_key = get_cache_key(self.query)
+        self.result = {"data": [{"count": 1}]}
+
+    def run_query(self):
+        return _apply_cache_and_build_results(
+            [(self.query, lambda x: x, lambda x: x)], use_cache=True
+        )
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_cached_result(self, mock_query):
+        mock_query.return_value = [self.result]
+
+        assert self.run_query() == [self.result]
+        assert cache.get(self.cache_key) == json.dumps(self.result)
+        assert self.run_query() == [self.result]
+        assert mock_query.call_count == 1
+
+        # compressed results can be read before they are written
+        cache.set(self.cache_key, _cache_codec.encode({"data": []}))
+        assert self.run_query() == [{"data": []}]
+        assert mock_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_compressed_result(self, mock_query):
+        mock_query.return_value = [self.result]
+
+        with self.options({"snuba.query-cache.compress": True}):
+            assert self.run_query() == [self.result]
+            assert isinstance(cache.get(self.cache_key), bytes)
+            assert self.run_query() == [self.result]
+        assert mock_query.call_count == 1
+
+        # results cached as JSON strings can still be read
+        cache.set(self.cache_key, json.dumps({"data": []}))
+        assert self.run_query() == [{"data": []}]
+        assert mock_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_result_too_large(self, mock_query):
+        mock_query.return_value = [self.result]
+
+        with self.settings(SENTRY_SNUBA_CACHE_MAX_RESULT_SIZE=1):
+            assert self.run_query() == [self.result]
+            assert self.run_query() == [self.result]
+        assert cache.get(self.cache_key) is None
+        assert mock_query.call_count == 2
+
+    @mock.patch("sentry.utils.snuba.time.sleep")
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_coalesced(self, mock_query, mock_sleep):
+        # another request is running the query, and caches the result while
+        # this one waits
+        lease = locks.get(f"{self.cache_key}:lease", duration=10)
+        with lease.acquire():
+            mock_sleep.side_effect = lambda delay: cache.set(
+                self.cache_key, json.dumps(self.result)
+            )
+            assert self.run_query() == [self.result]
+
+        assert mock_query.call_count == 0
+        assert mock_sleep.call_count == 1
+
+    @mock.patch("sentry.utils.snuba.time.sleep")
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_coalesced_slow_query(self, mock_query, mock_sleep):
+        # the other request's query takes longer than a few seconds, but not
+        # longer than the Snuba timeout
+        slept = []
+
+        def sleep(delay):
+            slept.append(delay)
+            if sum(slept) >= settings.SENTRY_SNUBA_TIMEOUT - 1:
+                cache.set(self.cache_key, json.dumps(self.result))
+
+        lease = locks.get(f"{self.cache_key}:lease", duration=_cache_lease_seconds())
+        with lease.acquire():
+            mock_sleep.side_effect = sleep
+            assert self.run_query() == [self.result]
+
+        assert mock_query.call_count == 0
+        assert sum(slept) >= settings.SENTRY_SNUBA_TIMEOUT - 1
+
+    @mock.patch("sentry.utils.snuba.time.sleep")
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_coalesce_failed(self, mock_query, mock_sleep):
+        # another request is running the query, but fails without caching
+        # a result
+        lease = locks.get(f"{self.cache_key}:lease", duration=10)
+        lease.acquire()
+        mock_sleep.side_effect = lambda delay: lease.release()
+        mock_query.return_value = [self.result]
+
+        assert self.run_query() == [self.result]
+        assert mock_query.call_count == 1
+        assert mock_sleep.call_count == 1
@@ -200,6 +200,58 @@ class StandardIntervalMixin:
         rule = self.get_rule(data=data, rule=Rule(environment_id=None))
         self.assertDoesNotPass(rule, event)
 
+    def test_rate_cache(self):
+        event = self.add_event(
+            data={
+                "fingerprint": ["something_random"],
+                "user": {"id": uuid4().hex},
+            },
+            project_id=self.project.id,
+            timestamp=before_now(minutes=1),
+        )
+        self.increment(event, 7, timestamp=now() - timedelta(minutes=1))
+
+        with patch.object(
+            self.rule_cls,
+            "get_rate_uncached",
+            autospec=True,
+            side_effect=self.rule_cls.get_rate_uncached,
+        ) as get_rate_uncached, self.options({"rules.frequency-condition-cache-ttl": 10}):
+            # rules that only differ in their threshold share the rate once
+            # it exceeds the threshold
+            rule = self.get_rule(data={"interval": "1m", "value": 6}, rule=Rule())
+            self.assertPasses(rule, event)
+            rule = self.get_rule(data={"interval": "1m", "value": 5}, rule=Rule())
+            self.assertPasses(rule, event)
+            assert get_rate_uncached.call_count == 1
+
+            # rates below the threshold are queried again
+            rule = self.get_rule(data={"interval": "1m", "value": 16}, rule=Rule())
+            self.assertDoesNotPass(rule, event)
+            assert get_rate_uncached.call_count == 2
+
+            rule = self.get_rule(data={"interval": "1h", "value": 6}, rule=Rule())
+            self.assertPasses(rule, event)
+            assert get_rate_uncached.call_count == 3
+
+    def test_rate_cache_burst(self):
+        event = self.add_event(
+            data={
+                "fingerprint": ["something_random"],
+                "user": {"id": uuid4().hex},
+            },
+            project_id=self.project.id,
+            timestamp=before_now(minutes=1),
+        )
+        rule = self.get_rule(data={"interval": "1m", "value": 5}, rule=Rule())
+
+        with self.options({"rules.frequency-condition-cache-ttl": 10}):
+            self.assertDoesNotPass(rule, event)
+
+            # the burst crosses the threshold while the rate is cached
+            self.increment(event, 9, timestamp=now() - timedelta(minutes=1))
+            self.assertPasses(rule, event)
+
 
 class EventFrequencyConditionTestCase(
     FrequencyConditionMixin, StandardIntervalMixin, SnubaTestCase
@@ -1,3 +1,4 @@
+import time
 import uuid
 from datetime import datetime, timedelta
 from hashlib import md5
@@ -9,6 +10,7 @@ from django.utils import timezone
 
 from sentry import options
 from sentry.api.issue_search import convert_query_values, issue_search_config, parse_search_query
+from sentry.buffer import Buffer
 from sentry.exceptions import InvalidSearchQuery
 from sentry.issues.occurrence_consumer import process_event_and_issue_occurrence
 from sentry.models import (
@@ -28,7 +30,8 @@ from sentry.search.snuba.backend import (
     CdcEventsDatasetSnubaSearchBackend,
     EventsDatasetSnubaSearchBackend,
 )
-from sentry.search.snuba.executors import InvalidQueryForExecutor
+from sentry.search.snuba.executors import InvalidQueryForExecutor, PostgresSnubaQueryExecutor
+from sentry.signals import issue_ignored
 from sentry.testutils import SnubaTestCase, TestCase, xfail_if_not_postgres
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.types.issues import GroupType
@@ -1419,6 +1422,144 @@ class EventsSnubaSearchTest(SharedSnubaTest):
             assert third_results.hits > 10
             assert third_results.results != second_results.results
 
+    def test_result_cache(self):
+        with self.options(
+            {"snuba.search.result-cache-ttl": 60, "snuba.search.hits-cache-ttl": 300}
+        ), mock.patch.object(
+            PostgresSnubaQueryExecutor,
+            "_query",
+            side_effect=PostgresSnubaQueryExecutor._query,
+            autospec=True,
+        ) as query:
+            results = self.make_query(search_filter_query="is:unresolved", count_hits=True)
+            assert list(results) == [self.group1]
+            assert results.hits == 1
+            assert query.call_count == 1
+
+            cached = self.make_query(search_filter_query="is:unresolved", count_hits=True)
+            assert list(cached) == [self.group1]
+            assert cached.hits == 1
+            assert cached.next == results.next
+            assert cached.prev == results.prev
+            assert query.call_count == 1
+
+            # different parameters are cached separately
+            self.make_query(search_filter_query="is:unresolved", sort_by="freq", count_hits=True)
+            assert query.call_count == 2
+
+            # groups are loaded fresh from the database
+            self.group1.update(times_seen=42)
+            cached = self.make_query(search_filter_query="is:unresolved", count_hits=True)
+            assert cached[0].times_seen == 42
+            assert query.call_count == 2
+
+    def test_result_cache_invalidation(self):
+        with self.options({"snuba.search.result-cache-ttl": 60}):
+            results = self.make_query(search_filter_query="is:unassigned")
+            assert set(results) == {self.group1}
+
+            GroupAssignee.objects.assign(self.group1, self.user)
+            results = self.make_query(search_filter_query="is:unassigned")
+            assert set(results) == set()
+
+            # reassigning updates the existing row without `post_save`
+            other_user = self.create_user()
+            self.create_member(user=other_user, organization=self.organization, teams=[self.team])
+            query = "assigned:%s" % other_user.username
+            assert set(self.make_query(search_filter_query=query)) == set()
+            GroupAssignee.objects.assign(self.group1, other_user)
+            assert set(self.make_query(search_filter_query=query)) == {self.group1}
+
+            GroupAssignee.objects.deassign(self.group1)
+            results = self.make_query(search_filter_query="is:unassigned")
+            assert set(results) == {self.group1}
+
+            query = "bookmarks:%s" % other_user.username
+            assert set(self.make_query(search_filter_query=query)) == set()
+            GroupBookmark.objects.create(user=other_user, group=self.group1, project=self.project)
+            assert set(self.make_query(search_filter_query=query)) == {self.group1}
+            GroupBookmark.objects.filter(user_id=other_user.id).delete()
+            assert set(self.make_query(search_filter_query=query)) == set()
+
+            results = self.make_query(search_filter_query="is:unresolved")
+            assert set(results) == {self.group1}
+
+            # bulk status changes are queryset updates that only send the
+            # issue signals
+            Group.objects.filter(id=self.group1.id).update(status=GroupStatus.IGNORED)
+            issue_ignored.send_robust(
+                project=self.project,
+                user=self.user,
+                group_list=[self.group1],
+                activity_data={},
+                sender=self.__class__,
+            )
+            results = self.make_query(search_filter_query="is:unresolved")
+            assert set(results) == set()
+
+            # as well as writing the relations that are searched on
+            query = "assigned:%s" % self.user.username
+            assert set(self.make_query(search_filter_query=query)) == {self.group2}
+            GroupAssignee.objects.create(project=self.project, group=self.group1, user=self.user)
+            assert set(self.make_query(search_filter_query=query)) == {self.group1, self.group2}
+
+    def test_result_cache_new_events(self):
+        with self.options({"snuba.search.result-cache-ttl": 60}), mock.patch.object(
+            PostgresSnubaQueryExecutor,
+            "_query",
+            side_effect=PostgresSnubaQueryExecutor._query,
+            autospec=True,
+        ) as query:
+            assert list(self.make_query(sort_by="date")) == [self.group1, self.group2]
+            assert list(self.make_query(sort_by="new")) == [self.group2, self.group1]
+            assert query.call_count == 2
+
+            self.store_event(
+                data={
+                    "fingerprint": ["put-me-in-group1"],
+                    "timestamp": iso_format(self.base_datetime + timedelta(hours=1)),
+                    "message": "group1",
+                    "stacktrace": {"frames": [{"module": "group1"}]},
+                    "environment": "production",
+                },
+                project_id=self.project.id,
+            )
+            # the counters of the group are updated once the buffer is flushed
+            Buffer().process(
+                Group,
+                {"times_seen": 1},
+                {"id": self.group1.id},
+                {"last_seen": self.base_datetime + timedelta(hours=1)},
+            )
+
+            # searches sorted by values that new events change are invalidated
+            assert list(self.make_query(sort_by="date")) == [self.group1, self.group2]
+            assert query.call_count == 3
+
+            # others are not
+            assert list(self.make_query(sort_by="new")) == [self.group2, self.group1]
+            assert query.call_count == 3
+
+    def test_result_cache_stale_while_revalidate(self):
+        with self.options(
+            {"snuba.search.result-cache-ttl": 60, "snuba.search.result-cache-stale-ttl": 60}
+        ):
+            results = self.make_query(search_filter_query="is:unresolved")
+            assert set(results) == {self.group1}
+
+            # writes that send no signals show up once the entry expires
+            Group.objects.filter(id=self.group2.id).update(status=GroupStatus.UNRESOLVED)
+            with mock.patch("sentry.search.snuba.cache.time") as mock_time:
+                mock_time.time.return_value = time.time() + 90
+
+                # another request is already revalidating the entry
+                with mock.patch("sentry.search.snuba.cache.cache.add", return_value=False):
+                    results = self.make_query(search_filter_query="is:unresolved")
+                    assert set(results) == {self.group1}
+
+                results = self.make_query(search_filter_query="is:unresolved")
+                assert set(results) == {self.group1, self.group2}
+
     def test_regressed_in_release(self):
         # expect no groups within the results since there are no releases
         results = self.make_query(search_filter_query="regressed_in_release:fake")